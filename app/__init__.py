@@ -79,6 +79,30 @@ def _register_template_filters(app: "Flask") -> None:
         except Exception:
             return utc_str
 
+    @app.template_filter("thumbnail")
+    def thumbnail_filter(filename):
+        from app.utils.screenshot_utils import SCREENSHOT_DIR, thumbnail_name
+
+        thumb = thumbnail_name(filename) if filename else None
+        if thumb and os.path.exists(os.path.join(SCREENSHOT_DIR, thumb)):
+            return thumb
+        return filename
+
+    @app.template_filter("screenshot_url")
+    def screenshot_url_filter(filename):
+        from flask import url_for
+        from app.utils.screenshot_utils import is_manifest
+
+        if is_manifest(filename):
+            return url_for("main.screenshot", filename=filename)
+        return url_for("static", filename="screenshots/" + filename)
+
+    @app.template_filter("manifest")
+    def manifest_filter(filename):
+        from app.utils.screenshot_utils import is_manifest, read_manifest
+
+        return read_manifest(filename) if is_manifest(filename) else None
+
     @app.template_filter("relativetime")
     def relativetime_filter(utc_str):
         if not utc_str:
@@ -13,6 +13,8 @@ celery_app = Celery(
     include=[
         "app.tasks.screenshot_tasks",
         "app.tasks.check_tasks",
+        "app.tasks.batch_tasks",
+        "app.tasks.maintenance_tasks",
     ],
 )
 
@@ -26,6 +28,12 @@ celery_app.conf.update(
     task_time_limit=180,
     task_soft_time_limit=150,
     worker_prefetch_multiplier=1,
-    worker_max_tasks_per_child=10,
+    worker_max_tasks_per_child=int(os.environ.get("CELERY_MAX_TASKS_PER_CHILD", 200)),
     result_expires=3600,
+    beat_schedule={
+        "gc-screenshots": {
+            "task": "app.tasks.gc_screenshots",
+            "schedule": float(os.environ.get("SCREENSHOT_GC_HOURS", 24)) * 3600,
+        },
+    },
 )
@@ -12,6 +12,87 @@ class Config:
     LLM_MODEL = os.environ.get("LLM_MODEL", "gemma-3-27b-it")
     LLM_PROVIDER = os.environ.get("LLM_PROVIDER", "gemini")
 
+    BROWSER_POOL_SIZE = int(os.environ.get("BROWSER_POOL_SIZE", 1))
+    BROWSER_POOL_MAX_PAGES = int(os.environ.get("BROWSER_POOL_MAX_PAGES", 100))
+    BROWSER_POOL_MAX_RSS_MB = int(os.environ.get("BROWSER_POOL_MAX_RSS_MB", 1024))
+
+    CONDITIONAL_GET_ENABLED = os.environ.get("CONDITIONAL_GET_ENABLED", "1") == "1"
+    HTTP_POOL_LIMIT = int(os.environ.get("HTTP_POOL_LIMIT", 100))
+    HTTP_POOL_LIMIT_PER_HOST = int(os.environ.get("HTTP_POOL_LIMIT_PER_HOST", 4))
+    FETCH_MAX_BYTES = int(os.environ.get("FETCH_MAX_BYTES", 500000))
+
+    ROUTER_SIMILARITY_THRESHOLD = float(
+        os.environ.get("ROUTER_SIMILARITY_THRESHOLD", 0.95)
+    )
+    ROUTER_SIMILARITY_MAX_WORDS = int(
+        os.environ.get("ROUTER_SIMILARITY_MAX_WORDS", 2000)
+    )
+    ROUTER_MIN_MATCHES = int(os.environ.get("ROUTER_MIN_MATCHES", 3))
+    ROUTER_REVALIDATE_CHECKS = int(os.environ.get("ROUTER_REVALIDATE_CHECKS", 20))
+    ROUTER_REVALIDATE_HOURS = int(os.environ.get("ROUTER_REVALIDATE_HOURS", 24))
+
+    BATCH_CONCURRENCY = int(os.environ.get("BATCH_CONCURRENCY", 50))
+    BATCH_PER_HOST = int(os.environ.get("BATCH_PER_HOST", 4))
+    BATCH_RENDER_CONCURRENCY = int(
+        os.environ.get("BATCH_RENDER_CONCURRENCY", max(1, BROWSER_POOL_SIZE))
+    )
+    BATCH_TIME_LIMIT = int(os.environ.get("BATCH_TIME_LIMIT", 3600))
+
+    CHECK_SCREENSHOTS = os.environ.get("CHECK_SCREENSHOTS", "0") == "1"
+    SCREENSHOT_FORMAT = os.environ.get("SCREENSHOT_FORMAT", "webp")
+    SCREENSHOT_QUALITY = int(os.environ.get("SCREENSHOT_QUALITY", 80))
+    SCREENSHOT_LOSSLESS = os.environ.get("SCREENSHOT_LOSSLESS", "0") == "1"
+    SCREENSHOT_MAX_HEIGHT = int(os.environ.get("SCREENSHOT_MAX_HEIGHT", 10000))
+    SCREENSHOT_THUMB_WIDTH = int(os.environ.get("SCREENSHOT_THUMB_WIDTH", 320))
+    SCREENSHOT_THUMB_HEIGHT = int(os.environ.get("SCREENSHOT_THUMB_HEIGHT", 200))
+    SCREENSHOT_TILE_HEIGHT = int(os.environ.get("SCREENSHOT_TILE_HEIGHT", 512))
+    SCREENSHOT_GC_GRACE = int(os.environ.get("SCREENSHOT_GC_GRACE", 3600))
+    SCREENSHOT_HASH_SIZE = int(os.environ.get("SCREENSHOT_HASH_SIZE", 64))
+    SCREENSHOT_HASH_DISTANCE = int(os.environ.get("SCREENSHOT_HASH_DISTANCE", 2))
+    VISUAL_DIFF_ENABLED = os.environ.get("VISUAL_DIFF_ENABLED", "1") == "1"
+    VISUAL_DIFF_TILE = int(os.environ.get("VISUAL_DIFF_TILE", 16))
+    VISUAL_DIFF_STRIP = int(os.environ.get("VISUAL_DIFF_STRIP", 512))
+    VISUAL_DIFF_THRESHOLD = int(os.environ.get("VISUAL_DIFF_THRESHOLD", 32))
+    VISUAL_DIFF_MAX_REGIONS = int(os.environ.get("VISUAL_DIFF_MAX_REGIONS", 50))
+
+    DIFF_ALGORITHM = os.environ.get("DIFF_ALGORITHM", "histogram")
+    DIFF_CACHE_ENABLED = os.environ.get("DIFF_CACHE_ENABLED", "1") == "1"
+    DIFF_CACHE_MEMORY_MB = int(os.environ.get("DIFF_CACHE_MEMORY_MB", 32))
+    DIFF_CACHE_MAX_MB = int(os.environ.get("DIFF_CACHE_MAX_MB", 256))
+    DIFF_PRECOMPUTE_ENABLED = os.environ.get("DIFF_PRECOMPUTE_ENABLED", "1") == "1"
+    DIFF_VIEW_MAX_AGE = int(os.environ.get("DIFF_VIEW_MAX_AGE", 300))
+    SNAPSHOT_CACHE_SIZE = int(os.environ.get("SNAPSHOT_CACHE_SIZE", 16))
+
+    READINESS_STRATEGY = os.environ.get("READINESS_STRATEGY", "quiescence")
+    READINESS_QUIET_MS = int(os.environ.get("READINESS_QUIET_MS", 500))
+    READINESS_BUDGET_MS = int(os.environ.get("READINESS_BUDGET_MS", 10000))
+    NAVIGATION_TIMEOUT_MS = int(os.environ.get("NAVIGATION_TIMEOUT_MS", 30000))
+
+    RATE_LIMIT_ENABLED = os.environ.get("RATE_LIMIT_ENABLED", "1") == "1"
+    RATE_LIMIT_BACKEND = os.environ.get("RATE_LIMIT_BACKEND", "sqlite")
+    RATE_LIMIT_PER_HOST = float(os.environ.get("RATE_LIMIT_PER_HOST", 1.0))
+    RATE_LIMIT_BURST = float(os.environ.get("RATE_LIMIT_BURST", 4))
+    RATE_LIMIT_MAX_WAIT = float(os.environ.get("RATE_LIMIT_MAX_WAIT", 10))
+    RATE_LIMIT_MAX_DEFERRALS = int(os.environ.get("RATE_LIMIT_MAX_DEFERRALS", 10))
+
+    CIRCUIT_BREAKER_ENABLED = os.environ.get("CIRCUIT_BREAKER_ENABLED", "1") == "1"
+    CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get("CIRCUIT_FAILURE_THRESHOLD", 3))
+    CIRCUIT_BASE_BACKOFF = float(os.environ.get("CIRCUIT_BASE_BACKOFF", 60))
+    CIRCUIT_MAX_BACKOFF = float(os.environ.get("CIRCUIT_MAX_BACKOFF", 3600))
+    CIRCUIT_PROBE_TIMEOUT = float(os.environ.get("CIRCUIT_PROBE_TIMEOUT", 120))
+
+    SITEMAP_HINTS_ENABLED = os.environ.get("SITEMAP_HINTS_ENABLED", "1") == "1"
+    SITEMAP_PATHS = os.environ.get("SITEMAP_PATHS", "/sitemap.xml")
+    SITEMAP_MIN_LINKS = int(os.environ.get("SITEMAP_MIN_LINKS", 5))
+    SITEMAP_REFRESH_HOURS = float(os.environ.get("SITEMAP_REFRESH_HOURS", 6))
+    SITEMAP_MAX_SKIP_HOURS = float(os.environ.get("SITEMAP_MAX_SKIP_HOURS", 24))
+    SITEMAP_MAX_FILES = int(os.environ.get("SITEMAP_MAX_FILES", 50))
+    SITEMAP_MAX_BYTES = int(os.environ.get("SITEMAP_MAX_BYTES", 50 * 1024 * 1024))
+    SITEMAP_TIMEOUT = int(os.environ.get("SITEMAP_TIMEOUT", 120))
+
+    BLOCK_RESOURCE_TYPES = os.environ.get("BLOCK_RESOURCE_TYPES", "image,media,font")
+    BLOCK_TRACKERS = os.environ.get("BLOCK_TRACKERS", "1") == "1"
+
 
 class DevelopmentConfig(Config):
     DEBUG = True
@@ -28,7 +28,7 @@ def _seed_default_project() -> None:
 
     session = _Session()
     try:
-        existing = session.query(Project).filter_by(id=1).first()
+        existing = session.query(Project.id).filter_by(id=1).first()
         if not existing:
             default_project = Project(
                 id=1,
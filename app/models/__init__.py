@@ -1,7 +1,17 @@
+import json
 from datetime import datetime
 from typing import Optional, Dict, Any
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Text,
+    DateTime,
+    Float,
+    Boolean,
+    ForeignKey,
+)
 from sqlalchemy.orm import relationship, declarative_base
 
 Base = declarative_base()
@@ -14,6 +24,8 @@ class Project(Base):
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    blocked_resource_types = Column(String(255), nullable=True)
+    blocked_domains = Column(Text, nullable=True)
 
     links = relationship("Link", back_populates="project")
 
@@ -23,6 +35,8 @@ class Project(Base):
             "name": self.name,
             "description": self.description,
             "created_at": self.created_at.isoformat() if self.created_at else None,
+            "blocked_resource_types": self.blocked_resource_types,
+            "blocked_domains": self.blocked_domains,
         }
 
 
@@ -37,7 +51,14 @@ class Link(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     last_checked = Column(DateTime, nullable=True)
     last_error = Column(Text, nullable=True)
+    last_error_class = Column(String(20), nullable=True)
     is_active = Column(Integer, default=1)
+    etag = Column(String(255), nullable=True)
+    last_modified = Column(String(100), nullable=True)
+    wait_for_selector = Column(String(500), nullable=True)
+    lastmod_hint = Column(DateTime, nullable=True)
+    diff_algorithm = Column(String(20), nullable=True)
+    content_strategy = Column(String(20), nullable=True)
 
     project = relationship("Project", back_populates="links")
     initial_page = relationship("InitialPage", back_populates="link", uselist=False)
@@ -57,7 +78,16 @@ class Link(Base):
             if self.last_checked
             else None,
             "last_error": self.last_error,
+            "last_error_class": self.last_error_class,
             "is_active": self.is_active,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "wait_for_selector": self.wait_for_selector,
+            "lastmod_hint": self.lastmod_hint.isoformat()
+            if self.lastmod_hint
+            else None,
+            "diff_algorithm": self.diff_algorithm,
+            "content_strategy": self.content_strategy,
         }
         if include_project and self.project:
             result["project_name"] = self.project.name
@@ -72,6 +102,7 @@ class InitialPage(Base):
     full_content = Column(Text, nullable=True)
     content_hash = Column(String(64), nullable=True)
     screenshot = Column(Text, nullable=True)
+    screenshot_hash = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     link = relationship("Link", back_populates="initial_page")
@@ -83,6 +114,7 @@ class InitialPage(Base):
             "full_content": self.full_content,
             "content_hash": self.content_hash,
             "screenshot": self.screenshot,
+            "screenshot_hash": self.screenshot_hash,
             "created_at": self.created_at.isoformat() if self.created_at else None,
         }
 
@@ -102,7 +134,12 @@ class Diff(Base):
     price_amount = Column(String(50), nullable=True)
     price_currency = Column(String(10), nullable=True)
     screenshot = Column(Text, nullable=True)
+    screenshot_hash = Column(Text, nullable=True)
+    visual_change = Column(Float, nullable=True)
+    visual_regions = Column(Text, nullable=True)
+    heatmap = Column(Text, nullable=True)
     timezone = Column(String(50), default="UTC")
+    is_baseline = Column(Boolean, nullable=False, default=False)
 
     link = relationship("Link", back_populates="diffs")
     previous_diff = relationship("Diff", remote_side=[id])
@@ -121,10 +158,28 @@ class Diff(Base):
             "price_amount": self.price_amount,
             "price_currency": self.price_currency,
             "screenshot": self.screenshot,
+            "screenshot_hash": self.screenshot_hash,
+            "visual_change": self.visual_change,
+            "visual_regions": (
+                json.loads(self.visual_regions) if self.visual_regions else []
+            ),
+            "heatmap": self.heatmap,
             "timezone": self.timezone,
+            "is_baseline": bool(self.is_baseline),
         }
 
 
+class DiffArtifact(Base):
+    __tablename__ = "diff_artifacts"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    diff_id = Column(Integer, ForeignKey("diffs.id"), nullable=False, index=True)
+    mode = Column(String(20), nullable=False)
+    cache_key = Column(String(64), nullable=True)
+    content = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
 class History(Base):
     __tablename__ = "history"
 
@@ -156,3 +211,127 @@ class History(Base):
             "screenshot": self.screenshot,
             "timezone": self.timezone,
         }
+
+
+class CheckEvent(Base):
+    __tablename__ = "check_events"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    link_id = Column(Integer, ForeignKey("links.id"), nullable=False)
+    checked_at = Column(DateTime, default=datetime.utcnow)
+    outcome = Column(String(50), nullable=False)
+    content_hash = Column(String(64), nullable=True)
+    detail = Column(Text, nullable=True)
+
+    link = relationship("Link")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "link_id": self.link_id,
+            "checked_at": self.checked_at.isoformat() if self.checked_at else None,
+            "outcome": self.outcome,
+            "content_hash": self.content_hash,
+            "detail": self.detail,
+        }
+
+
+class FetchStrategy(Base):
+    __tablename__ = "fetch_strategies"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    domain = Column(String(255), nullable=False, unique=True)
+    strategy = Column(String(20), nullable=False, default="browser")
+    samples = Column(Integer, default=0)
+    matches = Column(Integer, default=0)
+    last_similarity = Column(Float, nullable=True)
+    checks_since_validation = Column(Integer, default=0)
+    validated_at = Column(DateTime, nullable=True)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "domain": self.domain,
+            "strategy": self.strategy,
+            "samples": self.samples,
+            "matches": self.matches,
+            "last_similarity": self.last_similarity,
+            "checks_since_validation": self.checks_since_validation,
+            "validated_at": self.validated_at.isoformat()
+            if self.validated_at
+            else None,
+        }
+
+
+class HostBucket(Base):
+    __tablename__ = "host_buckets"
+
+    host = Column(String(255), primary_key=True)
+    tokens = Column(Float, nullable=False)
+    updated_at = Column(Float, nullable=False)
+
+
+class DomainCircuit(Base):
+    __tablename__ = "domain_circuits"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    domain = Column(String(255), nullable=False, unique=True)
+    state = Column(String(20), nullable=False, default="closed")
+    failures = Column(Integer, default=0)
+    trips = Column(Integer, default=0)
+    last_error_class = Column(String(20), nullable=True)
+    last_failure_at = Column(DateTime, nullable=True)
+    open_until = Column(DateTime, nullable=True)
+    probe_started_at = Column(DateTime, nullable=True)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "domain": self.domain,
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "last_error_class": self.last_error_class,
+            "last_failure_at": self.last_failure_at.isoformat()
+            if self.last_failure_at
+            else None,
+            "open_until": self.open_until.isoformat() if self.open_until else None,
+            "probe_started_at": self.probe_started_at.isoformat()
+            if self.probe_started_at
+            else None,
+        }
+
+
+class SitemapSource(Base):
+    __tablename__ = "sitemap_sources"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    domain = Column(String(255), nullable=False, unique=True)
+    sitemap_urls = Column(Text, nullable=True)
+    fetched_at = Column(DateTime, nullable=True)
+    files = Column(Integer, default=0)
+    entries = Column(Integer, default=0)
+    error = Column(Text, nullable=True)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "domain": self.domain,
+            "sitemap_urls": self.sitemap_urls,
+            "fetched_at": self.fetched_at.isoformat() if self.fetched_at else None,
+            "files": self.files,
+            "entries": self.entries,
+            "error": self.error,
+        }
+
+
+class RenderedDiff(Base):
+    __tablename__ = "rendered_diffs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    cache_key = Column(String(64), nullable=False, unique=True)
+    mode = Column(String(20), nullable=False)
+    content = Column(Text, nullable=False)
+    size = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow, index=True)
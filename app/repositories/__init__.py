@@ -1,7 +1,17 @@
 from app.repositories.project_repository import ProjectRepository
 from app.repositories.link_repository import LinkRepository
 from app.repositories.history_repository import HistoryRepository
-from app.repositories.diff_repository import DiffRepository, InitialPageRepository
+from app.repositories.diff_repository import (
+    DiffRepository,
+    InitialPageRepository,
+    DiffArtifactRepository,
+)
+from app.repositories.check_event_repository import CheckEventRepository
+from app.repositories.fetch_strategy_repository import FetchStrategyRepository
+from app.repositories.domain_circuit_repository import DomainCircuitRepository
+from app.repositories.sitemap_source_repository import SitemapSourceRepository
+from app.repositories.screenshot_repository import ScreenshotRepository
+from app.repositories.rendered_diff_repository import RenderedDiffRepository
 
 __all__ = [
     "ProjectRepository",
@@ -9,4 +19,11 @@ __all__ = [
     "HistoryRepository",
     "DiffRepository",
     "InitialPageRepository",
+    "DiffArtifactRepository",
+    "CheckEventRepository",
+    "FetchStrategyRepository",
+    "DomainCircuitRepository",
+    "SitemapSourceRepository",
+    "ScreenshotRepository",
+    "RenderedDiffRepository",
 ]
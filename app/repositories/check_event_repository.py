@@ -0,0 +1,52 @@
+from typing import List, Optional, Dict, Any
+
+from app.models import CheckEvent
+from app.extensions import get_session
+
+
+class CheckEventRepository:
+    @staticmethod
+    def get_by_link(link_id: int, limit: int = 20) -> List[Dict[str, Any]]:
+        session = get_session()
+        try:
+            events = (
+                session.query(CheckEvent)
+                .filter_by(link_id=link_id)
+                .order_by(CheckEvent.id.desc())
+                .limit(limit)
+                .all()
+            )
+            return [e.to_dict() for e in events]
+        finally:
+            session.close()
+
+    @staticmethod
+    def create(
+        link_id: int,
+        outcome: str,
+        content_hash: Optional[str] = None,
+        detail: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        session = get_session()
+        try:
+            event = CheckEvent(
+                link_id=link_id,
+                outcome=outcome,
+                content_hash=content_hash,
+                detail=detail,
+            )
+            session.add(event)
+            session.commit()
+            session.refresh(event)
+            return event.to_dict()
+        finally:
+            session.close()
+
+    @staticmethod
+    def delete_by_link(link_id: int) -> None:
+        session = get_session()
+        try:
+            session.query(CheckEvent).filter_by(link_id=link_id).delete()
+            session.commit()
+        finally:
+            session.close()
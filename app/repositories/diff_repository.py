@@ -1,8 +1,9 @@
 import os
+import json
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 
-from app.models import InitialPage, Diff
+from app.models import InitialPage, Diff, DiffArtifact
 from app.extensions import get_session
 
 
@@ -39,12 +40,15 @@ class InitialPageRepository:
             session.close()
 
     @staticmethod
-    def update_screenshot(link_id: int, filename: str) -> None:
+    def update_screenshot(
+        link_id: int, filename: str, screenshot_hash: Optional[str] = None
+    ) -> None:
         session = get_session()
         try:
             initial = session.query(InitialPage).filter_by(link_id=link_id).first()
             if initial:
                 initial.screenshot = filename
+                initial.screenshot_hash = screenshot_hash
                 session.commit()
         finally:
             session.close()
@@ -98,6 +102,40 @@ class DiffRepository:
         finally:
             session.close()
 
+    @staticmethod
+    def get_latest_hash(link_id: int) -> Optional[str]:
+        session = get_session()
+        try:
+            row = (
+                session.query(Diff.content_hash)
+                .filter_by(link_id=link_id)
+                .order_by(Diff.id.desc())
+                .first()
+            )
+            if not row:
+                row = (
+                    session.query(InitialPage.content_hash)
+                    .filter_by(link_id=link_id)
+                    .first()
+                )
+            return row[0] if row else None
+        finally:
+            session.close()
+
+    @staticmethod
+    def get_baseline(link_id: int) -> Optional[Dict[str, Any]]:
+        session = get_session()
+        try:
+            diff = (
+                session.query(Diff)
+                .filter_by(link_id=link_id, is_baseline=True)
+                .order_by(Diff.id.desc())
+                .first()
+            )
+            return diff.to_dict() if diff else None
+        finally:
+            session.close()
+
     @staticmethod
     def get_previous(diff_id: int) -> Optional[Dict[str, Any]]:
         session = get_session()
@@ -123,6 +161,7 @@ class DiffRepository:
         price_currency: Optional[str] = None,
         screenshot: Optional[str] = None,
         timezone: str = "UTC",
+        is_baseline: bool = False,
     ) -> Dict[str, Any]:
         session = get_session()
         try:
@@ -138,6 +177,7 @@ class DiffRepository:
                 price_currency=price_currency,
                 screenshot=screenshot,
                 timezone=timezone,
+                is_baseline=is_baseline,
             )
             session.add(diff)
             session.commit()
@@ -147,12 +187,33 @@ class DiffRepository:
             session.close()
 
     @staticmethod
-    def update_screenshot(diff_id: int, filename: str) -> None:
+    def update_screenshot(
+        diff_id: int, filename: str, screenshot_hash: Optional[str] = None
+    ) -> None:
         session = get_session()
         try:
             diff = session.query(Diff).filter_by(id=diff_id).first()
             if diff:
                 diff.screenshot = filename
+                diff.screenshot_hash = screenshot_hash
+                session.commit()
+        finally:
+            session.close()
+
+    @staticmethod
+    def update_visual_diff(
+        diff_id: int,
+        visual_change: float,
+        regions: List[Dict[str, int]],
+        heatmap: Optional[str],
+    ) -> None:
+        session = get_session()
+        try:
+            diff = session.query(Diff).filter_by(id=diff_id).first()
+            if diff:
+                diff.visual_change = visual_change
+                diff.visual_regions = json.dumps(regions)
+                diff.heatmap = heatmap
                 session.commit()
         finally:
             session.close()
@@ -161,7 +222,46 @@ class DiffRepository:
     def delete_by_link(link_id: int) -> None:
         session = get_session()
         try:
+            diff_ids = session.query(Diff.id).filter_by(link_id=link_id)
+            session.query(DiffArtifact).filter(
+                DiffArtifact.diff_id.in_(diff_ids.scalar_subquery())
+            ).delete(synchronize_session=False)
             session.query(Diff).filter_by(link_id=link_id).delete()
             session.commit()
         finally:
             session.close()
+
+
+class DiffArtifactRepository:
+    @staticmethod
+    def get_by_diff(diff_id: int, keys: Dict[str, str]) -> Dict[str, Optional[str]]:
+        session = get_session()
+        try:
+            artifacts = session.query(DiffArtifact).filter_by(diff_id=diff_id).all()
+            return {
+                artifact.mode: artifact.content
+                for artifact in artifacts
+                if artifact.cache_key and keys.get(artifact.mode) == artifact.cache_key
+            }
+        finally:
+            session.close()
+
+    @staticmethod
+    def save(
+        diff_id: int, artifacts: Dict[str, Optional[str]], keys: Dict[str, str]
+    ) -> None:
+        session = get_session()
+        try:
+            session.query(DiffArtifact).filter_by(diff_id=diff_id).delete()
+            for mode, content in artifacts.items():
+                session.add(
+                    DiffArtifact(
+                        diff_id=diff_id,
+                        mode=mode,
+                        cache_key=keys.get(mode),
+                        content=content,
+                    )
+                )
+            session.commit()
+        finally:
+            session.close()
@@ -0,0 +1,55 @@
+from datetime import datetime
+from typing import Optional, Dict, Any
+
+from app.models import DomainCircuit
+from app.extensions import get_session
+
+
+class DomainCircuitRepository:
+    @staticmethod
+    def get_by_domain(domain: str) -> Optional[Dict[str, Any]]:
+        session = get_session()
+        try:
+            circuit = session.query(DomainCircuit).filter_by(domain=domain).first()
+            return circuit.to_dict() if circuit else None
+        finally:
+            session.close()
+
+    @staticmethod
+    def save(domain: str, **kwargs: Any) -> Dict[str, Any]:
+        session = get_session()
+        try:
+            circuit = session.query(DomainCircuit).filter_by(domain=domain).first()
+            if not circuit:
+                circuit = DomainCircuit(domain=domain, failures=0, trips=0)
+                session.add(circuit)
+            for key, value in kwargs.items():
+                setattr(circuit, key, value)
+            session.commit()
+            session.refresh(circuit)
+            return circuit.to_dict()
+        finally:
+            session.close()
+
+    @staticmethod
+    def claim_probe(domain: str, now: datetime, stale_before: datetime) -> bool:
+        session = get_session()
+        try:
+            claimed = (
+                session.query(DomainCircuit)
+                .filter(
+                    DomainCircuit.domain == domain,
+                    DomainCircuit.state != "closed",
+                    DomainCircuit.open_until <= now,
+                    DomainCircuit.probe_started_at.is_(None)
+                    | (DomainCircuit.probe_started_at < stale_before),
+                )
+                .update(
+                    {"state": "half_open", "probe_started_at": now},
+                    synchronize_session=False,
+                )
+            )
+            session.commit()
+            return claimed == 1
+        finally:
+            session.close()
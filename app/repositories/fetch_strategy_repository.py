@@ -0,0 +1,49 @@
+from datetime import datetime
+from typing import Optional, Dict, Any
+
+from app.models import FetchStrategy
+from app.extensions import get_session
+
+
+class FetchStrategyRepository:
+    @staticmethod
+    def get_by_domain(domain: str) -> Optional[Dict[str, Any]]:
+        session = get_session()
+        try:
+            strategy = session.query(FetchStrategy).filter_by(domain=domain).first()
+            return strategy.to_dict() if strategy else None
+        finally:
+            session.close()
+
+    @staticmethod
+    def record_sample(
+        domain: str, strategy: str, matches: int, similarity: float
+    ) -> Dict[str, Any]:
+        session = get_session()
+        try:
+            row = session.query(FetchStrategy).filter_by(domain=domain).first()
+            if not row:
+                row = FetchStrategy(domain=domain, samples=0, matches=0)
+                session.add(row)
+            row.samples = (row.samples or 0) + 1
+            row.matches = matches
+            row.strategy = strategy
+            row.last_similarity = similarity
+            row.checks_since_validation = 0
+            row.validated_at = datetime.utcnow()
+            session.commit()
+            session.refresh(row)
+            return row.to_dict()
+        finally:
+            session.close()
+
+    @staticmethod
+    def increment_checks(domain: str) -> None:
+        session = get_session()
+        try:
+            row = session.query(FetchStrategy).filter_by(domain=domain).first()
+            if row:
+                row.checks_since_validation = (row.checks_since_validation or 0) + 1
+                session.commit()
+        finally:
+            session.close()
@@ -1,4 +1,3 @@
-import os
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 
@@ -134,18 +133,6 @@ class HistoryRepository:
                 .all()
             )
             for h in to_delete:
-                if h.screenshot:
-                    try:
-                        screenshot_dir = os.path.join(
-                            os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-                            "static",
-                            "screenshots",
-                        )
-                        screenshot_path = os.path.join(screenshot_dir, h.screenshot)
-                        if os.path.exists(screenshot_path):
-                            os.remove(screenshot_path)
-                    except Exception:
-                        pass
                 session.delete(h)
             session.commit()
 
@@ -39,6 +39,17 @@ class LinkRepository:
         finally:
             session.close()
 
+    @staticmethod
+    def get_active_ids(project_id: Optional[int] = None) -> List[int]:
+        session = get_session()
+        try:
+            query = session.query(Link.id).filter(Link.is_active == 1)
+            if project_id:
+                query = query.filter(Link.project_id == project_id)
+            return [row.id for row in query.order_by(Link.id).all()]
+        finally:
+            session.close()
+
     @staticmethod
     def get_by_id(link_id: int) -> Optional[Dict[str, Any]]:
         session = get_session()
@@ -75,10 +86,17 @@ class LinkRepository:
         title: Optional[str] = None,
         project_id: int = 1,
         tags: Optional[str] = None,
+        wait_for_selector: Optional[str] = None,
     ) -> Dict[str, Any]:
         session = get_session()
         try:
-            link = Link(url=url, title=title or url, project_id=project_id, tags=tags)
+            link = Link(
+                url=url,
+                title=title or url,
+                project_id=project_id,
+                tags=tags,
+                wait_for_selector=wait_for_selector,
+            )
             session.add(link)
             session.commit()
             session.refresh(link)
@@ -110,11 +128,13 @@ class LinkRepository:
             InitialPageRepository,
             DiffRepository,
         )
+        from app.repositories.check_event_repository import CheckEventRepository
 
         session = get_session()
         try:
             InitialPageRepository.delete_by_link(link_id)
             DiffRepository.delete_by_link(link_id)
+            CheckEventRepository.delete_by_link(link_id)
 
             link = session.query(Link).filter_by(id=link_id).first()
             if link:
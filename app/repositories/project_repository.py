@@ -35,6 +35,22 @@ class ProjectRepository:
         finally:
             session.close()
 
+    @staticmethod
+    def update(project_id: int, **kwargs: Any) -> Optional[Dict[str, Any]]:
+        session = get_session()
+        try:
+            project = session.query(Project).filter_by(id=project_id).first()
+            if project:
+                for key, value in kwargs.items():
+                    if hasattr(project, key):
+                        setattr(project, key, value)
+                session.commit()
+                session.refresh(project)
+                return project.to_dict()
+            return None
+        finally:
+            session.close()
+
     @staticmethod
     def delete(project_id: int) -> bool:
         session = get_session()
@@ -0,0 +1,63 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import func
+
+from app.models import RenderedDiff
+from app.extensions import get_session
+
+
+class RenderedDiffRepository:
+    @staticmethod
+    def get(cache_key: str) -> Optional[str]:
+        session = get_session()
+        try:
+            entry = session.query(RenderedDiff).filter_by(cache_key=cache_key).first()
+            if not entry:
+                return None
+            entry.last_used_at = datetime.utcnow()
+            session.commit()
+            return entry.content
+        finally:
+            session.close()
+
+    @staticmethod
+    def save(cache_key: str, mode: str, content: str) -> None:
+        session = get_session()
+        try:
+            entry = session.query(RenderedDiff).filter_by(cache_key=cache_key).first()
+            if not entry:
+                entry = RenderedDiff(cache_key=cache_key, mode=mode)
+                session.add(entry)
+            entry.content = content
+            entry.size = len(content)
+            entry.last_used_at = datetime.utcnow()
+            session.commit()
+        finally:
+            session.close()
+
+    @staticmethod
+    def evict(max_bytes: int) -> int:
+        session = get_session()
+        try:
+            total = session.query(
+                func.coalesce(func.sum(RenderedDiff.size), 0)
+            ).scalar()
+            if total <= max_bytes:
+                return 0
+            evicted: List[int] = []
+            rows = session.query(RenderedDiff.id, RenderedDiff.size).order_by(
+                RenderedDiff.last_used_at.asc(), RenderedDiff.id.asc()
+            )
+            for row_id, size in rows:
+                if total <= max_bytes:
+                    break
+                evicted.append(row_id)
+                total -= size or 0
+            session.query(RenderedDiff).filter(RenderedDiff.id.in_(evicted)).delete(
+                synchronize_session=False
+            )
+            session.commit()
+            return len(evicted)
+        finally:
+            session.close()
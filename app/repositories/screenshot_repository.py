@@ -0,0 +1,24 @@
+from typing import Counter, Dict
+
+from app.models import InitialPage, Diff, History
+from app.extensions import get_session
+
+
+class ScreenshotRepository:
+    @staticmethod
+    def ref_counts() -> Dict[str, int]:
+        session = get_session()
+        try:
+            counts: Counter[str] = Counter()
+            for model in (InitialPage, Diff, History):
+                rows = (
+                    session.query(model.screenshot)
+                    .filter(model.screenshot.isnot(None))
+                    .all()
+                )
+                counts.update(row[0] for row in rows if row[0])
+            heatmaps = session.query(Diff.heatmap).filter(Diff.heatmap.isnot(None))
+            counts.update(row[0] for row in heatmaps.all() if row[0])
+            return dict(counts)
+        finally:
+            session.close()
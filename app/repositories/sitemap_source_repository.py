@@ -0,0 +1,50 @@
+from datetime import datetime
+from typing import Dict, Any, List
+
+from app.models import SitemapSource, Link
+from app.extensions import get_session
+
+
+class SitemapSourceRepository:
+    @staticmethod
+    def get_by_domains(domains: List[str]) -> Dict[str, Dict[str, Any]]:
+        session = get_session()
+        try:
+            sources = (
+                session.query(SitemapSource)
+                .filter(SitemapSource.domain.in_(domains))
+                .all()
+            )
+            return {source.domain: source.to_dict() for source in sources}
+        finally:
+            session.close()
+
+    @staticmethod
+    def save(domain: str, **kwargs: Any) -> Dict[str, Any]:
+        session = get_session()
+        try:
+            source = session.query(SitemapSource).filter_by(domain=domain).first()
+            if not source:
+                source = SitemapSource(domain=domain)
+                session.add(source)
+            for key, value in kwargs.items():
+                setattr(source, key, value)
+            session.commit()
+            session.refresh(source)
+            return source.to_dict()
+        finally:
+            session.close()
+
+    @staticmethod
+    def store_hints(hints: Dict[int, datetime]) -> int:
+        if not hints:
+            return 0
+        session = get_session()
+        try:
+            links = session.query(Link).filter(Link.id.in_(list(hints))).all()
+            for link in links:
+                link.lastmod_hint = hints[link.id]
+            session.commit()
+            return len(links)
+        finally:
+            session.close()
@@ -1,6 +1,13 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, request, make_response
 
-from app.services import HealthService, CheckService
+from app.services import (
+    HealthService,
+    CheckService,
+    LinkService,
+    ProjectService,
+    DiffViewService,
+)
+from app.utils.diff_engine import ALGORITHMS
 
 api_bp = Blueprint("api", __name__)
 
@@ -22,6 +29,105 @@ def check(link_id):
         return jsonify(result), 400
 
 
+@api_bp.route("/check/batch", methods=["POST"])
+def check_batch():
+    payload = request.get_json(silent=True) or {}
+    link_ids = payload.get("link_ids")
+    if link_ids is not None:
+        try:
+            link_ids = [int(i) for i in link_ids]
+        except (TypeError, ValueError):
+            return jsonify({"success": False, "error": "Invalid link_ids"}), 400
+
+    result = CheckService.check_many_async(
+        link_ids=link_ids, project_id=payload.get("project_id")
+    )
+
+    if result.get("success"):
+        return jsonify(result)
+    return jsonify(result), 400
+
+
+@api_bp.route("/project/<int:project_id>/interception", methods=["PUT"])
+def update_project_interception(project_id):
+    payload = request.get_json(silent=True) or {}
+    changes = {
+        key: payload[key]
+        for key in ("blocked_resource_types", "blocked_domains")
+        if key in payload
+    }
+    for value in changes.values():
+        if value is not None and (
+            not isinstance(value, list) or not all(isinstance(v, str) for v in value)
+        ):
+            return (
+                jsonify({"success": False, "error": "Expected a list of strings"}),
+                400,
+            )
+
+    project = ProjectService.update_interception(project_id, **changes)
+    if not project:
+        return jsonify({"success": False, "error": "Project not found"}), 404
+    return jsonify({"success": True, "project": project})
+
+
+@api_bp.route("/link/<int:link_id>/diff-algorithm", methods=["PUT"])
+def update_link_diff_algorithm(link_id):
+    payload = request.get_json(silent=True) or {}
+    algorithm = payload.get("algorithm")
+    if algorithm is not None and algorithm not in ALGORITHMS:
+        return (
+            jsonify(
+                {
+                    "success": False,
+                    "error": f"Expected one of {', '.join(ALGORITHMS)}",
+                }
+            ),
+            400,
+        )
+
+    link = LinkService.update_diff_algorithm(link_id, algorithm)
+    if not link:
+        return jsonify({"success": False, "error": "Link not found"}), 404
+    return jsonify({"success": True, "link": link})
+
+
+@api_bp.route("/diff/<int:diff_id>/<mode>")
+def diff_view(diff_id, mode):
+    from app.config import Config
+    from app.services.diff_cache import VIEW_MODES, JSON_MODES
+
+    if mode not in VIEW_MODES:
+        return (
+            jsonify(
+                {"success": False, "error": f"Expected one of {', '.join(VIEW_MODES)}"}
+            ),
+            400,
+        )
+
+    context = DiffViewService.get_context(diff_id)
+    if not context:
+        return jsonify({"success": False, "error": "Diff not found"}), 404
+
+    etag = DiffViewService.etag(context, mode)
+    if request.if_none_match.contains(etag):
+        response = make_response("", 304)
+    else:
+        content = DiffViewService.render(context, [mode]).get(mode)
+        if mode in JSON_MODES:
+            response = jsonify(content)
+        elif content:
+            response = make_response(content)
+            response.mimetype = "text/html"
+        else:
+            response = make_response("", 204)
+
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.max_age = Config.DIFF_VIEW_MAX_AGE
+    return response
+
+
 @api_bp.route("/check/status/<task_id>")
 def check_status(task_id):
     from app.celery_config import celery_app
@@ -8,6 +8,7 @@ from app.services import (
     ProjectService,
     CheckService,
     HistoryService,
+    DiffViewService,
 )
 from app.repositories import HistoryRepository
 from app.utils import set_user_timezone
@@ -48,6 +49,7 @@ def add_link():
     title = request.form.get("title", "").strip()
     project_id = request.form.get("project_id", type=int, default=1)
     tags = request.form.get("tags", "").strip()
+    wait_for_selector = request.form.get("wait_for_selector", "").strip()
 
     if not url:
         flash("URL is required", "error")
@@ -62,7 +64,9 @@ def add_link():
         flash("Invalid URL format", "error")
         return redirect(url_for("main.index"))
 
-    LinkService.create_link(url, title or url, project_id, tags)
+    LinkService.create_link(
+        url, title or url, project_id, tags, wait_for_selector or None
+    )
     flash("Link added successfully", "success")
     return redirect(url_for("main.index"))
 
@@ -116,64 +120,25 @@ def view_link(link_id):
 
 @main_bp.route("/diff/<int:diff_id>")
 def view_diff(diff_id):
-    from app.repositories import InitialPageRepository, DiffRepository
-
-    diff = DiffRepository.get_by_id(diff_id)
+    context = DiffViewService.get_context(diff_id)
 
-    if not diff or not diff.get("link_id"):
+    if not context:
         flash("Diff entry not found", "error")
         return redirect(url_for("main.index"))
 
-    link = LinkService.get_link(diff["link_id"])
-    previous = DiffRepository.get_previous(diff_id)
-    initial = InitialPageRepository.get_by_link(diff["link_id"])
-
-    if not previous and initial:
-        previous = initial
-
-    from app.services.check_service import CheckService
-
-    diff_content = diff.get("diff_content")
-    html_diff = None
-    paragraph_diff = None
-    code_diff = None
-
-    prev_full_content = previous.get("full_content", "") if previous else ""
-    curr_full_content = diff.get("full_content", "")
-    old_price = CheckService._extract_price(prev_full_content)
-    new_price = CheckService._extract_price(curr_full_content)
-    price_data = {"previous": old_price, "current": new_price}
-
-    if previous:
-        html_diff = CheckService._compute_html_diff(
-            previous.get("full_content"), diff.get("full_content"), link.get("url")
-        )
-        from bs4 import BeautifulSoup
-
-        old_soup = BeautifulSoup(previous.get("full_content", ""), "html.parser")
-        new_soup = BeautifulSoup(diff.get("full_content", ""), "html.parser")
-        old_body = old_soup.find("body")
-        new_body = new_soup.find("body")
-        if old_body and new_body:
-            paragraph_diff = CheckService._generate_paragraph_diff(
-                new_body, old_body, link.get("url")
-            )
-            code_diff = CheckService._generate_code_diff(
-                diff.get("full_content"), previous.get("full_content")
-            )
+    diff = context["diff"]
+    previous = context["previous"]
+    initial = context["initial"]
+    rendered = DiffViewService.render(context, ["price"])
 
     return render_template(
         "diff.html",
         entry=diff,
-        link=link,
-        diff=diff_content,
+        link=context["link"],
+        diff=diff.get("diff_content"),
         previous=previous,
         initial=initial,
-        html_diff=html_diff,
-        paragraph_diff=paragraph_diff,
-        code_diff=code_diff,
-        price_data=price_data,
-        image_diff=None,
+        price_data=rendered["price"],
         current_screenshot=diff.get("screenshot"),
         previous_screenshot=previous.get("screenshot")
         if previous
@@ -183,6 +148,32 @@ def view_diff(diff_id):
     )
 
 
+@main_bp.route("/screenshots/<path:filename>")
+def screenshot(filename):
+    import os
+    from flask import abort, send_file
+    from app.utils.screenshot_utils import (
+        SCREENSHOT_DIR,
+        is_manifest,
+        stitch_screenshot,
+    )
+
+    name = os.path.normpath(filename)
+    if name.startswith("..") or os.path.isabs(name):
+        abort(404)
+    if not is_manifest(name):
+        return redirect(url_for("static", filename="screenshots/" + name))
+
+    try:
+        stitched = stitch_screenshot(name, SCREENSHOT_DIR)
+    except (OSError, ValueError):
+        abort(404)
+
+    return send_file(
+        os.path.join(SCREENSHOT_DIR, stitched), mimetype="image/webp", max_age=31536000
+    )
+
+
 @main_bp.route("/initial/<int:link_id>")
 def view_initial(link_id):
     from app.repositories import InitialPageRepository
@@ -202,10 +193,6 @@ def view_initial(link_id):
         diff=None,
         previous=None,
         initial=None,
-        html_diff=None,
-        paragraph_diff=None,
-        code_diff=None,
-        image_diff=None,
         current_screenshot=initial.get("screenshot"),
         previous_screenshot=None,
         is_initial=True,
@@ -3,6 +3,7 @@ from app.services.link_service import LinkService
 from app.services.project_service import ProjectService
 from app.services.check_service import CheckService
 from app.services.history_service import HistoryService
+from app.services.diff_view_service import DiffViewService
 
 __all__ = [
     "HealthService",
@@ -10,4 +11,5 @@ __all__ = [
     "ProjectService",
     "CheckService",
     "HistoryService",
+    "DiffViewService",
 ]
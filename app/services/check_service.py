@@ -1,20 +1,24 @@
-import hashlib
-import difflib
-import os
 import subprocess
 import sys
 import tempfile
 import logging
 from datetime import datetime
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, TYPE_CHECKING
 
 logger = logging.getLogger(__name__)
 
 import requests
-import aiohttp
 import asyncio
 from bs4 import BeautifulSoup
 
+from app.services.circuit_breaker import CircuitBreaker, failure_result, is_unreachable
+from app.utils.diff_engine import get_opcodes, unified_diff
+from app.utils.diff_utils import normalized_hash
+from app.utils.parsed_snapshot import ParsedSnapshot, get_snapshot
+
+if TYPE_CHECKING:
+    from app.tasks.interception import InterceptionRules
+
 
 LLM_SUMMARY_COUNT = 0
 LLM_SUMMARY_LIMIT = 5
@@ -64,7 +68,30 @@ class CheckService:
         }
 
     @staticmethod
-    def check_link(link_id: int) -> Dict[str, Any]:
+    def check_many_async(
+        link_ids: Optional[List[int]] = None, project_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        from app.repositories import LinkRepository
+        from app.tasks.batch_tasks import check_many_task
+
+        if link_ids is None:
+            link_ids = LinkRepository.get_active_ids(project_id)
+        if not link_ids:
+            return {"success": False, "error": "No links to check"}
+
+        logger.info(f"[check_many_async] Submitting batch of {len(link_ids)} link(s)")
+
+        task = check_many_task.delay(link_ids)
+
+        return {
+            "success": True,
+            "task_id": task.id,
+            "count": len(link_ids),
+            "message": f"Batch check started for {len(link_ids)} link(s).",
+        }
+
+    @staticmethod
+    def check_link(link_id: int, take_screenshot: bool = False) -> Dict[str, Any]:
         from app.repositories import (
             LinkRepository,
             InitialPageRepository,
@@ -81,24 +108,62 @@ class CheckService:
             logger.warning(f"[check_link] Link not found: link_id={link_id}")
             return {"success": False, "error": "Link not found"}
 
+        from app.tasks.check_tasks import CheckServiceCelery
+        from app.tasks.interception import InterceptionRules
+
+        blocked = CircuitBreaker.before_fetch(link["url"])
+        if blocked:
+            return CheckServiceCelery._record_failure(link_id, blocked)
+
+        conditional = CheckServiceCelery._conditional_fetch(link)
+        if conditional.get("not_modified"):
+            logger.info(f"[check_link] Not modified (304) for link_id={link_id}")
+            CircuitBreaker.record(link["url"], conditional)
+            return CheckServiceCelery._record_not_modified(link_id)
+
         logger.info(f"[check_link] Fetching URL: {link['url']}")
-        result = CheckService._fetch_url(link["url"])
+        result = CheckService._fetch_url(
+            link["url"],
+            http_content=conditional.get("content"),
+            wait_for_selector=link.get("wait_for_selector"),
+            rules=InterceptionRules.for_link(link),
+            screenshot=take_screenshot,
+            http_hash=conditional.get("content_hash"),
+        )
         logger.debug(f"[check_link] Fetch result success={result.get('success')}")
+        CircuitBreaker.record(link["url"], result)
 
         if result["success"]:
-            content_hash = hashlib.md5(result["content"].encode()).hexdigest()
+            content_hash = result.get("content_hash") or normalized_hash(
+                result["content"]
+            )
+            if DiffRepository.get_latest_hash(link_id) == content_hash:
+                return CheckServiceCelery._record_unchanged(
+                    link_id, content_hash, result, conditional
+                )
 
             initial_page = InitialPageRepository.get_by_link(link_id)
             latest_diff = DiffRepository.get_latest(link_id)
+            if initial_page and CheckServiceCelery._is_rebaseline(
+                link.get("content_strategy"), result
+            ):
+                return CheckServiceCelery._record_rebaseline(
+                    link_id,
+                    result["content"],
+                    content_hash,
+                    latest_diff,
+                    result,
+                    conditional,
+                )
 
-            previous_content = None
-            if initial_page:
-                previous_content = initial_page.get("full_content")
-            elif latest_diff:
-                previous_content = latest_diff.get("full_content")
+            previous_content = CheckServiceCelery._reference_content(
+                link_id, initial_page, latest_diff
+            )
 
             diff_content = (
-                CheckService._compute_diff(previous_content, result["content"])
+                CheckService._compute_diff(
+                    previous_content, result["content"], link.get("diff_algorithm")
+                )
                 if previous_content
                 else None
             )
@@ -134,32 +199,7 @@ class CheckService:
             except Exception:
                 pass
 
-            screenshot_result = None
-            screenshot_filename = None
-            screenshot_dir = None
-            temp_path = None
-            diff_record = None
-
-            if take_screenshot:
-                logger.info(f"[check_link] Taking screenshot for {link['url']}")
-                try:
-                    screenshot_dir = os.path.join(
-                        os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-                        "static",
-                        "screenshots",
-                    )
-                    os.makedirs(screenshot_dir, exist_ok=True)
-                    temp_path = os.path.join(screenshot_dir, "temp_screenshot.png")
-                    logger.debug(f"[check_link] Screenshot temp path: {temp_path}")
-                    screenshot_result = CheckService._take_screenshot(
-                        link["url"], temp_path
-                    )
-                    logger.debug(f"[check_link] Screenshot result: {screenshot_result}")
-                except Exception as e:
-                    logger.error(
-                        f"[check_link] Screenshot error: {type(e).__name__}: {e}"
-                    )
-
+            initial_record = None
             diff_record = None
 
             if not initial_page:
@@ -169,7 +209,6 @@ class CheckService:
                     content_hash,
                     screenshot=None,
                 )
-                screenshot_filename = f"initial_{initial_record['id']}.png"
             else:
                 previous_diff_id = latest_diff["id"] if latest_diff else None
                 diff_record = DiffRepository.create(
@@ -185,29 +224,20 @@ class CheckService:
                     screenshot=None,
                     timezone="UTC",
                 )
-                screenshot_filename = f"diff_{diff_record['id']}.png"
-
-            if screenshot_result and screenshot_dir and temp_path:
-                try:
-                    final_path = os.path.join(screenshot_dir, screenshot_filename)
-                    if os.path.exists(temp_path):
-                        os.rename(temp_path, final_path)
-                        if not initial_page:
-                            InitialPageRepository.update_screenshot(
-                                link_id, screenshot_filename
-                            )
-                        else:
-                            DiffRepository.update_screenshot(
-                                diff_record["id"], screenshot_filename
-                            )
-                except Exception:
-                    pass
+
+            CheckServiceCelery._attach_screenshot(
+                link_id, result.get("screenshot"), initial_record, diff_record
+            )
+            CheckServiceCelery._attach_artifacts(link_id, diff_record)
 
             LinkRepository.update(
                 link_id,
                 last_checked=datetime.now().isoformat(),
                 last_error=None,
+                last_error_class=None,
+                content_strategy=result.get("strategy"),
             )
+            CheckServiceCelery._store_validators(link_id, conditional)
 
             logger.info(
                 f"[check_link] Check completed for link_id={link_id}, success=True, has_changes={bool(diff_content)}"
@@ -221,60 +251,77 @@ class CheckService:
                 "price": price_data,
             }
         else:
-            logger.warning(
-                f"[check_link] Check failed for link_id={link_id}, error={result.get('error')}"
-            )
-            LinkRepository.update(link_id, last_error=result["error"])
-            return {"success": False, "error": result["error"]}
+            return CheckServiceCelery._record_failure(link_id, result)
 
     @staticmethod
     async def _fetch_url_async(url: str) -> Dict[str, Any]:
+        from app.tasks.http_fetch import fetch_async
+
+        return await fetch_async(url)
+
+    @staticmethod
+    def _fetch_url_plain(url: str) -> Dict[str, Any]:
+        from app.tasks import worker_loop
+
         try:
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            }
-            timeout = aiohttp.ClientTimeout(total=30)
-            async with aiohttp.ClientSession(
-                timeout=timeout, headers=headers
-            ) as session:
-                async with session.get(url) as response:
-                    response.raise_for_status()
-                    content = await response.text()
-                    return {"success": True, "content": content[:500000]}
+            return worker_loop.run(CheckService._fetch_url_async(url), timeout=35)
         except Exception as e:
-            return {"success": False, "error": str(e)}
+            return failure_result(e)
 
     @staticmethod
-    def _fetch_url(url: str) -> Dict[str, Any]:
-        from app.tasks import fetch_url
-
-        logger.info(f"[_fetch_url] Submitting celery task for {url}")
-        task = fetch_url.delay(url)
+    def _fetch_url(
+        url: str,
+        http_content: Optional[str] = None,
+        wait_for_selector: Optional[str] = None,
+        rules: Optional["InterceptionRules"] = None,
+        screenshot: bool = False,
+        http_hash: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        from app.services.fetch_router import FetchRouter
+
+        return FetchRouter.fetch(
+            url,
+            render=lambda u: CheckService._fetch_url_rendered(
+                u, wait_for_selector, rules, screenshot
+            ),
+            plain=CheckService._fetch_url_plain,
+            http_content=http_content,
+            force_render=screenshot,
+            http_hash=http_hash,
+        )
 
-        try:
-            result = task.get(timeout=90)
-            logger.info(
-                f"[_fetch_url] Got result for {url}, success={result.get('success')}"
-            )
+    @staticmethod
+    def _fetch_url_rendered(
+        url: str,
+        wait_for_selector: Optional[str] = None,
+        rules: Optional["InterceptionRules"] = None,
+        screenshot: bool = False,
+    ) -> Dict[str, Any]:
+        from app.tasks.screenshot_tasks import fetch_url_sync
+
+        result = fetch_url_sync(url, wait_for_selector, rules, screenshot)
+        logger.info(f"[_fetch_url] Rendered {url}, success={result.get('success')}")
+        if (
+            result.get("success")
+            or result.get("rate_limited")
+            or is_unreachable(result)
+        ):
             return result
-        except Exception as e:
-            logger.error(f"[_fetch_url] Celery task failed: {type(e).__name__}: {e}")
-            pyppeteer_result = CheckService._fetch_url_with_pyppeteer(url)
-            if pyppeteer_result.get("success"):
-                return pyppeteer_result
 
-            try:
-                headers = {
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-                }
-                response = requests.get(url, headers=headers, timeout=30)
-                response.raise_for_status()
-                return {"success": True, "content": response.text[:500000]}
-            except Exception as e:
-                return {"success": False, "error": str(e)}
+        pyppeteer_result = CheckService._fetch_url_with_pyppeteer(
+            url, wait_for_selector, rules, screenshot
+        )
+        if pyppeteer_result.get("success"):
+            return pyppeteer_result
+
+        from app.tasks.http_fetch import fetch_sync
+
+        return fetch_sync(url)
 
     @staticmethod
-    def _compute_diff(old_content: Optional[str], new_content: str) -> Optional[str]:
+    def _compute_diff(
+        old_content: Optional[str], new_content: str, algorithm: Optional[str] = None
+    ) -> Optional[str]:
         if not old_content:
             return None
 
@@ -282,13 +329,14 @@ class CheckService:
         new_lines = new_content.splitlines(keepends=True)
 
         diff = list(
-            difflib.unified_diff(
+            unified_diff(
                 old_lines,
                 new_lines,
                 fromfile="previous",
                 tofile="current",
                 lineterm="",
                 n=3,
+                algorithm=algorithm,
             )
         )
 
@@ -296,52 +344,44 @@ class CheckService:
 
     @staticmethod
     def _compute_html_diff(
-        old_content: Optional[str], new_content: str, url: Optional[str] = None
+        old_content: Optional[str],
+        new_content: str,
+        url: Optional[str] = None,
+        algorithm: Optional[str] = None,
     ) -> Optional[str]:
         if not old_content or not new_content:
             return None
 
-        try:
-            old_soup = BeautifulSoup(old_content, "html.parser")
-            new_soup = BeautifulSoup(new_content, "html.parser")
-        except Exception:
-            return None
+        old = get_snapshot(old_content)
+        new = get_snapshot(new_content)
 
-        old_body = old_soup.find("body")
-        new_body = new_soup.find("body")
-
-        if not old_body or not new_body:
-            old_text = old_soup.get_text(separator=" ", strip=True)
-            new_text = new_soup.get_text(separator=" ", strip=True)
-            if old_text == new_text:
+        if old.body is None or new.body is None:
+            if old.document_text == new.document_text:
                 return None
-            return CheckService._text_diff_to_html(old_text, new_content, url)
-
-        old_text = old_body.get_text(separator="\n", strip=True)
-        new_text = new_body.get_text(separator="\n", strip=True)
+            return CheckService._text_diff_to_html(
+                old.document_text, new_content, url, algorithm
+            )
 
-        if old_text == new_text:
+        if old.text_lines == new.text_lines:
             return None
 
         css_content = ""
         if url:
             css_content = CheckService._download_css(url)
 
-        diff_html = CheckService._generate_body_diff(old_body, new_body, css_content)
+        diff_html = CheckService._generate_body_diff(old, new, css_content, algorithm)
         return diff_html
 
     @staticmethod
-    def _extract_images(soup: BeautifulSoup, base_url: str) -> List[Dict[str, str]]:
+    def _extract_images(
+        snapshot: ParsedSnapshot, base_url: str
+    ) -> List[Dict[str, str]]:
         from urllib.parse import urljoin
 
-        images = []
-        for img in soup.find_all("img"):
-            src = img.get("src") or img.get("data-src")
-            if src:
-                img_url = urljoin(base_url, src)
-                alt = img.get("alt", "")
-                images.append({"src": img_url, "alt": alt})
-        return images
+        return [
+            {"src": urljoin(base_url, img["src"]), "alt": img["alt"]}
+            for img in snapshot.images
+        ]
 
     @staticmethod
     def _compute_image_diff(
@@ -353,14 +393,8 @@ class CheckService:
         if not url:
             return result
 
-        try:
-            old_soup = BeautifulSoup(old_content, "html.parser")
-            new_soup = BeautifulSoup(new_content, "html.parser")
-        except Exception:
-            return result
-
-        old_images = CheckService._extract_images(old_soup, url)
-        new_images = CheckService._extract_images(new_soup, url)
+        old_images = CheckService._extract_images(get_snapshot(old_content), url)
+        new_images = CheckService._extract_images(get_snapshot(new_content), url)
 
         old_srcs = {img["src"] for img in old_images}
         new_srcs = {img["src"] for img in new_images}
@@ -380,24 +414,16 @@ class CheckService:
         return result
 
     @staticmethod
-    def _generate_paragraph_diff(old_body, new_body, url: Optional[str]) -> str:
-        from urllib.parse import urljoin
-
-        old_paragraphs = old_body.find_all(
-            ["p", "div", "h1", "h2", "h3", "h4", "h5", "h6", "li", "span"]
-        )
-        new_paragraphs = new_body.find_all(
-            ["p", "div", "h1", "h2", "h3", "h4", "h5", "h6", "li", "span"]
-        )
-
-        old_texts = [
-            p.get_text(strip=True) for p in old_paragraphs if p.get_text(strip=True)
-        ]
-        new_texts = [
-            p.get_text(strip=True) for p in new_paragraphs if p.get_text(strip=True)
-        ]
+    def _generate_paragraph_diff(
+        old: ParsedSnapshot,
+        new: ParsedSnapshot,
+        url: Optional[str],
+        algorithm: Optional[str] = None,
+    ) -> str:
+        old_texts = old.paragraphs
+        new_texts = new.paragraphs
 
-        matcher = difflib.SequenceMatcher(None, old_texts, new_texts)
+        opcodes = get_opcodes(old_texts, new_texts, algorithm)
 
         html_parts = [
             "<!DOCTYPE html>",
@@ -422,8 +448,8 @@ class CheckService:
             "</style></head><body>",
         ]
 
-        old_images = CheckService._extract_images(old_body, url or "") if url else []
-        new_images = CheckService._extract_images(new_body, url or "") if url else []
+        old_images = CheckService._extract_images(old, url) if url else []
+        new_images = CheckService._extract_images(new, url) if url else []
 
         img_added = [
             img
@@ -450,7 +476,7 @@ class CheckService:
                 )
             html_parts.append("</div></div>")
 
-        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        for tag, i1, i2, j1, j2 in opcodes:
             if tag == "equal":
                 for text in old_texts[i1:i2][:3]:
                     html_parts.append(
@@ -480,27 +506,20 @@ class CheckService:
         return "".join(html_parts)
 
     @staticmethod
-    def _generate_code_diff(old_content: str, new_content: str) -> str:
-        old_soup = BeautifulSoup(old_content, "html.parser")
-        new_soup = BeautifulSoup(new_content, "html.parser")
-
-        old_body = old_soup.find("body")
-        new_body = new_soup.find("body")
-
-        old_html = old_body.prettify() if old_body else ""
-        new_html = new_body.prettify() if new_body else ""
-
-        old_lines = old_html.splitlines()
-        new_lines = new_html.splitlines()
+    def _generate_code_diff(
+        old_content: str, new_content: str, algorithm: Optional[str] = None
+    ) -> str:
+        old_lines = get_snapshot(old_content).pretty_lines
+        new_lines = get_snapshot(new_content).pretty_lines
 
-        matcher = difflib.SequenceMatcher(None, old_lines, new_lines)
+        opcodes = get_opcodes(old_lines, new_lines, algorithm)
 
         html_parts = [
             "<div style='background: #1e1e1e; color: #d4d4d4; font-family: Consolas, Monaco, monospace; font-size: 14px; line-height: 1.5; padding: 16px; margin: 0;'>",
         ]
 
         line_num = 1
-        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        for tag, i1, i2, j1, j2 in opcodes:
             if tag == "equal":
                 for idx, line in enumerate(old_lines[i1:i2]):
                     html_parts.append(
@@ -537,12 +556,19 @@ class CheckService:
 
     @staticmethod
     def _download_css(url: str) -> str:
+        from app.services.diff_cache import mark_incomplete
+
         try:
             from urllib.parse import urljoin
+            from app.services.rate_limiter import get_rate_limiter
 
             parsed_url = requests.Request("GET", url).prepare()
             base_url = parsed_url.url
+            if not base_url:
+                return ""
 
+            limiter = get_rate_limiter()
+            limiter.acquire(base_url, max_wait=0)
             response = requests.get(
                 base_url,
                 timeout=10,
@@ -559,59 +585,30 @@ class CheckService:
             all_css = []
             for link in css_links:
                 href = link.get("href")
-                if href:
+                if isinstance(href, str) and href:
                     css_url = urljoin(base_url, href)
                     try:
+                        limiter.acquire(css_url, max_wait=0)
                         css_response = requests.get(
                             css_url, timeout=5, headers={"User-Agent": "Mozilla/5.0"}
                         )
                         if css_response.ok:
                             all_css.append(css_response.text)
                     except Exception:
-                        pass
+                        mark_incomplete()
 
             return "\n".join(all_css)
         except Exception:
+            mark_incomplete()
             return ""
 
     @staticmethod
     async def _take_screenshot_async(url: str, output_path: str) -> Optional[str]:
         import traceback
+        from app.tasks.screenshot_tasks import take_screenshot_async
 
         try:
-            from pyppeteer import launch
-
-            logger.info(f"[screenshot] Starting screenshot for {url}")
-            logger.debug(f"[screenshot] Output path: {output_path}")
-            import os
-
-            executable = os.environ.get("PYPPETEER_EXECUTABLE_PATH")
-
-            browser = await launch(
-                headless=True,
-                executablePath=executable,
-                args=[
-                    "--no-sandbox",
-                    "--disable-setuid-sandbox",
-                    "--disable-dev-shm-usage",
-                    "--proxy-bypass-list=*",
-                ],
-            )
-            logger.debug("[screenshot] Browser launched")
-            page = await browser.newPage()
-            await page.setViewport({"width": 1920, "height": 1080})
-            logger.debug(f"[screenshot] Navigating to {url}")
-            response = await page.goto(
-                url, {"waitUntil": "networkidle2", "timeout": 30000}
-            )
-            logger.debug(
-                f"[screenshot] Page loaded, status: {response.status if response else 'None'}"
-            )
-            logger.info("[screenshot] Taking screenshot")
-            await page.screenshot(path=output_path, fullPage=True)
-            await browser.close()
-            logger.info(f"[screenshot] Screenshot saved to {output_path}")
-            return output_path
+            return await take_screenshot_async(url, output_path)
         except Exception as e:
             logger.error(f"[screenshot] Error: {type(e).__name__}: {e}")
             logger.debug(f"[screenshot] Traceback: {traceback.format_exc()}")
@@ -619,28 +616,28 @@ class CheckService:
 
     @staticmethod
     def _take_screenshot(url: str, output_path: str) -> Optional[str]:
-        from app.tasks import take_screenshot
+        from app.tasks.screenshot_tasks import take_screenshot_sync
 
         try:
-            logger.info(f"[_take_screenshot] Submitting celery task for {url}")
-            task = take_screenshot.delay(url, output_path)
-
-            result = task.get(timeout=90)
-
+            result = take_screenshot_sync(url, output_path)
             if result:
                 logger.info(f"[_take_screenshot] Screenshot saved to {output_path}")
                 return result
-            else:
-                logger.error(f"[_take_screenshot] Screenshot task returned None")
-                return None
+            logger.error(f"[_take_screenshot] Screenshot returned None")
+            return None
         except Exception as e:
             logger.error(
-                f"[_take_screenshot] Celery task failed: {type(e).__name__}: {e}"
+                f"[_take_screenshot] Screenshot failed: {type(e).__name__}: {e}"
             )
             return None
 
     @staticmethod
-    def _fetch_url_with_pyppeteer(url: str) -> Dict[str, Any]:
+    def _fetch_url_with_pyppeteer(
+        url: str,
+        wait_for_selector: Optional[str] = None,
+        rules: Optional["InterceptionRules"] = None,
+        screenshot: bool = False,
+    ) -> Dict[str, Any]:
         import traceback
 
         try:
@@ -649,6 +646,9 @@ class CheckService:
             import asyncio
             import os
             from playwright.async_api import async_playwright
+            from app.tasks.interception import InterceptionRules, install_playwright
+            from app.tasks.readiness import goto_and_wait
+            from app.utils.screenshot_utils import MAX_HEIGHT_JS, max_capture_height
 
             async def fetch():
                 executable = os.environ.get("PYPPETEER_EXECUTABLE_PATH")
@@ -672,44 +672,56 @@ class CheckService:
                     page = await browser.new_page(
                         viewport={"width": 1920, "height": 1080}
                     )
-                    await page.goto(url, wait_until="networkidle", timeout=30000)
-                    await asyncio.sleep(2)
+                    page_rules = rules or InterceptionRules.from_project(None)
+                    if screenshot:
+                        page_rules = page_rules.for_screenshot()
+                    stats = await install_playwright(page, page_rules)
+                    response, timings = await goto_and_wait(
+                        page, url, wait_for_selector, playwright=True
+                    )
                     html = await page.content()
+                    capture = None
+                    if screenshot:
+                        height = await page.evaluate(MAX_HEIGHT_JS)
+                        capture = await page.screenshot(
+                            full_page=True,
+                            clip={
+                                "x": 0,
+                                "y": 0,
+                                "width": 1920,
+                                "height": min(height, max_capture_height()),
+                            },
+                        )
+                    result = {
+                        "success": True,
+                        "content": html[:500000],
+                        "final_url": page.url,
+                        "status": timings["status"],
+                        "headers": dict(response.headers) if response else {},
+                        "screenshot": capture,
+                        "timings": timings,
+                        "interception": stats.to_dict(),
+                    }
                     await browser.close()
-                    return html
+                    return result
 
-            content = asyncio.run(fetch())
+            result = asyncio.run(fetch())
             logger.info(
-                f"[playwright] Successfully fetched {url}, content length: {len(content)}"
+                f"[playwright] Successfully fetched {url}, content length: {len(result['content'])}"
             )
-            return {"success": True, "content": content[:500000]}
+            return result
 
         except Exception as e:
             logger.error(f"[playwright] Error fetching {url}: {type(e).__name__}: {e}")
             logger.debug(f"[playwright] Traceback: {traceback.format_exc()}")
-            return {"success": False, "error": str(e)}
+            return failure_result(e)
 
     @staticmethod
     def _extract_price(content: str) -> Optional[Dict[str, Any]]:
         try:
             from price_parser import Price
-            import re
-
-            price_patterns = [
-                r"\$\s?[\d,]+\.?\d*",
-                r"USD\s?[\d,]+\.?\d*",
-                r"€\s?[\d,]+\.?\d*",
-                r"£\s?[\d,]+\.?\d*",
-                r"₹\s?[\d,]+\.?\d*",
-                r"[\d,]+\.?\d*\s?(?:USD|EUR|GBP|INR|CAD|AUD)",
-                r'data-price="(\d+)"',
-            ]
-
-            prices_found = []
-            for pattern in price_patterns:
-                matches = re.findall(pattern, content[:10000])
-                prices_found.extend(matches)
 
+            prices_found = get_snapshot(content).price_candidates
             if not prices_found:
                 return None
 
@@ -732,14 +744,16 @@ class CheckService:
             return None
 
     @staticmethod
-    def _generate_body_diff(old_body, new_body, css_content: str) -> str:
-        old_text = old_body.get_text(separator="\n", strip=True)
-        new_text = new_body.get_text(separator="\n", strip=True)
-
-        old_lines = [l for l in old_text.splitlines() if l.strip()]
-        new_lines = [l for l in new_text.splitlines() if l.strip()]
+    def _generate_body_diff(
+        old: ParsedSnapshot,
+        new: ParsedSnapshot,
+        css_content: str,
+        algorithm: Optional[str] = None,
+    ) -> str:
+        old_lines = old.text_lines
+        new_lines = new.text_lines
 
-        matcher = difflib.SequenceMatcher(None, old_lines, new_lines)
+        opcodes = get_opcodes(old_lines, new_lines, algorithm)
 
         custom_css = (
             """
@@ -788,7 +802,7 @@ class CheckService:
             "</head><body>",
         ]
 
-        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        for tag, i1, i2, j1, j2 in opcodes:
             if tag == "equal":
                 for line in old_lines[i1:i2]:
                     html_parts.append(
@@ -819,7 +833,10 @@ class CheckService:
 
     @staticmethod
     def _text_diff_to_html(
-        old_text: str, new_content: str, url: Optional[str] = None
+        old_text: str,
+        new_content: str,
+        url: Optional[str] = None,
+        algorithm: Optional[str] = None,
     ) -> str:
         old_lines = old_text.splitlines()
         new_lines = new_content.splitlines()
@@ -862,7 +879,7 @@ class CheckService:
             + css_content
         )
 
-        matcher = difflib.SequenceMatcher(None, old_lines, new_lines)
+        opcodes = get_opcodes(old_lines, new_lines, algorithm)
         html_parts = [
             "<!DOCTYPE html>",
             "<html><head>",
@@ -871,7 +888,7 @@ class CheckService:
             "</head><body><div class='diff-container'>",
         ]
 
-        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        for tag, i1, i2, j1, j2 in opcodes:
             if tag == "equal":
                 for line in old_lines[i1:i2]:
                     if line.strip():
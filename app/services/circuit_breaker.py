@@ -0,0 +1,265 @@
+import re
+import ssl
+import random
+import socket
+import logging
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+DNS = "dns"
+TLS = "tls"
+TIMEOUT = "timeout"
+CONNECTION = "connection"
+HTTP_4XX = "http_4xx"
+HTTP_5XX = "http_5xx"
+OTHER = "other"
+
+UNREACHABLE = frozenset({DNS, TLS, TIMEOUT, CONNECTION})
+TRIPPING = UNREACHABLE | {HTTP_5XX}
+
+MESSAGE_PATTERNS = (
+    (
+        DNS,
+        (
+            "err_name_not_resolved",
+            "name or service not known",
+            "nodename nor servname",
+            "temporary failure in name resolution",
+            "failed to resolve",
+            "nameresolutionerror",
+            "getaddrinfo failed",
+            "no address associated",
+        ),
+    ),
+    (
+        TLS,
+        (
+            "err_cert",
+            "err_ssl",
+            "sslerror",
+            "[ssl",
+            "certificate",
+            "handshake",
+        ),
+    ),
+    (TIMEOUT, ("timeout", "timed out")),
+    (
+        CONNECTION,
+        (
+            "err_connection",
+            "err_address_unreachable",
+            "err_empty_response",
+            "connection refused",
+            "connection reset",
+            "connection aborted",
+            "cannot connect to host",
+            "network is unreachable",
+            "server disconnected",
+            "remote end closed",
+        ),
+    ),
+)
+
+STATUS_PATTERN = re.compile(r"^([45]\d\d)(?:,| client error| server error)")
+
+
+def _status_class(status: Optional[int]) -> Optional[str]:
+    if not status or status < 400:
+        return None
+    return HTTP_5XX if status >= 500 else HTTP_4XX
+
+
+def classify_message(message: Optional[str]) -> str:
+    text = (message or "").strip().lower()
+    match = STATUS_PATTERN.match(text)
+    if match:
+        return _status_class(int(match.group(1))) or OTHER
+    for error_class, patterns in MESSAGE_PATTERNS:
+        if any(pattern in text for pattern in patterns):
+            return error_class
+    return OTHER
+
+
+def _chain(error: BaseException) -> Iterator[BaseException]:
+    seen = set()
+    pending: List[Optional[BaseException]] = [error]
+    while pending:
+        current = pending.pop(0)
+        if current is None or id(current) in seen:
+            continue
+        seen.add(id(current))
+        yield current
+        pending.extend([current.__cause__, current.__context__])
+        pending.extend(arg for arg in current.args if isinstance(arg, BaseException))
+
+
+def classify_exception(error: BaseException) -> str:
+    for current in _chain(error):
+        response = getattr(current, "response", None)
+        status = getattr(current, "status", None) or getattr(
+            response, "status_code", None
+        )
+        error_class = _status_class(status) if isinstance(status, int) else None
+        if error_class:
+            return error_class
+        if isinstance(current, socket.gaierror):
+            return DNS
+        if isinstance(current, (ssl.SSLError, ssl.CertificateError)):
+            return TLS
+        if isinstance(current, TimeoutError):
+            return TIMEOUT
+        if isinstance(current, ConnectionError):
+            return CONNECTION
+    return classify_message(f"{type(error).__name__}: {error}")
+
+
+def classify_result(result: Dict[str, Any]) -> Optional[str]:
+    if result.get("success"):
+        return None
+    if result.get("error_class"):
+        return result["error_class"]
+    return _status_class(result.get("status")) or classify_message(result.get("error"))
+
+
+def is_unreachable(result: Dict[str, Any]) -> bool:
+    return classify_result(result) in UNREACHABLE
+
+
+def failure_result(error: BaseException) -> Dict[str, Any]:
+    return {
+        "success": False,
+        "error": str(error) or type(error).__name__,
+        "error_class": classify_exception(error),
+    }
+
+
+def open_result(
+    domain: str, retry_after: float, error_class: Optional[str]
+) -> Dict[str, Any]:
+    return {
+        "success": False,
+        "error": f"Circuit open for {domain} ({error_class or OTHER}), next probe in {retry_after:.0f}s",
+        "error_class": error_class,
+        "circuit_open": True,
+        "retry_after": retry_after,
+    }
+
+
+def _backoff(trips: int) -> float:
+    from app.config import Config
+
+    delay = min(
+        Config.CIRCUIT_BASE_BACKOFF * 2 ** max(0, trips - 1),
+        Config.CIRCUIT_MAX_BACKOFF,
+    )
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class CircuitBreaker:
+    @staticmethod
+    def _domain(url: str) -> str:
+        from app.services.fetch_router import FetchRouter
+
+        return FetchRouter.domain_for(url)
+
+    @staticmethod
+    def before_fetch(url: str) -> Optional[Dict[str, Any]]:
+        from app.config import Config
+        from app.repositories import DomainCircuitRepository
+
+        domain = CircuitBreaker._domain(url)
+        if not Config.CIRCUIT_BREAKER_ENABLED or not domain:
+            return None
+
+        try:
+            circuit = DomainCircuitRepository.get_by_domain(domain)
+            if not circuit or circuit["state"] == CLOSED:
+                return None
+
+            now = datetime.utcnow()
+            open_until = datetime.fromisoformat(circuit["open_until"])
+            if now < open_until:
+                return open_result(
+                    domain,
+                    (open_until - now).total_seconds(),
+                    circuit["last_error_class"],
+                )
+
+            stale_before = now - timedelta(seconds=Config.CIRCUIT_PROBE_TIMEOUT)
+            if DomainCircuitRepository.claim_probe(domain, now, stale_before):
+                logger.info(f"[circuit_breaker] {domain}: half-open, sending probe")
+                return None
+        except Exception as e:
+            logger.warning(
+                f"[circuit_breaker] Could not load circuit for {domain}: {e}"
+            )
+            return None
+
+        return open_result(
+            domain, Config.CIRCUIT_PROBE_TIMEOUT, circuit["last_error_class"]
+        )
+
+    @staticmethod
+    def record(url: str, result: Dict[str, Any]) -> Optional[str]:
+        from app.config import Config
+        from app.repositories import DomainCircuitRepository
+
+        if result.get("rate_limited") or result.get("circuit_open"):
+            return result.get("error_class")
+
+        error_class = classify_result(result)
+        domain = CircuitBreaker._domain(url)
+        if not Config.CIRCUIT_BREAKER_ENABLED or not domain:
+            return error_class
+
+        try:
+            circuit = DomainCircuitRepository.get_by_domain(domain)
+            if error_class not in TRIPPING:
+                if circuit and (circuit["state"] != CLOSED or circuit["failures"]):
+                    DomainCircuitRepository.save(
+                        domain,
+                        state=CLOSED,
+                        failures=0,
+                        trips=0,
+                        open_until=None,
+                        probe_started_at=None,
+                    )
+                    logger.info(f"[circuit_breaker] {domain}: closed")
+                return error_class
+
+            circuit = circuit or {"state": CLOSED, "failures": 0, "trips": 0}
+            failures = (circuit["failures"] or 0) + 1
+            now = datetime.utcnow()
+            fields = {
+                "failures": failures,
+                "last_error_class": error_class,
+                "last_failure_at": now,
+            }
+            if (
+                circuit["state"] != CLOSED
+                or failures >= Config.CIRCUIT_FAILURE_THRESHOLD
+            ):
+                trips = (circuit["trips"] or 0) + 1
+                backoff = _backoff(trips)
+                fields.update(
+                    state=OPEN,
+                    trips=trips,
+                    open_until=now + timedelta(seconds=backoff),
+                    probe_started_at=None,
+                )
+                logger.warning(
+                    f"[circuit_breaker] {domain}: open for {backoff:.0f}s after {failures} failure(s) ({error_class})"
+                )
+            DomainCircuitRepository.save(domain, **fields)
+        except Exception as e:
+            logger.warning(
+                f"[circuit_breaker] Could not record outcome for {domain}: {e}"
+            )
+        return error_class
@@ -0,0 +1,301 @@
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+
+_render_state = threading.local()
+
+
+RENDERER_VERSION = 2
+
+JSON_MODES = ("price", "images", "change")
+
+VIEW_MODES = ["price", "html", "paragraph", "code", "images"]
+
+
+class MemoryLRU:
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: str) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = value
+            self._size += len(value)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+
+_memory: Optional[MemoryLRU] = None
+
+
+def get_memory_cache() -> MemoryLRU:
+    global _memory
+    if _memory is None:
+        from app.config import Config
+
+        _memory = MemoryLRU(Config.DIFF_CACHE_MEMORY_MB * 1024 * 1024)
+    return _memory
+
+
+def reset_diff_cache() -> None:
+    global _memory
+    _memory = None
+
+
+def mark_incomplete() -> None:
+    """Flag the current render as missing inputs (e.g. skipped CSS) so it is not cached."""
+    _render_state.incomplete = True
+
+
+def _tracked(render: Callable[[], Optional[str]]) -> Tuple[Optional[str], bool]:
+    _render_state.incomplete = False
+    try:
+        content = render()
+    finally:
+        incomplete = _render_state.incomplete
+        _render_state.incomplete = False
+    return content, not incomplete
+
+
+def snapshot_hash(snapshot: Optional[Dict[str, Any]], field: str) -> str:
+    from app.utils.diff_utils import normalized_hash
+
+    snapshot = snapshot or {}
+    return snapshot.get("content_hash") or normalized_hash(snapshot.get(field) or "")
+
+
+class ParsedPair:
+    def __init__(self, old_content: Optional[str], new_content: Optional[str]):
+        from app.utils.parsed_snapshot import get_snapshot
+
+        self.old_content = old_content or ""
+        self.new_content = new_content or ""
+        self.old = get_snapshot(old_content)
+        self.new = get_snapshot(new_content)
+
+    @property
+    def has_bodies(self) -> bool:
+        return self.old.body is not None and self.new.body is not None
+
+
+def _render_html(pair: ParsedPair, url: Optional[str], algorithm: Optional[str]):
+    from app.services.check_service import CheckService
+
+    return CheckService._compute_html_diff(
+        pair.old_content, pair.new_content, url, algorithm
+    )
+
+
+def _render_paragraph(pair: ParsedPair, url: Optional[str], algorithm: Optional[str]):
+    from app.services.check_service import CheckService
+
+    if not pair.has_bodies:
+        return None
+    return CheckService._generate_paragraph_diff(pair.new, pair.old, url, algorithm)
+
+
+def _render_code(pair: ParsedPair, url: Optional[str], algorithm: Optional[str]):
+    from app.services.check_service import CheckService
+
+    if not pair.has_bodies:
+        return None
+    return CheckService._generate_code_diff(
+        pair.new_content, pair.old_content, algorithm
+    )
+
+
+def _render_unified(pair: ParsedPair, url: Optional[str], algorithm: Optional[str]):
+    from app.services.check_service import CheckService
+
+    return CheckService._compute_diff(pair.old_content, pair.new_content, algorithm)
+
+
+def _render_price(pair: ParsedPair, url: Optional[str], algorithm: Optional[str]):
+    from app.services.check_service import CheckService
+
+    return json.dumps(
+        {
+            "previous": CheckService._extract_price(pair.old_content),
+            "current": CheckService._extract_price(pair.new_content),
+        }
+    )
+
+
+def _render_images(pair: ParsedPair, url: Optional[str], algorithm: Optional[str]):
+    from app.services.check_service import CheckService
+
+    return json.dumps(
+        CheckService._compute_image_diff(pair.old_content, pair.new_content, url)
+    )
+
+
+def _render_change(pair: ParsedPair, url: Optional[str], algorithm: Optional[str]):
+    if not pair.has_bodies:
+        return None
+    old_text = pair.old.body_text
+    if not old_text:
+        return None
+    new_text = pair.new.body_text
+    change_percent = (abs(len(new_text) - len(old_text)) / len(old_text)) * 100
+    return json.dumps(min(change_percent, 100))
+
+
+RENDERERS: Dict[str, Callable[..., Optional[str]]] = {
+    "unified": _render_unified,
+    "html": _render_html,
+    "paragraph": _render_paragraph,
+    "code": _render_code,
+    "price": _render_price,
+    "images": _render_images,
+    "change": _render_change,
+}
+
+
+def decode(mode: str, content: Optional[str]) -> Any:
+    if content and mode in JSON_MODES:
+        return json.loads(content)
+    return content or None
+
+
+def render_artifacts(
+    previous: Optional[Dict[str, Any]],
+    current: Dict[str, Any],
+    link: Optional[Dict[str, Any]],
+    modes: List[str],
+    field: str = "full_content",
+) -> Dict[str, Optional[str]]:
+    link = link or {}
+    url = link.get("url")
+    algorithm = link.get("diff_algorithm")
+    pair = ParsedPair(previous.get(field) if previous else "", current.get(field))
+    artifacts: Dict[str, Optional[str]] = {}
+    for mode in modes:
+        renderer = RENDERERS[mode]
+        content, complete = _tracked(lambda: renderer(pair, url, algorithm))
+        if complete:
+            artifacts[mode] = content
+    return artifacts
+
+
+class DiffCache:
+    @staticmethod
+    def key(
+        prev_hash: str,
+        curr_hash: str,
+        mode: str,
+        algorithm: Optional[str] = None,
+        url: Optional[str] = None,
+    ) -> str:
+        from app.utils.diff_engine import resolve_algorithm
+
+        parts = [
+            str(RENDERER_VERSION),
+            mode,
+            resolve_algorithm(algorithm),
+            url or "",
+            prev_hash,
+            curr_hash,
+        ]
+        return hashlib.sha256(":".join(parts).encode()).hexdigest()
+
+    @staticmethod
+    def keys(
+        previous: Optional[Dict[str, Any]],
+        current: Dict[str, Any],
+        link: Optional[Dict[str, Any]],
+        modes: List[str],
+        field: str = "full_content",
+    ) -> Dict[str, str]:
+        link = link or {}
+        prev_hash = snapshot_hash(previous, field)
+        curr_hash = snapshot_hash(current, field)
+        return {
+            mode: DiffCache.key(
+                prev_hash, curr_hash, mode, link.get("diff_algorithm"), link.get("url")
+            )
+            for mode in modes
+        }
+
+    @staticmethod
+    def get_or_render(
+        key: str, mode: str, render: Callable[[], Optional[str]]
+    ) -> Optional[str]:
+        from app.config import Config
+        from app.repositories import RenderedDiffRepository
+
+        if not Config.DIFF_CACHE_ENABLED:
+            return render()
+
+        memory = get_memory_cache()
+        cached = memory.get(key)
+        if cached is not None:
+            return cached or None
+
+        try:
+            cached = RenderedDiffRepository.get(key)
+        except Exception as e:
+            logger.warning(f"[diff_cache] Reading {mode} diff failed: {e}")
+        if cached is not None:
+            memory.put(key, cached)
+            return cached or None
+
+        rendered, complete = _tracked(render)
+        content = rendered or ""
+        if not complete:
+            return content or None
+        memory.put(key, content)
+        try:
+            RenderedDiffRepository.save(key, mode, content)
+            RenderedDiffRepository.evict(Config.DIFF_CACHE_MAX_MB * 1024 * 1024)
+        except Exception as e:
+            logger.warning(f"[diff_cache] Storing {mode} diff failed: {e}")
+        return content or None
+
+    @staticmethod
+    def render(
+        previous: Optional[Dict[str, Any]],
+        current: Dict[str, Any],
+        link: Optional[Dict[str, Any]],
+        modes: List[str],
+        field: str = "full_content",
+    ) -> Dict[str, Any]:
+        link = link or {}
+        url = link.get("url")
+        algorithm = link.get("diff_algorithm")
+        pair = ParsedPair(previous.get(field) if previous else "", current.get(field))
+        keys = DiffCache.keys(previous, current, link, modes, field)
+
+        results: Dict[str, Any] = {}
+        for mode in modes:
+            renderer = RENDERERS[mode]
+            content = DiffCache.get_or_render(
+                keys[mode],
+                mode,
+                lambda: renderer(pair, url, algorithm),
+            )
+            results[mode] = decode(mode, content)
+        return results
@@ -0,0 +1,53 @@
+from typing import List, Dict, Any, Optional
+
+from app.repositories import (
+    DiffRepository,
+    InitialPageRepository,
+    DiffArtifactRepository,
+)
+from app.services.link_service import LinkService
+from app.services.diff_cache import DiffCache, VIEW_MODES, decode
+
+
+class DiffViewService:
+    @staticmethod
+    def get_context(diff_id: int) -> Optional[Dict[str, Any]]:
+        diff = DiffRepository.get_by_id(diff_id)
+        if not diff or not diff.get("link_id"):
+            return None
+
+        previous = DiffRepository.get_previous(diff_id)
+        initial = InitialPageRepository.get_by_link(diff["link_id"])
+        return {
+            "diff": diff,
+            "link": LinkService.get_link(diff["link_id"]),
+            "previous": previous or initial,
+            "initial": initial,
+        }
+
+    @staticmethod
+    def modes(context: Dict[str, Any]) -> List[str]:
+        return VIEW_MODES if context["previous"] else ["price"]
+
+    @staticmethod
+    def etag(context: Dict[str, Any], mode: str) -> str:
+        keys = DiffCache.keys(
+            context["previous"], context["diff"], context["link"], [mode]
+        )
+        return keys[mode]
+
+    @staticmethod
+    def render(context: Dict[str, Any], modes: List[str]) -> Dict[str, Any]:
+        modes = [mode for mode in modes if mode in DiffViewService.modes(context)]
+        if not modes:
+            return {}
+
+        keys = DiffCache.keys(
+            context["previous"], context["diff"], context["link"], modes
+        )
+        artifacts = DiffArtifactRepository.get_by_diff(context["diff"]["id"], keys)
+        if all(mode in artifacts for mode in modes):
+            return {mode: decode(mode, artifacts[mode]) for mode in modes}
+        return DiffCache.render(
+            context["previous"], context["diff"], context["link"], modes
+        )
@@ -0,0 +1,241 @@
+import re
+import difflib
+import logging
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, Callable
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup
+
+from app.services.circuit_breaker import is_unreachable
+
+logger = logging.getLogger(__name__)
+
+
+HTTP = "http"
+BROWSER = "browser"
+
+
+class FetchRouter:
+    @staticmethod
+    def domain_for(url: str) -> str:
+        return (urlparse(url).hostname or "").lower()
+
+    @staticmethod
+    def visible_text(html: str) -> str:
+        try:
+            soup = BeautifulSoup(html or "", "html.parser")
+        except Exception:
+            return ""
+        for tag in soup(["script", "style", "noscript", "template"]):
+            tag.decompose()
+        root = soup.find("body") or soup
+        return re.sub(r"\s+", " ", root.get_text(separator=" ", strip=True))
+
+    @staticmethod
+    def similarity(http_html: str, rendered_html: str) -> float:
+        from app.config import Config
+
+        limit = Config.ROUTER_SIMILARITY_MAX_WORDS
+        http_words = FetchRouter.visible_text(http_html).split()[:limit]
+        rendered_words = FetchRouter.visible_text(rendered_html).split()[:limit]
+        if not http_words and not rendered_words:
+            return 1.0
+        return difflib.SequenceMatcher(
+            None, http_words, rendered_words, autojunk=False
+        ).ratio()
+
+    @staticmethod
+    def _is_due(stats: Dict[str, Any]) -> bool:
+        from app.config import Config
+
+        if (
+            stats.get("checks_since_validation") or 0
+        ) >= Config.ROUTER_REVALIDATE_CHECKS:
+            return True
+        validated_at = stats.get("validated_at")
+        if not validated_at:
+            return True
+        age = datetime.utcnow() - datetime.fromisoformat(validated_at)
+        return age >= timedelta(hours=Config.ROUTER_REVALIDATE_HOURS)
+
+    @staticmethod
+    def _stats(url: str) -> Optional[Dict[str, Any]]:
+        from app.repositories import FetchStrategyRepository
+
+        try:
+            return FetchStrategyRepository.get_by_domain(FetchRouter.domain_for(url))
+        except Exception as e:
+            logger.warning(f"[fetch_router] Could not load stats for {url}: {e}")
+            return None
+
+    @staticmethod
+    def _needs_sample(stats: Optional[Dict[str, Any]]) -> bool:
+        if not stats or stats.get("matches"):
+            return True
+        return FetchRouter._is_due(stats)
+
+    @staticmethod
+    def needs_sample(url: str) -> bool:
+        return FetchRouter._needs_sample(FetchRouter._stats(url))
+
+    @staticmethod
+    def _verdict(stats: Optional[Dict[str, Any]]) -> str:
+        return HTTP if stats and stats.get("strategy") == HTTP else BROWSER
+
+    @staticmethod
+    def choose(url: str) -> str:
+        return FetchRouter._verdict(FetchRouter._stats(url))
+
+    @staticmethod
+    def is_static(url: str) -> bool:
+        return FetchRouter.choose(url) == HTTP
+
+    @staticmethod
+    def plan(url: str, force_render: bool = False) -> Dict[str, Any]:
+        """Decide which fetches a check makes.
+
+        The content always comes from the domain's settled strategy; a
+        revalidation render on an HTTP domain is only a similarity sample.
+        """
+        stats = FetchRouter._stats(url)
+        strategy = FetchRouter._verdict(stats)
+        if strategy == HTTP:
+            sample = FetchRouter._is_due(stats or {})
+        else:
+            sample = FetchRouter._needs_sample(stats)
+        return {
+            "strategy": strategy,
+            "sample": sample,
+            "render": strategy == BROWSER or sample or force_render,
+        }
+
+    @staticmethod
+    def record_comparison(url: str, http_html: str, rendered_html: str) -> str:
+        from app.config import Config
+        from app.repositories import FetchStrategyRepository
+
+        domain = FetchRouter.domain_for(url)
+        score = FetchRouter.similarity(http_html, rendered_html)
+        stats = FetchStrategyRepository.get_by_domain(domain) or {}
+
+        if score >= Config.ROUTER_SIMILARITY_THRESHOLD:
+            matches = (stats.get("matches") or 0) + 1
+        else:
+            matches = 0
+        strategy = HTTP if matches >= Config.ROUTER_MIN_MATCHES else BROWSER
+
+        FetchStrategyRepository.record_sample(domain, strategy, matches, score)
+        logger.info(
+            f"[fetch_router] {domain}: similarity={score:.3f}, matches={matches}, strategy={strategy}"
+        )
+        return strategy
+
+    @staticmethod
+    def record_fallback(url: str) -> str:
+        from app.repositories import FetchStrategyRepository
+
+        domain = FetchRouter.domain_for(url)
+        FetchStrategyRepository.record_sample(domain, BROWSER, 0, 0.0)
+        logger.info(f"[fetch_router] {domain}: plain fetch failed, strategy={BROWSER}")
+        return BROWSER
+
+    @staticmethod
+    def _record(url: str, record: Callable[[], Any], fallback: str) -> str:
+        try:
+            return record() or fallback
+        except Exception as e:
+            logger.warning(f"[fetch_router] Could not record outcome for {url}: {e}")
+            return fallback
+
+    @staticmethod
+    def settle(
+        url: str,
+        plan: Dict[str, Any],
+        http_result: Optional[Dict[str, Any]],
+        rendered: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        from app.repositories import FetchStrategyRepository
+
+        static = http_result if http_result and http_result.get("success") else None
+        rendered_ok = rendered if rendered and rendered.get("success") else None
+
+        if rendered_ok is None:
+            if static is None or plan["strategy"] != HTTP:
+                return rendered or http_result or {"success": False}
+            strategy = HTTP
+        elif static is not None and plan["sample"]:
+            strategy = FetchRouter._record(
+                url,
+                lambda: FetchRouter.record_comparison(
+                    url, static["content"], rendered_ok["content"]
+                ),
+                plan["strategy"],
+            )
+        elif static is None:
+            strategy = BROWSER
+            if plan["strategy"] == HTTP:
+                FetchRouter._record(
+                    url, lambda: FetchRouter.record_fallback(url), BROWSER
+                )
+        else:
+            strategy = plan["strategy"]
+
+        if strategy == BROWSER and rendered_ok is not None:
+            rendered_ok["strategy"] = BROWSER
+            return rendered_ok
+        if static is None:
+            return rendered or http_result or {"success": False}
+
+        if rendered_ok is None or not plan["sample"]:
+            FetchRouter._record(
+                url,
+                lambda: FetchStrategyRepository.increment_checks(
+                    FetchRouter.domain_for(url)
+                ),
+                HTTP,
+            )
+        static["strategy"] = HTTP
+        if rendered_ok is not None:
+            for key in ("screenshot", "interception"):
+                if rendered_ok.get(key) is not None:
+                    static[key] = rendered_ok[key]
+        return static
+
+    @staticmethod
+    def fetch(
+        url: str,
+        render: Callable[[str], Dict[str, Any]],
+        plain: Callable[[str], Dict[str, Any]],
+        http_content: Optional[str] = None,
+        force_render: bool = False,
+        http_hash: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        plan = FetchRouter.plan(url, force_render)
+        http_result = None
+        if http_content is not None:
+            http_result = {
+                "success": True,
+                "content": http_content,
+                "content_hash": http_hash,
+            }
+
+        if plan["strategy"] == HTTP:
+            if http_result is None:
+                http_result = plain(url)
+            if not http_result.get("success"):
+                if http_result.get("rate_limited") or is_unreachable(http_result):
+                    return http_result
+                logger.info(f"[fetch_router] Plain fetch failed for {url}, rendering")
+            elif not plan["render"]:
+                return FetchRouter.settle(url, plan, http_result, None)
+
+        rendered = render(url)
+        if (
+            plan["strategy"] == BROWSER
+            and plan["sample"]
+            and http_result is None
+            and rendered.get("success")
+        ):
+            http_result = plain(url)
+        return FetchRouter.settle(url, plan, http_result, rendered)
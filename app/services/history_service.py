@@ -10,7 +10,7 @@ class HistoryService:
 
     @staticmethod
     def get_history(history_id: int) -> Optional[Dict[str, Any]]:
-        from app.services.check_service import CheckService
+        from app.services.diff_cache import DiffCache
 
         history = HistoryRepository.get_by_id(history_id)
         if not history:
@@ -37,45 +37,22 @@ class HistoryService:
 
         prev = HistoryRepository.get_previous(history["link_id"], history_id)
 
-        diff = (
-            CheckService._compute_diff(prev["content"], history["content"])
-            if prev
-            else None
-        )
-
-        html_diff = None
-        paragraph_diff = None
-        code_diff = None
-        image_diff = None
-
+        modes = ["unified"] if prev else []
         if prev and history.get("content") and link:
-            url = link.get("url")
-            html_diff = CheckService._compute_html_diff(
-                prev["content"], history["content"], url
-            )
-            from bs4 import BeautifulSoup
+            modes += ["html", "paragraph", "code", "images", "change"]
+        rendered = (
+            DiffCache.render(prev, history, link, modes, field="content")
+            if modes
+            else {}
+        )
 
-            old_soup = BeautifulSoup(prev["content"], "html.parser")
-            new_soup = BeautifulSoup(history["content"], "html.parser")
-            old_body = old_soup.find("body")
-            new_body = new_soup.find("body")
-            if old_body and new_body:
-                old_text = old_body.get_text(strip=True)
-                new_text = new_body.get_text(strip=True)
-                if old_text:
-                    change_percent = (
-                        abs(len(new_text) - len(old_text)) / len(old_text)
-                    ) * 100
-                    history["change_percent"] = min(change_percent, 100)
-                paragraph_diff = CheckService._generate_paragraph_diff(
-                    new_body, old_body, url
-                )
-                code_diff = CheckService._generate_code_diff(
-                    history["content"], prev["content"]
-                )
-            image_diff = CheckService._compute_image_diff(
-                prev["content"], history["content"], url
-            )
+        diff = rendered.get("unified")
+        html_diff = rendered.get("html")
+        paragraph_diff = rendered.get("paragraph")
+        code_diff = rendered.get("code")
+        image_diff = rendered.get("images")
+        if rendered.get("change") is not None:
+            history["change_percent"] = rendered["change"]
 
         return {
             "entry": history,
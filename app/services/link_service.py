@@ -18,8 +18,15 @@ class LinkService:
         title: Optional[str] = None,
         project_id: int = 1,
         tags: Optional[str] = None,
+        wait_for_selector: Optional[str] = None,
     ) -> Dict[str, Any]:
-        return LinkRepository.create(url, title, project_id, tags)
+        return LinkRepository.create(url, title, project_id, tags, wait_for_selector)
+
+    @staticmethod
+    def update_diff_algorithm(
+        link_id: int, algorithm: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        return LinkRepository.update(link_id, diff_algorithm=algorithm)
 
     @staticmethod
     def delete_link(link_id: int) -> bool:
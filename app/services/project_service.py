@@ -12,6 +12,21 @@ class ProjectService:
     def create_project(name: str, description: Optional[str] = None) -> Dict[str, Any]:
         return ProjectRepository.create(name, description)
 
+    @staticmethod
+    def update_interception(
+        project_id: int, **changes: Optional[List[str]]
+    ) -> Optional[Dict[str, Any]]:
+        fields: Dict[str, Optional[str]] = {}
+        if "blocked_resource_types" in changes:
+            types = changes["blocked_resource_types"]
+            fields["blocked_resource_types"] = (
+                ",".join(types) if types is not None else None
+            )
+        if "blocked_domains" in changes:
+            domains = changes["blocked_domains"]
+            fields["blocked_domains"] = ",".join(domains or []) or None
+        return ProjectRepository.update(project_id, **fields)
+
     @staticmethod
     def delete_project(project_id: int) -> bool:
         return ProjectRepository.delete(project_id)
@@ -0,0 +1,165 @@
+import time
+import sqlite3
+import asyncio
+import logging
+import threading
+from typing import Optional, Dict, Any, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimited(Exception):
+    def __init__(self, host: str, retry_after: float):
+        super().__init__(f"Rate limited for {host}, retry in {retry_after:.1f}s")
+        self.host = host
+        self.retry_after = retry_after
+
+
+def deferred_result(error: RateLimited) -> Dict[str, Any]:
+    return {
+        "success": False,
+        "error": str(error),
+        "rate_limited": True,
+        "retry_after": error.retry_after,
+    }
+
+
+def _refill(
+    tokens: float, updated_at: float, rate: float, burst: float, now: float
+) -> Tuple[float, float]:
+    tokens = min(burst, tokens + max(0.0, now - updated_at) * rate)
+    if tokens >= 1:
+        return tokens - 1, 0.0
+    return tokens, (1 - tokens) / rate
+
+
+class MemoryBucketBackend:
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def take(self, host: str, rate: float, burst: float, now: float) -> float:
+        with self._lock:
+            tokens, updated_at = self._buckets.get(host, (burst, now))
+            tokens, wait = _refill(tokens, updated_at, rate, burst, now)
+            self._buckets[host] = (tokens, now)
+            return wait
+
+
+class SQLiteBucketBackend:
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def take(self, host: str, rate: float, burst: float, now: float) -> float:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM host_buckets WHERE host = ?", (host,)
+            ).fetchone()
+            tokens, updated_at = row if row else (burst, now)
+            tokens, wait = _refill(tokens, updated_at, rate, burst, now)
+            conn.execute(
+                "INSERT INTO host_buckets (host, tokens, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(host) DO UPDATE SET tokens = excluded.tokens, "
+                "updated_at = excluded.updated_at",
+                (host, tokens, now),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return wait
+
+
+def _sqlite_backend():
+    from app.config import Config
+
+    if Config.DATABASE_PATH == ":memory:":
+        return MemoryBucketBackend()
+    return SQLiteBucketBackend(Config.DATABASE_PATH)
+
+
+BACKENDS: Dict[str, Callable[[], Any]] = {
+    "memory": MemoryBucketBackend,
+    "sqlite": _sqlite_backend,
+}
+
+
+def _host(url: str) -> str:
+    from app.services.fetch_router import FetchRouter
+
+    return FetchRouter.domain_for(url)
+
+
+class RateLimiter:
+    def __init__(self, backend, rate: float, burst: float, max_wait: float):
+        self.backend = backend
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.max_wait = max_wait
+
+    def try_acquire(self, url: str) -> float:
+        host = _host(url)
+        if not host or self.rate <= 0:
+            return 0.0
+        try:
+            return self.backend.take(host, self.rate, self.burst, time.time())
+        except Exception as e:
+            logger.warning(f"[rate_limiter] Bucket unavailable for {host}: {e}")
+            return 0.0
+
+    def acquire(self, url: str, max_wait: Optional[float] = None) -> None:
+        max_wait = self.max_wait if max_wait is None else max_wait
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(url)
+            if not wait:
+                return
+            if waited + wait > max_wait:
+                raise RateLimited(_host(url), wait)
+            time.sleep(wait)
+            waited += wait
+
+    async def acquire_async(self, url: str, max_wait: Optional[float] = None) -> None:
+        max_wait = self.max_wait if max_wait is None else max_wait
+        waited = 0.0
+        while True:
+            wait = await asyncio.to_thread(self.try_acquire, url)
+            if not wait:
+                return
+            if waited + wait > max_wait:
+                raise RateLimited(_host(url), wait)
+            await asyncio.sleep(wait)
+            waited += wait
+
+
+_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    global _limiter
+    if _limiter is None:
+        from app.config import Config
+
+        backend = BACKENDS.get(Config.RATE_LIMIT_BACKEND, _sqlite_backend)()
+        _limiter = RateLimiter(
+            backend,
+            rate=Config.RATE_LIMIT_PER_HOST if Config.RATE_LIMIT_ENABLED else 0,
+            burst=Config.RATE_LIMIT_BURST,
+            max_wait=Config.RATE_LIMIT_MAX_WAIT,
+        )
+    return _limiter
+
+
+def reset_rate_limiter() -> None:
+    global _limiter
+    _limiter = None
@@ -0,0 +1,74 @@
+import os
+import time
+import logging
+from typing import Dict, Any, Optional
+
+from app.utils.screenshot_utils import (
+    SCREENSHOT_DIR,
+    is_manifest,
+    read_manifest,
+    thumbnail_name,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ScreenshotStore:
+    @staticmethod
+    def live_files(ref_counts: Dict[str, int], output_dir: str = SCREENSHOT_DIR) -> set:
+        live = set()
+        for filename, count in ref_counts.items():
+            if count <= 0:
+                continue
+            live.add(os.path.normpath(filename))
+            live.add(os.path.normpath(thumbnail_name(filename)))
+            if is_manifest(filename):
+                manifest = read_manifest(filename, output_dir)
+                if manifest is None and os.path.exists(
+                    os.path.join(output_dir, filename)
+                ):
+                    raise ValueError(f"Unreadable manifest {filename}")
+                for tile in (manifest or {}).get("tiles", []):
+                    live.add(os.path.normpath(tile))
+        return live
+
+    @staticmethod
+    def collect_garbage(
+        output_dir: str = SCREENSHOT_DIR, grace_seconds: Optional[int] = None
+    ) -> Dict[str, Any]:
+        from app.config import Config
+        from app.repositories import ScreenshotRepository
+
+        grace = Config.SCREENSHOT_GC_GRACE if grace_seconds is None else grace_seconds
+        stats = {"removed": 0, "kept": 0, "bytes_freed": 0}
+        if not os.path.isdir(output_dir):
+            return stats
+
+        live = ScreenshotStore.live_files(ScreenshotRepository.ref_counts(), output_dir)
+        cutoff = time.time() - grace
+
+        for root, dirs, files in os.walk(output_dir, topdown=False):
+            for name in files:
+                path = os.path.join(root, name)
+                relative = os.path.normpath(os.path.relpath(path, output_dir))
+                try:
+                    stat = os.stat(path)
+                    if relative in live or stat.st_mtime > cutoff:
+                        stats["kept"] += 1
+                        continue
+                    os.remove(path)
+                except OSError as e:
+                    logger.warning(f"[screenshot_gc] Could not remove {path}: {e}")
+                    continue
+                stats["removed"] += 1
+                stats["bytes_freed"] += stat.st_size
+            if root != output_dir and not os.listdir(root):
+                try:
+                    os.rmdir(root)
+                except OSError:
+                    pass
+
+        logger.info(
+            f"[screenshot_gc] Removed {stats['removed']} file(s), {stats['bytes_freed']} bytes; kept {stats['kept']}"
+        )
+        return stats
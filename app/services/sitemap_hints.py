@@ -0,0 +1,327 @@
+import zlib
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, DefaultDict, Dict, Any, List, Set, Tuple
+from urllib.parse import urlsplit, urlunsplit
+from xml.etree.ElementTree import Element, XMLPullParser
+
+from app.services.rate_limiter import RateLimited, get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+
+ENTRY_TAGS = {"url", "sitemap", "item", "entry"}
+LOCATION_TAGS = {"loc", "link"}
+TIMESTAMP_TAGS = {"lastmod", "pubDate", "date", "updated", "published", "modified"}
+
+
+def normalize_url(url: str) -> str:
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), path, parts.query, "")
+    )
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    value = (value or "").strip()
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+        if len(value) == 10:
+            parsed = parsed + timedelta(days=1) - timedelta(seconds=1)
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone().replace(tzinfo=None)
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+class LastmodParser:
+    def __init__(self, wanted: Optional[Set[str]] = None):
+        self.wanted = wanted
+        self.entries: Dict[str, datetime] = {}
+        self.sitemaps: List[Tuple[str, Optional[datetime]]] = []
+        self._parser: XMLPullParser = XMLPullParser(events=("start", "end"))
+        self._stack: List[Element] = []
+        self._location: Optional[str] = None
+        self._timestamp: Optional[datetime] = None
+
+    def feed(self, chunk: bytes) -> None:
+        self._parser.feed(chunk)
+        self._drain()
+
+    def close(self) -> None:
+        self._parser.close()
+        self._drain()
+
+    def _drain(self) -> None:
+        for item in self._parser.read_events():
+            event, element = item[0], item[-1]
+            if not isinstance(element, Element):
+                continue
+            name = _local_name(element.tag)
+            if event == "start":
+                self._stack.append(element)
+                if name in ENTRY_TAGS:
+                    self._location, self._timestamp = None, None
+                continue
+
+            self._stack.pop()
+            if name in LOCATION_TAGS and self._location is None:
+                self._location = (element.text or element.get("href") or "").strip()
+            elif name in TIMESTAMP_TAGS:
+                timestamp = parse_timestamp(element.text)
+                if timestamp and (
+                    self._timestamp is None or timestamp > self._timestamp
+                ):
+                    self._timestamp = timestamp
+            elif name in ENTRY_TAGS:
+                self._emit(name)
+                if self._stack:
+                    self._stack[-1].remove(element)
+
+    def _emit(self, name: str) -> None:
+        if not self._location:
+            return
+        if name == "sitemap":
+            self.sitemaps.append((self._location, self._timestamp))
+            return
+        url = normalize_url(self._location)
+        if self._timestamp and (self.wanted is None or url in self.wanted):
+            self.entries[url] = self._timestamp
+
+
+async def _stream(url: str, wanted: Set[str]) -> LastmodParser:
+    import aiohttp
+    from app.config import Config
+    from app.tasks.http_fetch import CHUNK_SIZE, get_http_session
+
+    await get_rate_limiter().acquire_async(url)
+    session = await get_http_session()
+    parser = LastmodParser(wanted)
+    timeout = aiohttp.ClientTimeout(total=Config.SITEMAP_TIMEOUT)
+    async with session.get(url, timeout=timeout) as response:
+        response.raise_for_status()
+        inflater = None
+        size = 0
+        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+            if size == 0 and chunk[:2] == b"\x1f\x8b":
+                inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            if inflater is not None:
+                chunk = inflater.decompress(chunk)
+            size += len(chunk)
+            if size > Config.SITEMAP_MAX_BYTES:
+                logger.warning(f"[sitemap_hints] {url} exceeds size cap, truncating")
+                return parser
+            parser.feed(chunk)
+    parser.close()
+    return parser
+
+
+async def _robots_sitemaps(origin: str) -> List[str]:
+    from app.tasks.http_fetch import get_http_session, read_body_async
+
+    try:
+        await get_rate_limiter().acquire_async(origin)
+        session = await get_http_session()
+        async with session.get(f"{origin}/robots.txt") as response:
+            if response.status != 200:
+                return []
+            body = await read_body_async(response)
+    except Exception as e:
+        logger.debug(f"[sitemap_hints] No robots.txt for {origin}: {e}")
+        return []
+    if not body["success"]:
+        return []
+
+    urls = []
+    for line in body["content"].splitlines():
+        key, _, value = line.partition(":")
+        if key.strip().lower() == "sitemap" and value.strip():
+            urls.append(value.strip())
+    return urls
+
+
+async def collect_lastmods(
+    origin: str, wanted: Set[str], since: Optional[datetime] = None
+) -> Dict[str, Any]:
+    from app.config import Config
+
+    roots = await _robots_sitemaps(origin)
+    for path in Config.SITEMAP_PATHS.split(","):
+        if path.strip() and f"{origin}{path.strip()}" not in roots:
+            roots.append(f"{origin}{path.strip()}")
+
+    pending = list(roots)
+    visited: Set[str] = set()
+    entries: Dict[str, datetime] = {}
+    errors = []
+    files = 0
+
+    while pending and files < Config.SITEMAP_MAX_FILES:
+        url = pending.pop(0)
+        if url in visited:
+            continue
+        visited.add(url)
+        try:
+            parser = await _stream(url, wanted)
+        except RateLimited as e:
+            errors.append(str(e))
+            break
+        except Exception as e:
+            errors.append(f"{url}: {e}")
+            continue
+
+        files += 1
+        entries.update(parser.entries)
+        for child, lastmod in parser.sitemaps:
+            if since and lastmod and lastmod <= since:
+                continue
+            pending.append(child)
+
+    return {
+        "roots": roots,
+        "files": files,
+        "entries": entries,
+        "error": "; ".join(errors[:3]) if errors and not files else None,
+    }
+
+
+def _parse_local(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+class SitemapHintService:
+    @staticmethod
+    def is_known_unchanged(link: Dict[str, Any]) -> bool:
+        from app.config import Config
+
+        hint = _parse_local(link.get("lastmod_hint"))
+        last_checked = _parse_local(link.get("last_checked"))
+        if not hint or not last_checked or link.get("last_error"):
+            return False
+        if datetime.now() - last_checked > timedelta(
+            hours=Config.SITEMAP_MAX_SKIP_HOURS
+        ):
+            return False
+        return hint <= last_checked
+
+    @staticmethod
+    def _due_origins(
+        links: List[Dict[str, Any]],
+    ) -> Dict[str, Tuple[str, List[Dict[str, Any]], Optional[datetime]]]:
+        from app.config import Config
+        from app.repositories import SitemapSourceRepository
+
+        grouped: DefaultDict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for link in links:
+            parts = urlsplit(link["url"])
+            if parts.scheme in ("http", "https") and parts.hostname:
+                grouped[f"{parts.scheme}://{parts.netloc.lower()}"].append(link)
+
+        by_origin = {
+            origin: group
+            for origin, group in grouped.items()
+            if len(group) >= Config.SITEMAP_MIN_LINKS
+        }
+        if not by_origin:
+            return {}
+
+        domains = {origin: urlsplit(origin).hostname or "" for origin in by_origin}
+        sources = SitemapSourceRepository.get_by_domains(list(domains.values()))
+        refresh_before = datetime.now() - timedelta(hours=Config.SITEMAP_REFRESH_HOURS)
+
+        due = {}
+        for origin, group in by_origin.items():
+            source = sources.get(domains[origin]) or {}
+            fetched_at = _parse_local(source.get("fetched_at"))
+            if fetched_at and fetched_at > refresh_before:
+                continue
+            due[origin] = (domains[origin], group, fetched_at)
+        return due
+
+    @staticmethod
+    def refresh(links: List[Dict[str, Any]]) -> Dict[int, str]:
+        from app.config import Config
+        from app.repositories import SitemapSourceRepository
+        from app.tasks import worker_loop
+
+        if not Config.SITEMAP_HINTS_ENABLED:
+            return {}
+
+        try:
+            due = SitemapHintService._due_origins(links)
+        except Exception as e:
+            logger.warning(f"[sitemap_hints] Could not load sitemap sources: {e}")
+            return {}
+        if not due:
+            return {}
+
+        async def gather():
+            return await asyncio.gather(
+                *(
+                    collect_lastmods(
+                        origin,
+                        {normalize_url(link["url"]) for link in group},
+                        since,
+                    )
+                    for origin, (_, group, since) in due.items()
+                ),
+                return_exceptions=True,
+            )
+
+        try:
+            outcomes = worker_loop.run(
+                gather(), timeout=Config.SITEMAP_TIMEOUT * Config.SITEMAP_MAX_FILES
+            )
+        except Exception as e:
+            logger.warning(f"[sitemap_hints] Sitemap refresh failed: {e}")
+            return {}
+
+        hints: Dict[int, datetime] = {}
+        for (origin, (domain, group, _)), outcome in zip(due.items(), outcomes):
+            if isinstance(outcome, BaseException):
+                outcome = {
+                    "roots": [],
+                    "files": 0,
+                    "entries": {},
+                    "error": str(outcome),
+                }
+            for link in group:
+                lastmod = outcome["entries"].get(normalize_url(link["url"]))
+                if lastmod:
+                    hints[link["id"]] = lastmod
+
+            logger.info(
+                f"[sitemap_hints] {domain}: {outcome['files']} file(s), {len(outcome['entries'])} monitored URL(s) with lastmod"
+            )
+            try:
+                SitemapSourceRepository.save(
+                    domain,
+                    sitemap_urls="\n".join(outcome["roots"]),
+                    fetched_at=datetime.now(),
+                    files=outcome["files"],
+                    entries=len(outcome["entries"]),
+                    error=outcome["error"],
+                )
+            except Exception as e:
+                logger.warning(f"[sitemap_hints] Could not store source {domain}: {e}")
+
+        try:
+            SitemapSourceRepository.store_hints(hints)
+        except Exception as e:
+            logger.warning(f"[sitemap_hints] Could not store hints: {e}")
+            return {}
+        return {link_id: lastmod.isoformat() for link_id, lastmod in hints.items()}
@@ -0,0 +1,288 @@
+import queue
+import asyncio
+import logging
+from typing import List, Dict, Any, Optional, Tuple
+
+from app.celery_config import celery_app
+from app.config import Config
+from app.services.circuit_breaker import CircuitBreaker, is_unreachable
+from app.services.fetch_router import FetchRouter, HTTP
+from app.services.sitemap_hints import SitemapHintService
+from app.tasks import worker_loop
+from app.tasks.check_tasks import CheckServiceCelery
+from app.tasks.http_fetch import conditional_fetch_async
+from app.tasks.interception import InterceptionRules
+from app.tasks.screenshot_tasks import fetch_url_async
+
+logger = logging.getLogger(__name__)
+
+
+class BatchFetcher:
+    def __init__(
+        self,
+        concurrency: int = 50,
+        per_host: int = 4,
+        render_concurrency: int = 1,
+        rules: Optional[Dict[Any, InterceptionRules]] = None,
+    ):
+        self.concurrency = concurrency
+        self.rules = rules or {}
+        self.per_host = per_host
+        self.render_concurrency = max(1, render_concurrency)
+        self._global = asyncio.Semaphore(concurrency)
+        self._render = asyncio.Semaphore(self.render_concurrency)
+        self._hosts: Dict[str, asyncio.Semaphore] = {}
+
+    def _host_semaphore(self, host: str) -> asyncio.Semaphore:
+        if host not in self._hosts:
+            self._hosts[host] = asyncio.Semaphore(self.per_host)
+        return self._hosts[host]
+
+    async def _fetch_plain(
+        self, link: Dict[str, Any], plan: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        from app.services.check_service import CheckService
+
+        url = link["url"]
+        static = plan["strategy"] == HTTP
+
+        conditional: Dict[str, Any] = {"success": False, "not_modified": False}
+        if Config.CONDITIONAL_GET_ENABLED:
+            conditional = await conditional_fetch_async(
+                url,
+                link.get("etag") if static else None,
+                link.get("last_modified") if static else None,
+            )
+        if conditional.get("not_modified"):
+            return {"conditional": conditional, "fetch_result": None}
+        if conditional.get("rate_limited"):
+            return {"conditional": conditional, "fetch_result": conditional}
+
+        http_result: Optional[Dict[str, Any]] = None
+        if conditional.get("success"):
+            http_result = {
+                "success": True,
+                "content": conditional["content"],
+                "content_hash": conditional.get("content_hash"),
+            }
+        elif static:
+            http_result = await CheckService._fetch_url_async(url)
+            if http_result.get("rate_limited") or is_unreachable(http_result):
+                return {"conditional": conditional, "fetch_result": http_result}
+        return {
+            "conditional": conditional,
+            "plan": plan,
+            "http_result": http_result,
+            "rendered": None,
+        }
+
+    async def fetch_one(
+        self, link: Dict[str, Any], plan: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        from app.services.check_service import CheckService
+
+        url = link["url"]
+        host = self._host_semaphore(FetchRouter.domain_for(url))
+
+        async with self._global, host:
+            outcome = await self._fetch_plain(link, plan)
+        http_result = outcome.get("http_result")
+        if "fetch_result" in outcome or (
+            plan["strategy"] == HTTP
+            and http_result
+            and http_result.get("success")
+            and not plan["render"]
+        ):
+            return outcome
+
+        # The render slot is taken before the global and host slots, so links
+        # queued for the browser never sit on a slot the plain fetches need.
+        async with self._render, self._global, host:
+            rendered = await fetch_url_async(
+                url,
+                link.get("wait_for_selector"),
+                self.rules.get(link.get("project_id")),
+                Config.CHECK_SCREENSHOTS,
+            )
+            if rendered.get("rate_limited"):
+                return {"conditional": outcome["conditional"], "fetch_result": rendered}
+            if plan["sample"] and http_result is None and rendered.get("success"):
+                outcome["http_result"] = await CheckService._fetch_url_async(url)
+        outcome["rendered"] = rendered
+        return outcome
+
+    async def run(
+        self, items: List[Tuple[Dict[str, Any], Dict[str, Any]]], results: queue.Queue
+    ) -> None:
+        async def worker(link, plan):
+            try:
+                outcome = await self.fetch_one(link, plan)
+            except Exception as e:
+                logger.error(f"[check_many] Fetch failed for {link['url']}: {e}")
+                outcome = {
+                    "conditional": {},
+                    "fetch_result": {"success": False, "error": str(e)},
+                }
+            await asyncio.to_thread(results.put, (link, outcome))
+
+        await asyncio.gather(*(worker(link, plan) for link, plan in items))
+
+
+def _persist_outcome(link: Dict[str, Any], outcome: Dict[str, Any]) -> Dict[str, Any]:
+    conditional = outcome["conditional"]
+    if conditional.get("not_modified"):
+        CircuitBreaker.record(link["url"], conditional)
+        return CheckServiceCelery._record_not_modified(link["id"])
+
+    fetch_result = outcome.get("fetch_result") or FetchRouter.settle(
+        link["url"], outcome["plan"], outcome["http_result"], outcome["rendered"]
+    )
+    CircuitBreaker.record(link["url"], fetch_result)
+    return CheckServiceCelery._process_fetch_result(
+        link["id"],
+        fetch_result,
+        conditional,
+        link.get("diff_algorithm"),
+        link.get("content_strategy"),
+    )
+
+
+def check_many(link_ids: List[int]) -> Dict[str, Any]:
+    from app.repositories import LinkRepository, CheckEventRepository
+
+    links = [link for link in map(LinkRepository.get_by_id, link_ids) if link]
+    hints = SitemapHintService.refresh(links)
+    items = []
+    skipped = {}
+    hinted = []
+    for link in links:
+        if link["id"] in hints:
+            link["lastmod_hint"] = hints[link["id"]]
+        if SitemapHintService.is_known_unchanged(link):
+            hinted.append(link["id"])
+            continue
+        blocked = CircuitBreaker.before_fetch(link["url"])
+        if blocked:
+            skipped[link["id"]] = CheckServiceCelery._record_failure(
+                link["id"], blocked
+            )
+        else:
+            items.append(
+                (link, FetchRouter.plan(link["url"], Config.CHECK_SCREENSHOTS))
+            )
+    rules = {}
+    for link, _ in items:
+        if link.get("project_id") not in rules:
+            rules[link.get("project_id")] = InterceptionRules.for_link(link)
+
+    for link_id in hinted:
+        CheckEventRepository.create(link_id, "sitemap_unchanged")
+    logger.info(
+        f"[check_many] Checking {len(items)} link(s), {len(hinted)} unchanged per sitemap, {len(skipped)} skipped by open circuits"
+    )
+
+    fetcher = BatchFetcher(
+        concurrency=Config.BATCH_CONCURRENCY,
+        per_host=Config.BATCH_PER_HOST,
+        render_concurrency=Config.BATCH_RENDER_CONCURRENCY,
+        rules=rules,
+    )
+    results: queue.Queue = queue.Queue(maxsize=max(1, Config.BATCH_CONCURRENCY))
+    future = asyncio.run_coroutine_threadsafe(
+        fetcher.run(items, results), worker_loop.get_loop()
+    )
+
+    summary: Dict[str, Any] = {
+        "success": True,
+        "total": len(items) + len(skipped) + len(hinted),
+        "changed": 0,
+        "unchanged": len(hinted),
+        "hinted": len(hinted),
+        "failed": len(skipped),
+        "deferred": 0,
+        "skipped": len(skipped),
+        "links": {
+            link_id: {
+                "success": False,
+                "has_changes": False,
+                "diff_id": None,
+                "error": result["error"],
+            }
+            for link_id, result in skipped.items()
+        },
+    }
+    for link_id in hinted:
+        summary["links"][link_id] = {
+            "success": True,
+            "has_changes": False,
+            "diff_id": None,
+            "error": None,
+        }
+    deferred: List[int] = []
+    retry_after = 0.0
+    done = 0
+    try:
+        while done < len(items):
+            try:
+                link, outcome = results.get(timeout=1)
+            except queue.Empty:
+                if future.done():
+                    future.result()
+                    break
+                continue
+
+            done += 1
+            fetch_result = outcome.get("fetch_result") or {}
+            if fetch_result.get("rate_limited"):
+                deferred.append(link["id"])
+                retry_after = max(retry_after, fetch_result.get("retry_after") or 1)
+                continue
+
+            try:
+                result = _persist_outcome(link, outcome)
+            except Exception as e:
+                logger.error(
+                    f"[check_many] Persist failed for link_id={link['id']}: {e}"
+                )
+                result = {"success": False, "error": str(e)}
+
+            if not result.get("success"):
+                summary["failed"] += 1
+            elif result.get("has_changes"):
+                summary["changed"] += 1
+            else:
+                summary["unchanged"] += 1
+            summary["links"][link["id"]] = {
+                "success": result.get("success"),
+                "has_changes": result.get("has_changes", False),
+                "diff_id": result.get("diff_id"),
+                "error": result.get("error"),
+            }
+
+        future.result()
+    finally:
+        # Stops the fetches still running on the worker loop (e.g. after the
+        # soft time limit) so their pooled pages and semaphore slots go back.
+        future.cancel()
+
+    if deferred:
+        summary["deferred"] = len(deferred)
+        logger.info(
+            f"[check_many] Rescheduling {len(deferred)} rate-limited link(s) in {retry_after:.1f}s"
+        )
+        check_many_task.apply_async((deferred,), countdown=retry_after)
+
+    logger.info(
+        f"[check_many] Done: changed={summary['changed']}, unchanged={summary['unchanged']}, failed={summary['failed']}, deferred={summary['deferred']}"
+    )
+    return summary
+
+
+@celery_app.task(
+    bind=True,
+    name="app.tasks.check_many",
+    soft_time_limit=Config.BATCH_TIME_LIMIT,
+    time_limit=Config.BATCH_TIME_LIMIT + 60,
+)
+def check_many_task(self, link_ids: List[int]):
+    return check_many(link_ids)
@@ -0,0 +1,274 @@
+import os
+import time
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Optional, List, Dict, Any, Callable, Awaitable
+
+logger = logging.getLogger(__name__)
+
+
+BROWSER_ARGS = [
+    "--allow-running-insecure-content",
+    "--disable-cache",
+    "--disable-dev-shm-usage",
+    "--disable-features=IsolateOrigins,site-per-process",
+    "--disable-gpu",
+    "--disable-setuid-sandbox",
+    "--disable-web-security",
+    "--disk-cache-size=0",
+    "--ignore-certificate-errors",
+    "--no-sandbox",
+    "--no-zygote",
+    "--proxy-bypass-list=*",
+    "--proxy-server=direct://",
+]
+
+
+async def _launch_chromium(args: List[str]):
+    from pyppeteer import launch
+
+    return await launch(
+        headless=True,
+        executablePath=os.environ.get("PYPPETEER_EXECUTABLE_PATH"),
+        args=args,
+        handleSIGINT=False,
+        handleSIGTERM=False,
+        handleSIGHUP=False,
+    )
+
+
+def _process_tree_rss_mb(pid: Optional[int]) -> float:
+    if not pid or not os.path.isdir("/proc"):
+        return 0.0
+
+    children: Dict[int, List[int]] = {}
+    rss_kb: Dict[int, int] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/status") as f:
+                ppid, rss = None, 0
+                for line in f:
+                    if line.startswith("PPid:"):
+                        ppid = int(line.split()[1])
+                    elif line.startswith("VmRSS:"):
+                        rss = int(line.split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        rss_kb[int(entry)] = rss
+        if ppid is not None:
+            children.setdefault(ppid, []).append(int(entry))
+
+    total = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        total += rss_kb.get(current, 0)
+        stack.extend(children.get(current, []))
+    return total / 1024
+
+
+class PooledBrowser:
+    def __init__(self, browser):
+        self.browser = browser
+        self.pages_served = 0
+        self.launched_at = time.monotonic()
+
+    @property
+    def pid(self) -> Optional[int]:
+        process = getattr(self.browser, "process", None)
+        return getattr(process, "pid", None)
+
+    def rss_mb(self) -> float:
+        return _process_tree_rss_mb(self.pid)
+
+
+class BrowserPool:
+    def __init__(
+        self,
+        size: int = 2,
+        max_pages: int = 100,
+        max_rss_mb: int = 1024,
+        health_timeout: float = 5.0,
+        launcher: Optional[Callable[[List[str]], Awaitable[Any]]] = None,
+        args: Optional[List[str]] = None,
+    ):
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.health_timeout = health_timeout
+        self.launcher = launcher or _launch_chromium
+        self.args = args or list(BROWSER_ARGS)
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._idle: Optional[asyncio.Queue] = None
+        self._browsers: List[PooledBrowser] = []
+        self._closed = False
+        self.stats = {"launched": 0, "recycled": 0, "leases": 0}
+
+    async def start(self) -> None:
+        self.loop = asyncio.get_running_loop()
+        self._idle = asyncio.Queue()
+        for _ in range(self.size):
+            self._idle.put_nowait(await self._launch())
+        logger.info(f"[browser_pool] Started {self.size} warm browser(s)")
+
+    async def _launch(self) -> PooledBrowser:
+        browser = await self.launcher(self.args)
+        pooled = PooledBrowser(browser)
+        self._browsers.append(pooled)
+        self.stats["launched"] += 1
+        logger.debug(f"[browser_pool] Launched browser pid={pooled.pid}")
+        return pooled
+
+    async def _dispose(self, pooled: PooledBrowser) -> None:
+        if pooled in self._browsers:
+            self._browsers.remove(pooled)
+        try:
+            await asyncio.wait_for(pooled.browser.close(), self.health_timeout)
+        except Exception as e:
+            logger.warning(f"[browser_pool] Error closing browser: {e}")
+            process = getattr(pooled.browser, "process", None)
+            if process is not None:
+                try:
+                    process.kill()
+                except Exception:
+                    pass
+
+    async def is_healthy(self, pooled: PooledBrowser) -> bool:
+        process = getattr(pooled.browser, "process", None)
+        if process is not None and process.poll() is not None:
+            return False
+        try:
+            await asyncio.wait_for(pooled.browser.version(), self.health_timeout)
+            return True
+        except Exception:
+            return False
+
+    def needs_recycle(self, pooled: PooledBrowser) -> bool:
+        if self.max_pages and pooled.pages_served >= self.max_pages:
+            return True
+        if self.max_rss_mb and pooled.rss_mb() >= self.max_rss_mb:
+            return True
+        return False
+
+    async def _recycle(self, pooled: PooledBrowser) -> PooledBrowser:
+        logger.info(
+            f"[browser_pool] Recycling browser pid={pooled.pid} after {pooled.pages_served} pages"
+        )
+        self.stats["recycled"] += 1
+        await self._dispose(pooled)
+        return await self._launch()
+
+    @property
+    def _queue(self) -> asyncio.Queue:
+        if self._idle is None:
+            raise RuntimeError("Browser pool not started")
+        return self._idle
+
+    async def _acquire(self) -> PooledBrowser:
+        pooled = await self._queue.get()
+        try:
+            if not await self.is_healthy(pooled):
+                logger.warning(f"[browser_pool] Browser pid={pooled.pid} unhealthy")
+                pooled = await self._recycle(pooled)
+        except Exception:
+            self._queue.put_nowait(pooled)
+            raise
+        return pooled
+
+    async def _release(self, pooled: PooledBrowser) -> None:
+        if self._closed:
+            await self._dispose(pooled)
+            return
+        try:
+            if self.needs_recycle(pooled):
+                pooled = await self._recycle(pooled)
+        finally:
+            self._queue.put_nowait(pooled)
+
+    @asynccontextmanager
+    async def lease(self):
+        if self._idle is None:
+            raise RuntimeError("Browser pool not started")
+
+        pooled = await self._acquire()
+        context = None
+        try:
+            context = await pooled.browser.createIncognitoBrowserContext()
+            self.stats["leases"] += 1
+            yield context
+        finally:
+            pooled.pages_served += 1
+            if context is not None:
+                try:
+                    await asyncio.wait_for(context.close(), self.health_timeout)
+                except Exception as e:
+                    logger.warning(f"[browser_pool] Error closing context: {e}")
+                    pooled.pages_served = self.max_pages or pooled.pages_served
+            await self._release(pooled)
+
+    @asynccontextmanager
+    async def page(self):
+        async with self.lease() as context:
+            page = await context.newPage()
+            yield page
+
+    async def close(self) -> None:
+        self._closed = True
+        for pooled in list(self._browsers):
+            await self._dispose(pooled)
+        logger.info("[browser_pool] Closed")
+
+
+_pool: Optional[BrowserPool] = None
+
+
+def get_pool() -> Optional[BrowserPool]:
+    from app.tasks import worker_loop
+
+    if _pool is None or not worker_loop.is_current():
+        return None
+    return _pool
+
+
+def pool_started() -> bool:
+    return _pool is not None
+
+
+def start_pool() -> Optional[BrowserPool]:
+    global _pool
+    from app.config import Config
+    from app.tasks import worker_loop
+
+    if Config.BROWSER_POOL_SIZE <= 0:
+        logger.info("[browser_pool] Disabled (BROWSER_POOL_SIZE=0)")
+        return None
+
+    pool = BrowserPool(
+        size=Config.BROWSER_POOL_SIZE,
+        max_pages=Config.BROWSER_POOL_MAX_PAGES,
+        max_rss_mb=Config.BROWSER_POOL_MAX_RSS_MB,
+    )
+    try:
+        worker_loop.run(pool.start(), timeout=60)
+    except Exception as e:
+        logger.error(f"[browser_pool] Failed to start: {type(e).__name__}: {e}")
+        return None
+    _pool = pool
+    return _pool
+
+
+def stop_pool() -> None:
+    global _pool
+    from app.tasks import worker_loop
+
+    if _pool is None:
+        return
+    try:
+        worker_loop.run(_pool.close(), timeout=30)
+    except Exception as e:
+        logger.warning(f"[browser_pool] Error during shutdown: {e}")
+    _pool = None
+    worker_loop.stop()
@@ -1,6 +1,6 @@
 import os
-import hashlib
-import difflib
+import json
+import random
 import logging
 
 from datetime import datetime
@@ -11,11 +11,23 @@ import requests
 from bs4 import BeautifulSoup
 
 from app.celery_config import celery_app
+from app.services.circuit_breaker import CircuitBreaker
 from app.tasks.screenshot_tasks import fetch_url_sync
+from app.utils.diff_engine import unified_diff
+from app.utils.diff_utils import normalized_hash
+from app.utils.parsed_snapshot import get_snapshot
+from app.utils.screenshot_utils import store_screenshot
+from app.utils.visual_diff import visual_diff
 
 logger = logging.getLogger(__name__)
 
 
+SCREENSHOT_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+    "static",
+    "screenshots",
+)
+
 LLM_SUMMARY_COUNT = 0
 LLM_SUMMARY_LIMIT = 5
 
@@ -50,7 +62,9 @@ def _highlight_html_tags(text: str) -> str:
 
 class CheckServiceCelery:
     @staticmethod
-    def _compute_diff(old_content: Optional[str], new_content: str) -> Optional[str]:
+    def _compute_diff(
+        old_content: Optional[str], new_content: str, algorithm: Optional[str] = None
+    ) -> Optional[str]:
         if not old_content:
             return None
 
@@ -58,13 +72,14 @@ class CheckServiceCelery:
         new_lines = new_content.splitlines(keepends=True)
 
         diff = list(
-            difflib.unified_diff(
+            unified_diff(
                 old_lines,
                 new_lines,
                 fromfile="previous",
                 tofile="current",
                 lineterm="",
                 n=3,
+                algorithm=algorithm,
             )
         )
 
@@ -74,23 +89,8 @@ class CheckServiceCelery:
     def _extract_price(content: str) -> Optional[Dict[str, Any]]:
         try:
             from price_parser import Price
-            import re
-
-            price_patterns = [
-                r"\$\s?[\d,]+\.?\d*",
-                r"USD\s?[\d,]+\.?\d*",
-                r"€\s?[\d,]+\.?\d*",
-                r"£\s?[\d,]+\.?\d*",
-                r"₹\s?[\d,]+\.?\d*",
-                r"[\d,]+\.?\d*\s?(?:USD|EUR|GBP|INR|CAD|AUD)",
-                r'data-price="(\d+)"',
-            ]
-
-            prices_found = []
-            for pattern in price_patterns:
-                matches = re.findall(pattern, content[:10000])
-                prices_found.extend(matches)
 
+            prices_found = get_snapshot(content).price_candidates
             if not prices_found:
                 return None
 
@@ -113,7 +113,7 @@ class CheckServiceCelery:
             return None
 
     @staticmethod
-    def _generate_summary_simple(diff_text: str) -> str:
+    def _generate_summary_simple(diff_text: Optional[str]) -> str:
         if not diff_text:
             return "No changes detected"
 
@@ -129,34 +129,417 @@ class CheckServiceCelery:
         return "Content changed"
 
     @staticmethod
-    def _update_link_and_create_records(
+    def _conditional_fetch(link: Dict[str, Any]) -> Dict[str, Any]:
+        from app.config import Config
+        from app.tasks.http_fetch import conditional_fetch_sync
+
+        if not Config.CONDITIONAL_GET_ENABLED:
+            return {"success": False, "not_modified": False}
+
+        from app.services.fetch_router import FetchRouter
+
+        if not FetchRouter.is_static(link["url"]):
+            # Browser-routed pages only need the plain body as a router sample.
+            if not FetchRouter.needs_sample(link["url"]):
+                return {"success": False, "not_modified": False}
+            return conditional_fetch_sync(link["url"])
+
+        return conditional_fetch_sync(
+            link["url"], link.get("etag"), link.get("last_modified")
+        )
+
+    @staticmethod
+    def _record_not_modified(link_id: int) -> Dict[str, Any]:
+        from app.repositories import LinkRepository, CheckEventRepository
+
+        LinkRepository.update(
+            link_id,
+            last_checked=datetime.now().isoformat(),
+            last_error=None,
+            last_error_class=None,
+        )
+        CheckEventRepository.create(link_id, "not_modified", detail="HTTP 304")
+
+        return {
+            "success": True,
+            "summary": "No changes detected (HTTP 304)",
+            "has_changes": False,
+            "not_modified": True,
+            "diff_id": None,
+            "is_initial": False,
+            "price": None,
+        }
+
+    @staticmethod
+    def _record_unchanged(
+        link_id: int,
+        content_hash: str,
+        fetch_result: Dict[str, Any],
+        conditional: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        from app.repositories import LinkRepository
+
+        LinkRepository.update(
+            link_id,
+            last_checked=datetime.now().isoformat(),
+            last_error=None,
+            last_error_class=None,
+        )
+        CheckServiceCelery._store_validators(link_id, conditional)
+        result = {
+            "success": True,
+            "summary": "No changes detected",
+            "has_changes": False,
+            "unchanged": True,
+            "diff_id": None,
+            "is_initial": False,
+            "price": None,
+        }
+        CheckServiceCelery._record_check_event(
+            link_id, result, content_hash, fetch_result
+        )
+        logger.info(f"[check_link] Content hash unchanged for link_id={link_id}")
+        return result
+
+    @staticmethod
+    def _is_rebaseline(
+        content_strategy: Optional[str], fetch_result: Dict[str, Any]
+    ) -> bool:
+        strategy = fetch_result.get("strategy")
+        return bool(content_strategy and strategy and strategy != content_strategy)
+
+    @staticmethod
+    def _record_rebaseline(
         link_id: int,
         content: str,
         content_hash: str,
-        summary: str = None,
-        price_data: Dict = None,
+        latest_diff: Optional[Dict[str, Any]],
+        fetch_result: Dict[str, Any],
+        conditional: Dict[str, Any],
     ) -> Dict[str, Any]:
-        from app.repositories import (
-            LinkRepository,
-            InitialPageRepository,
-            DiffRepository,
+        from app.repositories import LinkRepository, DiffRepository
+
+        # A raw HTTP body and the browser's outerHTML never hash alike, so a
+        # route switch starts a new baseline row instead of diffing across it.
+        summary = "Fetch strategy changed; snapshot re-baselined"
+        diff_record = DiffRepository.create(
+            link_id,
+            latest_diff["id"] if latest_diff else None,
+            content,
+            content_hash,
+            summary=summary,
+            timezone="UTC",
+            is_baseline=True,
+        )
+        stored_screenshot = CheckServiceCelery._attach_screenshot(
+            link_id, fetch_result.get("screenshot"), None, diff_record
+        )
+        LinkRepository.update(
+            link_id,
+            last_checked=datetime.now().isoformat(),
+            last_error=None,
+            last_error_class=None,
+            content_strategy=fetch_result["strategy"],
+        )
+        CheckServiceCelery._store_validators(link_id, conditional)
+        result = {
+            "success": True,
+            "summary": summary,
+            "has_changes": False,
+            "rebaselined": True,
+            "diff_id": diff_record["id"],
+            "is_initial": False,
+            "price": None,
+            "screenshot": stored_screenshot,
+        }
+        CheckServiceCelery._record_check_event(
+            link_id, result, content_hash, fetch_result
+        )
+        logger.info(
+            f"[check_link] Re-baselined link_id={link_id} on {fetch_result['strategy']}"
+        )
+        return result
+
+    @staticmethod
+    def _reference_content(
+        link_id: int,
+        initial_page: Optional[Dict[str, Any]],
+        latest_diff: Optional[Dict[str, Any]],
+    ) -> Optional[str]:
+        from app.repositories import DiffRepository
+
+        baseline = DiffRepository.get_baseline(link_id)
+        if baseline:
+            return baseline.get("full_content")
+        if initial_page:
+            return initial_page.get("full_content")
+        if latest_diff:
+            return latest_diff.get("full_content")
+        return None
+
+    @staticmethod
+    def _record_failure(link_id: int, fetch_result: Dict[str, Any]) -> Dict[str, Any]:
+        from app.repositories import LinkRepository
+        from app.services.circuit_breaker import classify_result
+
+        error_class = classify_result(fetch_result)
+        LinkRepository.update(
+            link_id,
+            last_error=fetch_result["error"],
+            last_error_class=error_class,
+        )
+        logger.warning(
+            f"[check_link] Check failed for link_id={link_id}, class={error_class}, error={fetch_result.get('error')}"
+        )
+        result = {
+            "success": False,
+            "error": fetch_result["error"],
+            "error_class": error_class,
+        }
+        if fetch_result.get("circuit_open"):
+            result["circuit_open"] = True
+        return result
+
+    @staticmethod
+    def _store_validators(link_id: int, conditional: Dict[str, Any]) -> None:
+        from app.repositories import LinkRepository
+
+        if not conditional.get("success"):
+            return
+
+        LinkRepository.update(
+            link_id,
+            etag=conditional.get("etag"),
+            last_modified=conditional.get("last_modified"),
         )
 
+    @staticmethod
+    def _previous_capture(
+        link_id: int, diff_record: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        from app.repositories import InitialPageRepository, DiffRepository
+
+        if not diff_record:
+            return None
+        if diff_record.get("previous_diff_id"):
+            return DiffRepository.get_by_id(diff_record["previous_diff_id"])
+        return InitialPageRepository.get_by_link(link_id)
+
+    @staticmethod
+    def _attach_screenshot(
+        link_id: int,
+        capture: Optional[bytes],
+        initial_record: Optional[Dict[str, Any]],
+        diff_record: Optional[Dict[str, Any]],
+    ) -> Optional[str]:
+        from app.repositories import InitialPageRepository, DiffRepository
+
+        if not capture:
+            return None
+
+        try:
+            previous = CheckServiceCelery._previous_capture(link_id, diff_record)
+            previous_hash = None
+            if previous and previous.get("screenshot"):
+                previous_hash = previous.get("screenshot_hash")
+
+            stored = store_screenshot(capture, SCREENSHOT_DIR, previous_hash)
+            if not diff_record:
+                InitialPageRepository.update_screenshot(
+                    link_id, stored["filename"], stored["hash"]
+                )
+                return stored["filename"]
+
+            if stored.get("similar") and previous:
+                DiffRepository.update_screenshot(
+                    diff_record["id"], previous["screenshot"], stored["hash"]
+                )
+                DiffRepository.update_visual_diff(diff_record["id"], 0.0, [], None)
+                logger.info(
+                    f"[check_link] No visual change for link_id={link_id}, reusing {previous['screenshot']}"
+                )
+                return previous["screenshot"]
+
+            DiffRepository.update_screenshot(
+                diff_record["id"], stored["filename"], stored["hash"]
+            )
+            CheckServiceCelery._attach_visual_diff(
+                diff_record["id"], previous, stored["filename"]
+            )
+            return stored["filename"]
+        except Exception as e:
+            logger.error(f"[check_link] Could not store screenshot: {e}")
+            return None
+
+    @staticmethod
+    def _attach_visual_diff(
+        diff_id: int, previous: Optional[Dict[str, Any]], filename: str
+    ) -> None:
+        from app.repositories import DiffRepository
+
+        if not previous:
+            return
+
+        result = visual_diff(previous.get("screenshot"), filename, SCREENSHOT_DIR)
+        if result:
+            DiffRepository.update_visual_diff(
+                diff_id,
+                result["changed_percent"],
+                result["regions"],
+                result["heatmap"],
+            )
+
+    @staticmethod
+    def _attach_artifacts(link_id: int, diff_record: Optional[Dict[str, Any]]) -> None:
+        from app.config import Config
+        from app.repositories import LinkRepository, DiffArtifactRepository
+        from app.services.diff_cache import DiffCache, VIEW_MODES, render_artifacts
+
+        if not Config.DIFF_PRECOMPUTE_ENABLED:
+            return
+        if not diff_record or not diff_record.get("diff_content"):
+            return
+
+        try:
+            previous = CheckServiceCelery._previous_capture(link_id, diff_record)
+            if not previous:
+                return
+            link = LinkRepository.get_by_id(link_id)
+            artifacts = render_artifacts(previous, diff_record, link, VIEW_MODES)
+            keys = DiffCache.keys(previous, diff_record, link, VIEW_MODES)
+            DiffArtifactRepository.save(diff_record["id"], artifacts, keys)
+            logger.info(
+                f"[check_link] Precomputed {len(artifacts)} diff view(s) for diff_id={diff_record['id']}"
+            )
+        except Exception as e:
+            logger.error(f"[check_link] Could not precompute diff views: {e}")
+
+    @staticmethod
+    def _process_fetch_result(
+        link_id: int,
+        fetch_result: Dict[str, Any],
+        conditional: Dict[str, Any],
+        algorithm: Optional[str] = None,
+        content_strategy: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        from app.repositories import InitialPageRepository, DiffRepository
+
+        if not fetch_result["success"]:
+            return CheckServiceCelery._record_failure(link_id, fetch_result)
+
+        content = fetch_result["content"]
+        content_hash = fetch_result.get("content_hash") or normalized_hash(content)
+        if DiffRepository.get_latest_hash(link_id) == content_hash:
+            return CheckServiceCelery._record_unchanged(
+                link_id, content_hash, fetch_result, conditional
+            )
+
         initial_page = InitialPageRepository.get_by_link(link_id)
         latest_diff = DiffRepository.get_latest(link_id)
+        if initial_page and CheckServiceCelery._is_rebaseline(
+            content_strategy, fetch_result
+        ):
+            return CheckServiceCelery._record_rebaseline(
+                link_id, content, content_hash, latest_diff, fetch_result, conditional
+            )
 
-        previous_content = None
-        if initial_page:
-            previous_content = initial_page.get("full_content")
-        elif latest_diff:
-            previous_content = latest_diff.get("full_content")
+        previous_content = CheckServiceCelery._reference_content(
+            link_id, initial_page, latest_diff
+        )
 
         diff_content = (
-            CheckServiceCelery._compute_diff(previous_content, content)
+            CheckServiceCelery._compute_diff(previous_content, content, algorithm)
             if previous_content
             else None
         )
 
+        price_data = None
+        try:
+            price_data = CheckServiceCelery._extract_price(content)
+        except Exception:
+            pass
+
+        previous_content_for_summary = previous_content if previous_content else None
+        summary = "Processing complete"
+        if previous_content_for_summary:
+            try:
+                from app.services.check_service import CheckService
+
+                summary = CheckService._generate_summary(
+                    previous_content_for_summary, content, diff_content or ""
+                )
+            except Exception as e:
+                logger.warning(f"[check_link] LLM summary failed: {e}")
+                summary = CheckServiceCelery._generate_summary_simple(diff_content)
+
+        result = CheckServiceCelery._update_link_and_create_records(
+            link_id,
+            content,
+            content_hash,
+            initial_page,
+            latest_diff,
+            diff_content,
+            summary=summary,
+            price_data=price_data,
+            screenshot=fetch_result.get("screenshot"),
+            strategy=fetch_result.get("strategy"),
+        )
+        CheckServiceCelery._store_validators(link_id, conditional)
+        CheckServiceCelery._record_check_event(
+            link_id, result, content_hash, fetch_result
+        )
+
+        logger.info(f"[check_link] Check completed for link_id={link_id}, success=True")
+        return result
+
+    @staticmethod
+    def _record_check_event(
+        link_id: int,
+        result: Dict[str, Any],
+        content_hash: str,
+        fetch_result: Dict[str, Any],
+    ) -> None:
+        from app.repositories import CheckEventRepository
+
+        if result.get("is_initial"):
+            outcome = "initial"
+        elif result.get("rebaselined"):
+            outcome = "rebaselined"
+        elif result.get("has_changes"):
+            outcome = "changed"
+        else:
+            outcome = "unchanged"
+
+        telemetry = dict(fetch_result.get("timings") or {})
+        if fetch_result.get("interception"):
+            telemetry["interception"] = fetch_result["interception"]
+        CheckEventRepository.create(
+            link_id,
+            outcome,
+            content_hash=content_hash,
+            detail=json.dumps(telemetry) if telemetry else None,
+        )
+
+    @staticmethod
+    def _update_link_and_create_records(
+        link_id: int,
+        content: str,
+        content_hash: str,
+        initial_page: Optional[Dict[str, Any]],
+        latest_diff: Optional[Dict[str, Any]],
+        diff_content: Optional[str],
+        summary: Optional[str] = None,
+        price_data: Optional[Dict] = None,
+        screenshot: Optional[bytes] = None,
+        strategy: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        from app.repositories import (
+            LinkRepository,
+            InitialPageRepository,
+            DiffRepository,
+        )
+
+        initial_record = None
         diff_record = None
 
         if not initial_page:
@@ -180,10 +563,17 @@ class CheckServiceCelery:
                 timezone="UTC",
             )
 
+        stored_screenshot = CheckServiceCelery._attach_screenshot(
+            link_id, screenshot, initial_record, diff_record
+        )
+        CheckServiceCelery._attach_artifacts(link_id, diff_record)
+
         LinkRepository.update(
             link_id,
             last_checked=datetime.now().isoformat(),
             last_error=None,
+            last_error_class=None,
+            content_strategy=strategy,
         )
 
         return {
@@ -193,16 +583,28 @@ class CheckServiceCelery:
             "diff_id": diff_record.get("id") if diff_record else None,
             "is_initial": not initial_page,
             "price": price_data,
+            "screenshot": stored_screenshot,
         }
 
 
+def _defer(task, link_id: int, result: Dict[str, Any]) -> None:
+    from app.config import Config
+
+    if task.request.retries >= Config.RATE_LIMIT_MAX_DEFERRALS:
+        logger.warning(f"[check_link] Giving up deferring link_id={link_id}")
+        return
+
+    retry_after = result.get("retry_after") or 1
+    countdown = retry_after + random.uniform(0, retry_after)
+    logger.info(
+        f"[check_link] Host busy, rescheduling link_id={link_id} in {countdown:.1f}s"
+    )
+    raise task.retry(countdown=countdown, max_retries=Config.RATE_LIMIT_MAX_DEFERRALS)
+
+
 @celery_app.task(bind=True, name="app.tasks.check_link")
 def check_link_task(self, link_id: int):
-    from app.repositories import (
-        LinkRepository,
-        InitialPageRepository,
-        DiffRepository,
-    )
+    from app.repositories import LinkRepository
 
     logger.info(f"[check_link] Starting check for link_id={link_id}")
 
@@ -211,62 +613,46 @@ def check_link_task(self, link_id: int):
         logger.warning(f"[check_link] Link not found: link_id={link_id}")
         return {"success": False, "error": "Link not found"}
 
-    logger.info(f"[check_link] Fetching URL: {link['url']}")
-
-    fetch_result = fetch_url_sync(link["url"])
-    logger.debug(f"[check_link] Fetch result success={fetch_result.get('success')}")
-
-    if fetch_result["success"]:
-        content = fetch_result["content"]
-        content_hash = hashlib.md5(content.encode()).hexdigest()
-
-        initial_page = InitialPageRepository.get_by_link(link_id)
-        latest_diff = DiffRepository.get_latest(link_id)
-
-        previous_content = None
-        if initial_page:
-            previous_content = initial_page.get("full_content")
-        elif latest_diff:
-            previous_content = latest_diff.get("full_content")
-
-        diff_content = (
-            CheckServiceCelery._compute_diff(previous_content, content)
-            if previous_content
-            else None
-        )
-
-        price_data = None
-        try:
-            price_data = CheckServiceCelery._extract_price(content)
-        except Exception:
-            pass
-
-        previous_content_for_summary = previous_content if previous_content else None
-        summary = "Processing complete"
-        if previous_content_for_summary:
-            try:
-                from app.services.check_service import CheckService
+    blocked = CircuitBreaker.before_fetch(link["url"])
+    if blocked:
+        return CheckServiceCelery._record_failure(link_id, blocked)
 
-                summary = CheckService._generate_summary(
-                    previous_content_for_summary, content, diff_content
-                )
-            except Exception as e:
-                logger.warning(f"[check_link] LLM summary failed: {e}")
-                summary = CheckServiceCelery._generate_summary_simple(diff_content)
+    conditional = CheckServiceCelery._conditional_fetch(link)
+    if conditional.get("rate_limited"):
+        _defer(self, link_id, conditional)
+    if conditional.get("not_modified"):
+        logger.info(f"[check_link] Not modified (304) for link_id={link_id}")
+        CircuitBreaker.record(link["url"], conditional)
+        return CheckServiceCelery._record_not_modified(link_id)
 
-        result = CheckServiceCelery._update_link_and_create_records(
-            link_id,
-            content,
-            content_hash,
-            summary=summary,
-            price_data=price_data,
-        )
+    logger.info(f"[check_link] Fetching URL: {link['url']}")
 
-        logger.info(f"[check_link] Check completed for link_id={link_id}, success=True")
-        return result
-    else:
-        LinkRepository.update(link_id, last_error=fetch_result["error"])
-        logger.warning(
-            f"[check_link] Check failed for link_id={link_id}, error={fetch_result.get('error')}"
-        )
-        return {"success": False, "error": fetch_result["error"]}
+    from app.services.check_service import CheckService
+    from app.services.fetch_router import FetchRouter
+    from app.tasks.interception import InterceptionRules
+
+    from app.config import Config
+
+    rules = InterceptionRules.for_link(link)
+    fetch_result = FetchRouter.fetch(
+        link["url"],
+        render=lambda url: fetch_url_sync(
+            url, link.get("wait_for_selector"), rules, Config.CHECK_SCREENSHOTS
+        ),
+        plain=CheckService._fetch_url_plain,
+        http_content=conditional.get("content"),
+        force_render=Config.CHECK_SCREENSHOTS,
+        http_hash=conditional.get("content_hash"),
+    )
+    logger.debug(f"[check_link] Fetch result success={fetch_result.get('success')}")
+    if fetch_result.get("rate_limited"):
+        _defer(self, link_id, fetch_result)
+    CircuitBreaker.record(link["url"], fetch_result)
+
+    return CheckServiceCelery._process_fetch_result(
+        link_id,
+        fetch_result,
+        conditional,
+        link.get("diff_algorithm"),
+        link.get("content_strategy"),
+    )
@@ -0,0 +1,228 @@
+import codecs
+import asyncio
+import logging
+from typing import Optional, Dict, Any, List
+
+import aiohttp
+
+from app.services.circuit_breaker import failure_result
+from app.services.rate_limiter import RateLimited, deferred_result, get_rate_limiter
+from app.utils.diff_utils import NormalizedHash
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+CHUNK_SIZE = 64 * 1024
+
+TEXT_CONTENT_TYPES = (
+    "text/",
+    "application/xhtml",
+    "application/xml",
+    "application/json",
+    "application/javascript",
+    "application/rss",
+    "application/atom",
+)
+
+_sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        from app.config import Config
+
+        connector = aiohttp.TCPConnector(
+            limit=Config.HTTP_POOL_LIMIT,
+            limit_per_host=Config.HTTP_POOL_LIMIT_PER_HOST,
+            ttl_dns_cache=300,
+        )
+        session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=30),
+            headers={"User-Agent": USER_AGENT},
+        )
+        _sessions[loop] = session
+    return session
+
+
+async def close_http_session() -> None:
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+
+
+def _parse_content_type(content_type: Optional[str]) -> Dict[str, Optional[str]]:
+    mime, charset = None, None
+    if content_type:
+        parts = [part.strip() for part in content_type.split(";")]
+        mime = parts[0].lower() or None
+        for param in parts[1:]:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "charset" and value:
+                charset = value.strip().strip("\"'")
+    return {"mime": mime, "charset": charset}
+
+
+def _is_text_type(mime: Optional[str]) -> bool:
+    if not mime:
+        return True
+    return mime.startswith(TEXT_CONTENT_TYPES) or mime.endswith(("+xml", "+json"))
+
+
+class StreamingBody:
+    def __init__(self, content_type: Optional[str], max_bytes: Optional[int] = None):
+        from app.config import Config
+
+        parsed = _parse_content_type(content_type)
+        self.mime = parsed["mime"]
+        self.max_bytes = max_bytes or Config.FETCH_MAX_BYTES
+        self.size = 0
+        self.truncated = False
+        self.binary = not _is_text_type(self.mime)
+        self._hash = NormalizedHash()
+        self._parts: List[str] = []
+        try:
+            decoder_cls = codecs.getincrementaldecoder(parsed["charset"] or "utf-8")
+        except LookupError:
+            decoder_cls = codecs.getincrementaldecoder("utf-8")
+        self._decoder = decoder_cls(errors="replace")
+
+    def feed(self, chunk: bytes) -> bool:
+        if self.size == 0 and b"\x00" in chunk[:1024]:
+            self.binary = True
+        if self.binary:
+            return False
+
+        remaining = self.max_bytes - self.size
+        if len(chunk) > remaining:
+            chunk = chunk[:remaining]
+            self.truncated = True
+
+        text = self._decoder.decode(chunk)
+        self._hash.update(text)
+        self._parts.append(text)
+        self.size += len(chunk)
+        return not self.truncated
+
+    def finish(self) -> Dict[str, Any]:
+        if self.binary:
+            return {
+                "success": False,
+                "error": f"Binary content ({self.mime or 'unknown type'})",
+            }
+
+        text = self._decoder.decode(b"", final=True)
+        self._hash.update(text)
+        self._parts.append(text)
+        return {
+            "success": True,
+            "content": "".join(self._parts),
+            "content_hash": self._hash.hexdigest(),
+            "bytes": self.size,
+            "truncated": self.truncated,
+        }
+
+
+async def read_body_async(response, max_bytes: Optional[int] = None) -> Dict[str, Any]:
+    body = StreamingBody(response.headers.get("Content-Type"), max_bytes)
+    if not body.binary:
+        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+            if not body.feed(chunk):
+                break
+    return body.finish()
+
+
+def read_body(response, max_bytes: Optional[int] = None) -> Dict[str, Any]:
+    body = StreamingBody(response.headers.get("Content-Type"), max_bytes)
+    if not body.binary:
+        for chunk in response.iter_content(CHUNK_SIZE):
+            if chunk and not body.feed(chunk):
+                break
+    return body.finish()
+
+
+def fetch_sync(url: str, timeout: int = 30) -> Dict[str, Any]:
+    import requests
+
+    try:
+        get_rate_limiter().acquire(url)
+        with requests.get(
+            url, headers={"User-Agent": USER_AGENT}, timeout=timeout, stream=True
+        ) as response:
+            response.raise_for_status()
+            return read_body(response)
+    except RateLimited as e:
+        return deferred_result(e)
+    except Exception as e:
+        return failure_result(e)
+
+
+async def fetch_async(url: str) -> Dict[str, Any]:
+    try:
+        await get_rate_limiter().acquire_async(url)
+        session = await get_http_session()
+        async with session.get(url) as response:
+            response.raise_for_status()
+            return await read_body_async(response)
+    except RateLimited as e:
+        return deferred_result(e)
+    except Exception as e:
+        return failure_result(e)
+
+
+async def conditional_fetch_async(
+    url: str, etag: Optional[str] = None, last_modified: Optional[str] = None
+) -> Dict[str, Any]:
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    try:
+        await get_rate_limiter().acquire_async(url)
+        session = await get_http_session()
+        async with session.get(url, headers=headers) as response:
+            result: Dict[str, Any] = {
+                "success": True,
+                "status": response.status,
+                "not_modified": response.status == 304,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }
+            if response.status == 304:
+                result["etag"] = result["etag"] or etag
+                result["last_modified"] = result["last_modified"] or last_modified
+                return result
+
+            response.raise_for_status()
+            body = await read_body_async(response)
+            if not body["success"]:
+                return {**body, "not_modified": False}
+            result["content"] = body["content"]
+            result["content_hash"] = body["content_hash"]
+            result["truncated"] = body["truncated"]
+            return result
+    except RateLimited as e:
+        logger.info(f"[http_fetch] {e}")
+        return {**deferred_result(e), "not_modified": False}
+    except Exception as e:
+        logger.warning(f"[http_fetch] Conditional GET failed for {url}: {e}")
+        return {**failure_result(e), "not_modified": False}
+
+
+def conditional_fetch_sync(
+    url: str, etag: Optional[str] = None, last_modified: Optional[str] = None
+) -> Dict[str, Any]:
+    from app.tasks import worker_loop
+
+    try:
+        return worker_loop.run(
+            conditional_fetch_async(url, etag, last_modified), timeout=35
+        )
+    except Exception as e:
+        logger.warning(f"[http_fetch] Conditional GET failed for {url}: {e}")
+        return {**failure_result(e), "not_modified": False}
@@ -0,0 +1,200 @@
+import asyncio
+import logging
+from typing import Optional, Dict, Any, Iterable
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_BLOCKED_TYPES = ("image", "media", "font")
+
+TRACKER_DOMAINS = (
+    "adnxs.com",
+    "adservice.google.com",
+    "amazon-adsystem.com",
+    "analytics.tiktok.com",
+    "api-iam.intercom.io",
+    "api-js.mixpanel.com",
+    "api.amplitude.com",
+    "api.segment.io",
+    "api2.amplitude.com",
+    "bat.bing.com",
+    "bidder.criteo.com",
+    "browser.sentry-cdn.com",
+    "cdn.amplitude.com",
+    "cdn.mouseflow.com",
+    "cdn.mxpnl.com",
+    "cdn.optimizely.com",
+    "cdn.segment.com",
+    "cdn.taboola.com",
+    "clarity.ms",
+    "connect.facebook.net",
+    "criteo.net",
+    "doubleclick.net",
+    "edge.fullstory.com",
+    "google-analytics.com",
+    "googleadservices.com",
+    "googlesyndication.com",
+    "googletagmanager.com",
+    "googletagservices.com",
+    "hs-analytics.net",
+    "ingest.sentry.io",
+    "logx.optimizely.com",
+    "mc.yandex.ru",
+    "nr-data.net",
+    "ping.chartbeat.net",
+    "quantserve.com",
+    "rs.fullstory.com",
+    "scorecardresearch.com",
+    "script.hotjar.com",
+    "snap.licdn.com",
+    "static.chartbeat.com",
+    "static.hotjar.com",
+    "trc.taboola.com",
+    "widget.intercom.io",
+    "widgets.outbrain.com",
+)
+
+ESTIMATED_BYTES = {
+    "image": 60_000,
+    "media": 500_000,
+    "font": 40_000,
+    "script": 30_000,
+    "stylesheet": 15_000,
+    "xhr": 5_000,
+    "fetch": 5_000,
+}
+DEFAULT_ESTIMATED_BYTES = 10_000
+
+
+def _split(value: Optional[str]) -> list:
+    if not value:
+        return []
+    return [item.strip().lower() for item in value.split(",") if item.strip()]
+
+
+class InterceptionRules:
+    def __init__(
+        self,
+        blocked_types: Iterable[str] = DEFAULT_BLOCKED_TYPES,
+        blocked_domains: Iterable[str] = (),
+        block_trackers: bool = True,
+    ):
+        self.blocked_types = frozenset(t.lower() for t in blocked_types)
+        domains = set(d.lower().lstrip(".") for d in blocked_domains)
+        if block_trackers:
+            domains.update(TRACKER_DOMAINS)
+        self.blocked_domains = frozenset(domains)
+
+    @classmethod
+    def from_project(
+        cls, project: Optional[Dict[str, Any]], for_screenshot: bool = False
+    ) -> "InterceptionRules":
+        from app.config import Config
+
+        project = project or {}
+        if for_screenshot:
+            blocked_types = []
+        elif project.get("blocked_resource_types") is not None:
+            blocked_types = _split(project["blocked_resource_types"])
+        else:
+            blocked_types = _split(Config.BLOCK_RESOURCE_TYPES)
+
+        return cls(
+            blocked_types=blocked_types,
+            blocked_domains=_split(project.get("blocked_domains")),
+            block_trackers=Config.BLOCK_TRACKERS,
+        )
+
+    @classmethod
+    def for_link(
+        cls, link: Dict[str, Any], for_screenshot: bool = False
+    ) -> "InterceptionRules":
+        from app.repositories import ProjectRepository
+
+        project = None
+        if link.get("project_id"):
+            try:
+                project = ProjectRepository.get_by_id(link["project_id"])
+            except Exception as e:
+                logger.warning(f"[interception] Could not load project rules: {e}")
+        return cls.from_project(project, for_screenshot)
+
+    def for_screenshot(self) -> "InterceptionRules":
+        rules = InterceptionRules(blocked_types=(), block_trackers=False)
+        rules.blocked_domains = self.blocked_domains
+        return rules
+
+    def _domain_blocked(self, host: str) -> bool:
+        parts = host.split(".")
+        return any(
+            ".".join(parts[i:]) in self.blocked_domains for i in range(len(parts) - 1)
+        )
+
+    def block_reason(self, url: str, resource_type: str) -> Optional[str]:
+        if resource_type == "document":
+            return None
+        if resource_type in self.blocked_types:
+            return resource_type
+        host = (urlparse(url).hostname or "").lower()
+        if host and self.blocked_domains and self._domain_blocked(host):
+            return "domain"
+        return None
+
+
+class InterceptionStats:
+    def __init__(self):
+        self.blocked = 0
+        self.allowed = 0
+        self.estimated_bytes_saved = 0
+        self.by_reason: Dict[str, int] = {}
+
+    def record(self, reason: Optional[str], resource_type: str) -> None:
+        if reason is None:
+            self.allowed += 1
+            return
+        self.blocked += 1
+        self.estimated_bytes_saved += ESTIMATED_BYTES.get(
+            resource_type, DEFAULT_ESTIMATED_BYTES
+        )
+        self.by_reason[reason] = self.by_reason.get(reason, 0) + 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "blocked": self.blocked,
+            "allowed": self.allowed,
+            "estimated_bytes_saved": self.estimated_bytes_saved,
+            "by_reason": dict(self.by_reason),
+        }
+
+
+async def install_pyppeteer(page, rules: InterceptionRules) -> InterceptionStats:
+    stats = InterceptionStats()
+    await page.setRequestInterception(True)
+
+    def _on_request(request):
+        reason = rules.block_reason(request.url, request.resourceType)
+        stats.record(reason, request.resourceType)
+        if reason:
+            asyncio.ensure_future(request.abort())
+        else:
+            asyncio.ensure_future(request.continue_())
+
+    page.on("request", _on_request)
+    return stats
+
+
+async def install_playwright(page, rules: InterceptionRules) -> InterceptionStats:
+    stats = InterceptionStats()
+
+    async def _on_route(route):
+        request = route.request
+        reason = rules.block_reason(request.url, request.resource_type)
+        stats.record(reason, request.resource_type)
+        if reason:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await page.route("**/*", _on_route)
+    return stats
@@ -0,0 +1,17 @@
+import logging
+from typing import Dict, Any
+
+from app.celery_config import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(bind=True, name="app.tasks.gc_screenshots")
+def gc_screenshots_task(self) -> Dict[str, Any]:
+    from app.services.screenshot_store import ScreenshotStore
+
+    try:
+        return {"success": True, **ScreenshotStore.collect_garbage()}
+    except Exception as e:
+        logger.error(f"[screenshot_gc] Garbage collection failed: {e}")
+        return {"success": False, "error": str(e)}
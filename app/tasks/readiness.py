@@ -0,0 +1,130 @@
+import time
+import asyncio
+import logging
+from typing import Optional, Dict, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+QUIESCENCE = "quiescence"
+NETWORKIDLE = "networkidle"
+
+NAVIGATION_EVENTS = {
+    QUIESCENCE: {"pyppeteer": "domcontentloaded", "playwright": "domcontentloaded"},
+    NETWORKIDLE: {"pyppeteer": "networkidle2", "playwright": "networkidle"},
+}
+
+QUIESCENCE_JS = """
+(opts) => new Promise((resolve) => {
+    const start = performance.now();
+    let lastMutation = start;
+    let timer = null;
+    const observer = new MutationObserver(() => { lastMutation = performance.now(); });
+    const finish = (reason) => {
+        observer.disconnect();
+        clearInterval(timer);
+        resolve({reason: reason, waited_ms: Math.round(performance.now() - start)});
+    };
+    const selectorPresent = () => {
+        if (!opts.selector) return true;
+        try { return document.querySelector(opts.selector) !== null; }
+        catch (e) { return false; }
+    };
+    observer.observe(document, {
+        childList: true, subtree: true, attributes: true, characterData: true
+    });
+    timer = setInterval(() => {
+        const now = performance.now();
+        if (now - start >= opts.budget_ms) return finish("budget");
+        if (document.readyState !== "complete" || !selectorPresent()) return;
+        if (now - lastMutation >= opts.quiet_ms) {
+            finish(opts.selector ? "selector" : "quiet");
+        }
+    }, 50);
+})
+"""
+
+
+def _elapsed_ms(started: float) -> int:
+    return int((time.monotonic() - started) * 1000)
+
+
+async def _wait_quiet(
+    page, quiet_ms: int, budget_ms: int, wait_for_selector: Optional[str]
+) -> str:
+    try:
+        outcome = await asyncio.wait_for(
+            page.evaluate(
+                QUIESCENCE_JS,
+                {
+                    "quiet_ms": quiet_ms,
+                    "budget_ms": budget_ms,
+                    "selector": wait_for_selector,
+                },
+            ),
+            timeout=budget_ms / 1000 + 1,
+        )
+        return outcome.get("reason", "quiet")
+    except asyncio.TimeoutError:
+        return "budget"
+    except Exception as e:
+        logger.debug(f"[readiness] Quiescence wait interrupted: {e}")
+        return "navigated"
+
+
+async def wait_until_ready(
+    page,
+    wait_for_selector: Optional[str] = None,
+    strategy: Optional[str] = None,
+) -> str:
+    from app.config import Config
+
+    strategy = strategy or Config.READINESS_STRATEGY
+    budget_ms = Config.READINESS_BUDGET_MS
+
+    if strategy == NETWORKIDLE:
+        await asyncio.sleep(2)
+        if not wait_for_selector:
+            return "fixed"
+        return await _wait_quiet(page, 0, budget_ms, wait_for_selector)
+
+    return await _wait_quiet(
+        page, Config.READINESS_QUIET_MS, budget_ms, wait_for_selector
+    )
+
+
+async def goto_and_wait(
+    page,
+    url: str,
+    wait_for_selector: Optional[str] = None,
+    playwright: bool = False,
+) -> Tuple[Any, Dict[str, Any]]:
+    from app.config import Config
+
+    strategy = Config.READINESS_STRATEGY
+    if strategy not in NAVIGATION_EVENTS:
+        strategy = QUIESCENCE
+    event = NAVIGATION_EVENTS[strategy]["playwright" if playwright else "pyppeteer"]
+    timeout = Config.NAVIGATION_TIMEOUT_MS
+
+    started = time.monotonic()
+    if playwright:
+        response = await page.goto(url, wait_until=event, timeout=timeout)
+    else:
+        response = await page.goto(url, waitUntil=event, timeout=timeout)
+    navigate_ms = _elapsed_ms(started)
+
+    started = time.monotonic()
+    reason = await wait_until_ready(page, wait_for_selector, strategy)
+
+    timings = {
+        "strategy": strategy,
+        "navigate_ms": navigate_ms,
+        "ready_ms": _elapsed_ms(started),
+        "ready_reason": reason,
+        "status": response.status if response else None,
+    }
+    logger.info(
+        f"[readiness] {url}: navigate={navigate_ms}ms, ready={timings['ready_ms']}ms ({reason})"
+    )
+    return response, timings
@@ -1,6 +1,23 @@
 import os
+import asyncio
 import logging
-import tempfile
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from celery.signals import worker_process_init, worker_process_shutdown
+
+from app.services.circuit_breaker import failure_result
+from app.services.rate_limiter import RateLimited, deferred_result, get_rate_limiter
+from app.tasks.browser_pool import (
+    BROWSER_ARGS,
+    get_pool,
+    pool_started,
+    start_pool,
+    stop_pool,
+)
+from app.tasks.interception import InterceptionRules, install_pyppeteer
+from app.tasks.readiness import goto_and_wait
+from app.utils.screenshot_utils import MAX_HEIGHT_JS, max_capture_height
 
 logger = logging.getLogger(__name__)
 
@@ -9,140 +26,182 @@ for key in ["http_proxy", "https_proxy", "HTTP_PROXY", "HTTPS_PROXY"]:
     os.environ.pop(key.lower(), None)
 
 
-async def take_screenshot_async(url: str, output_path: str) -> str:
+@worker_process_init.connect
+def _start_browser_pool(**kwargs):
+    start_pool()
+
+
+@worker_process_shutdown.connect
+def _stop_browser_pool(**kwargs):
+    stop_pool()
+
+
+@asynccontextmanager
+async def _open_page(extra_args=None):
+    pool = get_pool()
+    if pool is not None:
+        async with pool.page() as page:
+            yield page
+        return
+
     from pyppeteer import launch
-    import os
 
+    browser = await launch(
+        headless=True,
+        executablePath=os.environ.get("PYPPETEER_EXECUTABLE_PATH"),
+        args=BROWSER_ARGS + (extra_args or []),
+    )
     try:
-        logger.info(f"[screenshot] Starting screenshot for {url}")
-        logger.info(f"[screenshot] Output path: {output_path}")
+        yield await browser.newPage()
+    finally:
+        await browser.close()
 
-        executable = os.environ.get("PYPPETEER_EXECUTABLE_PATH")
-
-        browser = await launch(
-            headless=True,
-            executablePath=executable,
-            args=[
-                "--no-sandbox",
-                "--disable-setuid-sandbox",
-                "--disable-dev-shm-usage",
-                "--disable-gpu",
-                "--disable-cache",
-                "--disk-cache-size=0",
-                "--disable-web-security",
-                "--disable-features=IsolateOrigins,site-per-process",
-                "--allow-running-insecure-content",
-                "--ignore-certificate-errors",
-                "--proxy-server=direct://",
-                "--proxy-bypass-list=*",
-            ],
-        )
 
-        page = await browser.newPage()
-        await page.setViewport({"width": 1920, "height": 1080})
+async def _capture(page, width: int) -> bytes:
+    max_height = max_capture_height()
+    height = await page.evaluate(MAX_HEIGHT_JS)
+    if height > max_height:
+        logger.info(f"[screenshot] Page is {height}px tall, capping at {max_height}px")
+        await page.setViewport({"width": width, "height": max_height})
+        return await page.screenshot()
+    return await page.screenshot(fullPage=True)
 
-        logger.info(f"[screenshot] Navigating to {url}")
-        response = await page.goto(url, waitUntil="networkidle2", timeout=30000)
-        logger.info(
-            f"[screenshot] Response status: {response.status if response else 'None'}"
-        )
 
-        await asyncio.sleep(2)
+def _write_bytes(path: str, data: bytes) -> None:
+    with open(path, "wb") as f:
+        f.write(data)
 
-        logger.info(f"[screenshot] Taking screenshot to {output_path}")
-        await page.screenshot(path=output_path, fullPage=True)
 
-        await browser.close()
+async def take_screenshot_async(
+    url: str,
+    output_path: str,
+    wait_for_selector: Optional[str] = None,
+    rules: Optional[InterceptionRules] = None,
+) -> str:
+    try:
+        logger.info(f"[screenshot] Starting screenshot for {url}")
+        logger.info(f"[screenshot] Output path: {output_path}")
 
-        if os.path.exists(output_path):
-            file_size = os.path.getsize(output_path)
-            logger.info(
-                f"[screenshot] Screenshot saved to {output_path} ({file_size} bytes)"
+        await get_rate_limiter().acquire_async(url)
+        async with _open_page() as page:
+            await install_pyppeteer(
+                page, rules or InterceptionRules.from_project(None, for_screenshot=True)
             )
-            return output_path
+            await page.setViewport({"width": 1920, "height": 1080})
 
-        logger.warning(f"[screenshot] Screenshot file not found at {output_path}")
-        raise Exception("Screenshot file not created")
+            logger.info(f"[screenshot] Navigating to {url}")
+            _, timings = await goto_and_wait(page, url, wait_for_selector)
+            logger.info(f"[screenshot] Response status: {timings['status']}")
+
+            logger.info(f"[screenshot] Taking screenshot to {output_path}")
+            data = await _capture(page, 1920)
+
+        await asyncio.to_thread(_write_bytes, output_path, data)
+        logger.info(
+            f"[screenshot] Screenshot saved to {output_path} ({len(data)} bytes)"
+        )
+        return output_path
 
     except Exception as e:
         logger.error(f"[screenshot] Error: {type(e).__name__}: {e}")
         raise
 
 
-def take_screenshot_sync(url: str, output_path: str) -> str:
-    import asyncio
+def take_screenshot_sync(
+    url: str,
+    output_path: str,
+    wait_for_selector: Optional[str] = None,
+    rules: Optional[InterceptionRules] = None,
+) -> str:
+    from app.tasks import worker_loop
 
+    coro = take_screenshot_async(url, output_path, wait_for_selector, rules)
     try:
-        return asyncio.run(take_screenshot_async(url, output_path))
+        if pool_started():
+            return worker_loop.run(coro, timeout=90)
+        return asyncio.run(coro)
     except Exception as e:
         logger.error(f"[screenshot] Error: {type(e).__name__}: {e}")
         raise
 
 
-async def fetch_url_async(url: str) -> dict:
-    import asyncio
-    import os
-    from pyppeteer import launch
-
+async def fetch_url_async(
+    url: str,
+    wait_for_selector: Optional[str] = None,
+    rules: Optional[InterceptionRules] = None,
+    screenshot: bool = False,
+) -> dict:
     try:
         logger.info(f"[pyppeteer] Fetching URL: {url}")
 
-        executable = os.environ.get("PYPPETEER_EXECUTABLE_PATH")
-
-        browser = await launch(
-            headless=True,
-            executablePath=executable,
-            args=[
-                "--allow-running-insecure-content",
-                "--blink-settings=imagesEnabled=false",
-                "--disable-cache",
-                "--disable-dev-shm-usage",
-                "--disable-features=IsolateOrigins,site-per-process",
-                "--disable-gpu",
-                "--disable-setuid-sandbox",
-                "--disable-web-security",
-                "--disk-cache-size=0",
-                "--ignore-certificate-errors",
-                "--no-sandbox",
-                "--no-zygote",
-                "--proxy-bypass-list=*",
-                "--proxy-server=direct://",
-                "--renderer-process-limit=1",
-                "--single-process",
-            ],
-        )
-
-        page = await browser.newPage()
-        await page.setExtraHTTPHeaders(
-            {"Cache-Control": "no-cache", "Pragma": "no-cache"}
-        )
-        await page.setCacheEnabled(False)
-        await page.setViewport({"width": 800, "height": 600})
+        rules = rules or InterceptionRules.from_project(None)
+        if screenshot:
+            rules = rules.for_screenshot()
+            viewport = {"width": 1920, "height": 1080}
+        else:
+            viewport = {"width": 800, "height": 600}
+
+        await get_rate_limiter().acquire_async(url)
+        async with _open_page(["--renderer-process-limit=1"]) as page:
+            stats = await install_pyppeteer(page, rules)
+            await page.setExtraHTTPHeaders(
+                {"Cache-Control": "no-cache", "Pragma": "no-cache"}
+            )
+            await page.setCacheEnabled(False)
+            await page.setViewport(viewport)
 
-        logger.info(f"[pyppeteer] Navigating to {url}")
-        response = await page.goto(url, waitUntil="networkidle2", timeout=30000)
-        status = response.status if response else "None"
-        logger.info(f"[pyppeteer] Response status: {status}")
+            logger.info(f"[pyppeteer] Navigating to {url}")
+            response, timings = await goto_and_wait(page, url, wait_for_selector)
+            logger.info(f"[pyppeteer] Response status: {timings['status']}")
 
-        await asyncio.sleep(2)
+            html = await page.evaluate("document.documentElement.outerHTML")
+            logger.info(f"[pyppeteer] HTML length: {len(html)}")
 
-        html = await page.evaluate("document.documentElement.outerHTML")
-        logger.info(f"[pyppeteer] HTML length: {len(html)}")
+            capture = None
+            if screenshot:
+                try:
+                    capture = await _capture(page, viewport["width"])
+                except Exception as e:
+                    logger.error(f"[pyppeteer] Screenshot failed for {url}: {e}")
 
-        await browser.close()
-
-        return {"success": True, "content": html}
+            final_url = page.url
 
+        interception = stats.to_dict()
+        logger.info(
+            f"[pyppeteer] Blocked {interception['blocked']} request(s), ~{interception['estimated_bytes_saved']} bytes saved (estimated)"
+        )
+        return {
+            "success": True,
+            "content": html,
+            "final_url": final_url,
+            "status": timings["status"],
+            "headers": dict(response.headers) if response else {},
+            "screenshot": capture,
+            "timings": timings,
+            "interception": interception,
+        }
+
+    except RateLimited as e:
+        logger.info(f"[pyppeteer] {e}")
+        return deferred_result(e)
     except Exception as e:
         logger.error(f"[pyppeteer] Error: {type(e).__name__}: {e}")
-        return {"success": False, "error": str(e)}
+        return failure_result(e)
 
 
-def fetch_url_sync(url: str) -> dict:
-    import asyncio
+def fetch_url_sync(
+    url: str,
+    wait_for_selector: Optional[str] = None,
+    rules: Optional[InterceptionRules] = None,
+    screenshot: bool = False,
+) -> dict:
+    from app.tasks import worker_loop
 
+    coro = fetch_url_async(url, wait_for_selector, rules, screenshot)
     try:
-        return asyncio.run(fetch_url_async(url))
+        if pool_started():
+            return worker_loop.run(coro, timeout=90)
+        return asyncio.run(coro)
     except Exception as e:
         logger.error(f"[pyppeteer] Error fetching {url}: {type(e).__name__}: {e}")
-        return {"success": False, "error": str(e)}
+        return failure_result(e)
@@ -0,0 +1,69 @@
+import os
+import asyncio
+import logging
+import threading
+from typing import Optional, Any, Coroutine
+
+logger = logging.getLogger(__name__)
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_thread: Optional[threading.Thread] = None
+_pid: Optional[int] = None
+_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    global _loop, _thread, _pid
+
+    with _lock:
+        if _loop is not None and _pid == os.getpid() and _loop.is_running():
+            return _loop
+
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def _run():
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            loop.run_forever()
+
+        thread = threading.Thread(target=_run, name="worker-loop", daemon=True)
+        thread.start()
+        ready.wait()
+
+        _loop, _thread, _pid = loop, thread, os.getpid()
+        logger.info(f"[worker_loop] Started event loop in pid={_pid}")
+        return _loop
+
+
+def is_current() -> bool:
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return running is _loop and _pid == os.getpid()
+
+
+def run(coro: Coroutine, timeout: Optional[float] = None) -> Any:
+    loop = get_loop()
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return future.result(timeout)
+    except Exception:
+        future.cancel()
+        raise
+
+
+def stop() -> None:
+    global _loop, _thread, _pid
+
+    with _lock:
+        if _loop is None or _pid != os.getpid():
+            _loop, _thread, _pid = None, None, None
+            return
+        _loop.call_soon_threadsafe(_loop.stop)
+        if _thread:
+            _thread.join(timeout=5)
+        _loop.close()
+        logger.info(f"[worker_loop] Stopped event loop in pid={_pid}")
+        _loop, _thread, _pid = None, None, None
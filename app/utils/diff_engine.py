@@ -0,0 +1,409 @@
+import difflib
+import math
+from array import array
+from bisect import bisect_left
+from typing import Optional, Dict, List, Tuple, Iterator, Sequence, Hashable
+
+DIFFLIB = "difflib"
+MYERS = "myers"
+PATIENCE = "patience"
+HISTOGRAM = "histogram"
+ALGORITHMS = (DIFFLIB, MYERS, PATIENCE, HISTOGRAM)
+
+HISTOGRAM_MAX_CHAIN = 64
+MYERS_MAX_COST = 128
+GALLOP_START = 8
+
+Opcode = Tuple[str, int, int, int, int]
+Block = Tuple[int, int, int]
+Region = Tuple[int, int, int, int]
+Ids = Sequence[int]
+
+
+def resolve_algorithm(algorithm: Optional[str] = None) -> str:
+    from app.config import Config
+
+    for name in (algorithm, Config.DIFF_ALGORITHM):
+        if name and name.lower() in ALGORITHMS:
+            return name.lower()
+    return HISTOGRAM
+
+
+class LineTable:
+    def __init__(self):
+        self.ids: Dict[Hashable, int] = {}
+
+    def intern(self, lines: Sequence[Hashable]) -> array:
+        ids = self.ids
+        return array("I", [ids.setdefault(line, len(ids)) for line in lines])
+
+
+def _run_after(a: Ids, i: int, b: Ids, j: int, limit: int) -> int:
+    if limit <= 0 or a[i] != b[j]:
+        return 0
+    size, step = 1, GALLOP_START
+    while size < limit:
+        step = min(step, limit - size)
+        if a[i + size : i + size + step] != b[j + size : j + size + step]:
+            break
+        size += step
+        step *= 2
+    else:
+        return size
+
+    low, high = size, size + step
+    while low < high:
+        middle = (low + high) // 2
+        if a[i + low : i + middle + 1] == b[j + low : j + middle + 1]:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def _run_before(a: Ids, i: int, b: Ids, j: int, limit: int) -> int:
+    if limit <= 0 or a[i - 1] != b[j - 1]:
+        return 0
+    size, step = 1, GALLOP_START
+    while size < limit:
+        step = min(step, limit - size)
+        if a[i - size - step : i - size] != b[j - size - step : j - size]:
+            break
+        size += step
+        step *= 2
+    else:
+        return size
+
+    low, high = size, size + step
+    while low < high:
+        middle = (low + high) // 2
+        if a[i - middle - 1 : i - low] == b[j - middle - 1 : j - low]:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def _trim(a: Ids, b: Ids, region: Region, blocks: List[Block]) -> Region:
+    alo, ahi, blo, bhi = region
+    size = _run_after(a, alo, b, blo, min(ahi - alo, bhi - blo))
+    if size:
+        blocks.append((alo, blo, size))
+        alo, blo = alo + size, blo + size
+
+    size = _run_before(a, ahi, b, bhi, min(ahi - alo, bhi - blo))
+    if size:
+        ahi, bhi = ahi - size, bhi - size
+        blocks.append((ahi, bhi, size))
+    return alo, ahi, blo, bhi
+
+
+def _furthest(diagonals: List[int], offset: int, n: int, m: int) -> Tuple[int, int]:
+    best_x = best_y = 0
+    for index, x in enumerate(diagonals):
+        y = x - (index - offset)
+        if 0 <= x <= n and 0 <= y <= m and x + y > best_x + best_y:
+            best_x, best_y = x, y
+    return best_x, best_y
+
+
+def _middle_snake(a: Ids, b: Ids, region: Region) -> Optional[Tuple[int, int]]:
+    alo, ahi, blo, bhi = region
+    n, m = ahi - alo, bhi - blo
+    max_d = min((n + m + 1) // 2, max(MYERS_MAX_COST, math.isqrt(n + m)))
+    offset = max_d
+    forward = [-1] * (2 * max_d + 2)
+    forward[offset + 1] = 0
+    backward = forward[:]
+    delta = n - m
+    odd = delta % 2 != 0
+    k1start = k1end = k2start = k2end = 0
+
+    for d in range(max_d):
+        for k1 in range(-d + k1start, d + 1 - k1end, 2):
+            k1_offset = offset + k1
+            if k1 == -d or (
+                k1 != d and forward[k1_offset - 1] < forward[k1_offset + 1]
+            ):
+                x1 = forward[k1_offset + 1]
+            else:
+                x1 = forward[k1_offset - 1] + 1
+            y1 = x1 - k1
+            if x1 < n and y1 < m and a[alo + x1] == b[blo + y1]:
+                size = _run_after(a, alo + x1, b, blo + y1, min(n - x1, m - y1))
+                x1, y1 = x1 + size, y1 + size
+            forward[k1_offset] = x1
+            if x1 > n:
+                k1end += 2
+            elif y1 > m:
+                k1start += 2
+            elif odd:
+                k2_offset = offset + delta - k1
+                if 0 <= k2_offset < len(backward) and backward[k2_offset] != -1:
+                    if x1 >= n - backward[k2_offset]:
+                        return alo + x1, blo + y1
+
+        for k2 in range(-d + k2start, d + 1 - k2end, 2):
+            k2_offset = offset + k2
+            if k2 == -d or (
+                k2 != d and backward[k2_offset - 1] < backward[k2_offset + 1]
+            ):
+                x2 = backward[k2_offset + 1]
+            else:
+                x2 = backward[k2_offset - 1] + 1
+            y2 = x2 - k2
+            if x2 < n and y2 < m and a[ahi - x2 - 1] == b[bhi - y2 - 1]:
+                size = _run_before(a, ahi - x2, b, bhi - y2, min(n - x2, m - y2))
+                x2, y2 = x2 + size, y2 + size
+            backward[k2_offset] = x2
+            if x2 > n:
+                k2end += 2
+            elif y2 > m:
+                k2start += 2
+            elif not odd:
+                k1_offset = offset + delta - k2
+                if 0 <= k1_offset < len(forward) and forward[k1_offset] != -1:
+                    x1 = forward[k1_offset]
+                    if x1 >= n - x2:
+                        return alo + x1, blo + x1 - (k1_offset - offset)
+
+    # Over the cost cap: split at whichever search got furthest, so the
+    # region still shrinks instead of being left unmatched.
+    x1, y1 = _furthest(forward, offset, n, m)
+    x2, y2 = _furthest(backward, offset, n, m)
+    if x2 + y2 > x1 + y1:
+        x1, y1 = n - x2, m - y2
+    if (x1, y1) in ((0, 0), (n, m)):
+        return None
+    return alo + x1, blo + y1
+
+
+def _myers(a: Ids, b: Ids, region: Region, blocks: List[Block]) -> None:
+    pending = [region]
+    while pending:
+        alo, ahi, blo, bhi = _trim(a, b, pending.pop(), blocks)
+        if alo == ahi or blo == bhi:
+            continue
+        if set(a[alo:ahi]).isdisjoint(b[blo:bhi]):
+            continue
+        split = _middle_snake(a, b, (alo, ahi, blo, bhi))
+        if split:
+            x, y = split
+            pending.append((alo, x, blo, y))
+            pending.append((x, ahi, y, bhi))
+
+
+def _unique_positions(items: Ids, lo: int, hi: int) -> Dict[int, int]:
+    positions = {}
+    for index in range(lo, hi):
+        item = items[index]
+        positions[item] = -1 if item in positions else index
+    return positions
+
+
+def _anchors(a: Ids, b: Ids, region: Region) -> List[Tuple[int, int]]:
+    alo, ahi, blo, bhi = region
+    unique_a = _unique_positions(a, alo, ahi)
+    unique_b = _unique_positions(b, blo, bhi)
+    pairs = [
+        (unique_a[item], j)
+        for item, j in unique_b.items()
+        if j != -1 and unique_a.get(item, -1) != -1
+    ]
+    pairs.sort(key=lambda pair: pair[1])
+
+    tails: List[int] = []
+    tail_index: List[int] = []
+    previous = [-1] * len(pairs)
+    for index, (i, _) in enumerate(pairs):
+        position = bisect_left(tails, i)
+        if position:
+            previous[index] = tail_index[position - 1]
+        if position == len(tails):
+            tails.append(i)
+            tail_index.append(index)
+        else:
+            tails[position] = i
+            tail_index[position] = index
+
+    anchors = []
+    index = tail_index[-1] if tail_index else -1
+    while index != -1:
+        anchors.append(pairs[index])
+        index = previous[index]
+    anchors.reverse()
+    return anchors
+
+
+def _patience(a: Ids, b: Ids, region: Region, blocks: List[Block]) -> None:
+    pending = [region]
+    while pending:
+        alo, ahi, blo, bhi = _trim(a, b, pending.pop(), blocks)
+        if alo == ahi or blo == bhi:
+            continue
+        anchors = _anchors(a, b, (alo, ahi, blo, bhi))
+        if not anchors:
+            _myers(a, b, (alo, ahi, blo, bhi), blocks)
+            continue
+        for i, j in anchors:
+            blocks.append((i, j, 1))
+            pending.append((alo, i, blo, j))
+            alo, blo = i + 1, j + 1
+        pending.append((alo, ahi, blo, bhi))
+
+
+def _longest_rare_match(
+    a: Ids, b: Ids, region: Region
+) -> Optional[Tuple[int, int, int]]:
+    alo, ahi, blo, bhi = region
+    positions: Dict[int, List[int]] = {}
+    for i in range(alo, ahi):
+        positions.setdefault(a[i], []).append(i)
+
+    best = None
+    best_count = HISTOGRAM_MAX_CHAIN + 1
+    j = blo
+    while j < bhi:
+        next_j = j + 1
+        occurrences = positions.get(b[j], ())
+        count = len(occurrences)
+        if count and count <= best_count:
+            for i in occurrences:
+                before = _run_before(a, i, b, j, min(i - alo, j - blo))
+                size = before + _run_after(a, i, b, j, min(ahi - i, bhi - j))
+                if count < best_count or (
+                    best and count == best_count and size > best[2]
+                ):
+                    best = (i - before, j - before, size)
+                    best_count = count
+                next_j = max(next_j, j - before + size)
+        j = next_j
+    return best
+
+
+def _histogram(a: Ids, b: Ids, region: Region, blocks: List[Block]) -> None:
+    pending = [region]
+    while pending:
+        alo, ahi, blo, bhi = _trim(a, b, pending.pop(), blocks)
+        if alo == ahi or blo == bhi:
+            continue
+        match = _longest_rare_match(a, b, (alo, ahi, blo, bhi))
+        if not match:
+            _myers(a, b, (alo, ahi, blo, bhi), blocks)
+            continue
+        i, j, size = match
+        blocks.append(match)
+        pending.append((alo, i, blo, j))
+        pending.append((i + size, ahi, j + size, bhi))
+
+
+ENGINES = {MYERS: _myers, PATIENCE: _patience, HISTOGRAM: _histogram}
+
+
+def matching_blocks(
+    a: Sequence[Hashable], b: Sequence[Hashable], algorithm: Optional[str] = None
+) -> List[Block]:
+    algorithm = resolve_algorithm(algorithm)
+    table = LineTable()
+    ids_a, ids_b = table.intern(a), table.intern(b)
+    if algorithm == DIFFLIB:
+        matcher = difflib.SequenceMatcher(None, ids_a, ids_b)
+        return [
+            (block.a, block.b, block.size) for block in matcher.get_matching_blocks()
+        ]
+
+    found: List[Block] = []
+    ENGINES[algorithm](ids_a, ids_b, (0, len(a), 0, len(b)), found)
+
+    blocks: List[Block] = []
+    for i, j, size in sorted(found):
+        if (
+            blocks
+            and blocks[-1][0] + blocks[-1][2] == i
+            and blocks[-1][1] + blocks[-1][2] == j
+        ):
+            blocks[-1] = (blocks[-1][0], blocks[-1][1], blocks[-1][2] + size)
+        elif size:
+            blocks.append((i, j, size))
+    blocks.append((len(a), len(b), 0))
+    return blocks
+
+
+def get_opcodes(
+    a: Sequence[Hashable], b: Sequence[Hashable], algorithm: Optional[str] = None
+) -> List[Opcode]:
+    i = j = 0
+    opcodes = []
+    for ai, bj, size in matching_blocks(a, b, algorithm):
+        if i < ai and j < bj:
+            opcodes.append(("replace", i, ai, j, bj))
+        elif i < ai:
+            opcodes.append(("delete", i, ai, j, bj))
+        elif j < bj:
+            opcodes.append(("insert", i, ai, j, bj))
+        i, j = ai + size, bj + size
+        if size:
+            opcodes.append(("equal", ai, i, bj, j))
+    return opcodes
+
+
+def grouped_opcodes(opcodes: List[Opcode], n: int = 3) -> Iterator[List[Opcode]]:
+    codes = list(opcodes) or [("equal", 0, 1, 0, 1)]
+    if codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - n), i2, max(j1, j2 - n), j2
+    if codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)
+
+    group = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == "equal" and i2 - i1 > n + n:
+            group.append((tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - n), max(j1, j2 - n)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        yield group
+
+
+def _format_range(start: int, stop: int) -> str:
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return f"{beginning}"
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+def unified_diff(
+    a: Sequence[str],
+    b: Sequence[str],
+    fromfile: str = "",
+    tofile: str = "",
+    n: int = 3,
+    lineterm: str = "\n",
+    algorithm: Optional[str] = None,
+) -> Iterator[str]:
+    started = False
+    for group in grouped_opcodes(get_opcodes(a, b, algorithm), n):
+        if not started:
+            started = True
+            yield f"--- {fromfile}{lineterm}"
+            yield f"+++ {tofile}{lineterm}"
+
+        first, last = group[0], group[-1]
+        yield f"@@ -{_format_range(first[1], last[2])} +{_format_range(first[3], last[4])} @@{lineterm}"
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                for line in a[i1:i2]:
+                    yield " " + line
+                continue
+            if tag in ("replace", "delete"):
+                for line in a[i1:i2]:
+                    yield "-" + line
+            if tag in ("replace", "insert"):
+                for line in b[j1:j2]:
+                    yield "+" + line
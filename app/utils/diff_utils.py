@@ -1,6 +1,8 @@
-import difflib
+import hashlib
 from typing import Optional, Dict, List, Any
 
+from app.utils.diff_engine import unified_diff
+
 
 def escape_html(text: str) -> str:
     return (
@@ -12,7 +14,34 @@ def escape_html(text: str) -> str:
     )
 
 
-def compute_diff(old_content: Optional[str], new_content: str) -> Optional[str]:
+def normalized_hash(content: str) -> str:
+    return hashlib.sha256(" ".join(content.split()).encode()).hexdigest()
+
+
+class NormalizedHash:
+    def __init__(self):
+        self._hash = hashlib.sha256()
+        self._started = False
+        self._gap = False
+
+    def update(self, text: str) -> None:
+        words = " ".join(text.split())
+        if not words:
+            self._gap = self._gap or bool(text)
+            return
+        if self._started and (self._gap or text[0].isspace()):
+            self._hash.update(b" ")
+        self._hash.update(words.encode())
+        self._started = True
+        self._gap = text[-1].isspace()
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+def compute_diff(
+    old_content: Optional[str], new_content: str, algorithm: Optional[str] = None
+) -> Optional[str]:
     if not old_content:
         return None
 
@@ -20,13 +49,14 @@ def compute_diff(old_content: Optional[str], new_content: str) -> Optional[str]:
     new_lines = new_content.splitlines(keepends=True)
 
     diff = list(
-        difflib.unified_diff(
+        unified_diff(
             old_lines,
             new_lines,
             fromfile="previous",
             tofile="current",
             lineterm="",
             n=3,
+            algorithm=algorithm,
         )
     )
 
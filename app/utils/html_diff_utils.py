@@ -1,12 +1,15 @@
-import difflib
 from typing import Optional
 from bs4 import BeautifulSoup
 
+from app.utils.diff_engine import get_opcodes
 from app.utils.diff_utils import escape_html, extract_images
 
 
 def compute_html_diff(
-    old_content: Optional[str], new_content: str, url: Optional[str] = None
+    old_content: Optional[str],
+    new_content: str,
+    url: Optional[str] = None,
+    algorithm: Optional[str] = None,
 ) -> Optional[str]:
     if not old_content or not new_content:
         return None
@@ -25,7 +28,7 @@ def compute_html_diff(
         new_text = new_soup.get_text(separator=" ", strip=True)
         if old_text == new_text:
             return None
-        return _text_diff_to_html(old_text, new_content, url)
+        return _text_diff_to_html(old_text, new_content, url, algorithm)
 
     old_text = old_body.get_text(separator="\n", strip=True)
     new_text = new_body.get_text(separator="\n", strip=True)
@@ -37,18 +40,23 @@ def compute_html_diff(
     if url:
         css_content = _download_css(url)
 
-    diff_html = _generate_body_diff(old_body, new_body, css_content)
+    diff_html = _generate_body_diff(old_body, new_body, css_content, algorithm)
     return diff_html
 
 
 def _download_css(url: str) -> str:
     import requests
     from urllib.parse import urljoin
+    from app.services.rate_limiter import get_rate_limiter
 
     try:
         parsed_url = requests.Request("GET", url).prepare()
         base_url = parsed_url.url
+        if not base_url:
+            return ""
 
+        limiter = get_rate_limiter()
+        limiter.acquire(base_url, max_wait=0)
         response = requests.get(
             base_url,
             timeout=10,
@@ -65,9 +73,10 @@ def _download_css(url: str) -> str:
         all_css = []
         for link in css_links:
             href = link.get("href")
-            if href:
+            if isinstance(href, str) and href:
                 css_url = urljoin(base_url, href)
                 try:
+                    limiter.acquire(css_url, max_wait=0)
                     css_response = requests.get(
                         css_url, timeout=5, headers={"User-Agent": "Mozilla/5.0"}
                     )
@@ -81,14 +90,16 @@ def _download_css(url: str) -> str:
         return ""
 
 
-def _generate_body_diff(old_body, new_body, css_content: str) -> str:
+def _generate_body_diff(
+    old_body, new_body, css_content: str, algorithm: Optional[str] = None
+) -> str:
     old_text = old_body.get_text(separator="\n", strip=True)
     new_text = new_body.get_text(separator="\n", strip=True)
 
     old_lines = [l for l in old_text.splitlines() if l.strip()]
     new_lines = [l for l in new_text.splitlines() if l.strip()]
 
-    matcher = difflib.SequenceMatcher(None, old_lines, new_lines)
+    opcodes = get_opcodes(old_lines, new_lines, algorithm)
 
     custom_css = (
         """
@@ -137,7 +148,7 @@ def _generate_body_diff(old_body, new_body, css_content: str) -> str:
         "</head><body>",
     ]
 
-    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+    for tag, i1, i2, j1, j2 in opcodes:
         if tag == "equal":
             for line in old_lines[i1:i2]:
                 html_parts.append(f"<div class='diff-line'>{escape_html(line)}</div>")
@@ -162,7 +173,10 @@ def _generate_body_diff(old_body, new_body, css_content: str) -> str:
 
 
 def _text_diff_to_html(
-    old_text: str, new_content: str, url: Optional[str] = None
+    old_text: str,
+    new_content: str,
+    url: Optional[str] = None,
+    algorithm: Optional[str] = None,
 ) -> str:
     new_lines = new_content.splitlines()
 
@@ -205,7 +219,7 @@ def _text_diff_to_html(
     )
 
     old_lines = old_text.splitlines()
-    matcher = difflib.SequenceMatcher(None, old_lines, new_lines)
+    opcodes = get_opcodes(old_lines, new_lines, algorithm)
     html_parts = [
         "<!DOCTYPE html>",
         "<html><head>",
@@ -214,7 +228,7 @@ def _text_diff_to_html(
         "</head><body><div class='diff-container'>",
     ]
 
-    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+    for tag, i1, i2, j1, j2 in opcodes:
         if tag == "equal":
             for line in old_lines[i1:i2]:
                 if line.strip():
@@ -249,7 +263,9 @@ def _text_diff_to_html(
     return "".join(html_parts)
 
 
-def generate_paragraph_diff(old_body, new_body, url: Optional[str]) -> str:
+def generate_paragraph_diff(
+    old_body, new_body, url: Optional[str], algorithm: Optional[str] = None
+) -> str:
     old_paragraphs = old_body.find_all(
         ["p", "div", "h1", "h2", "h3", "h4", "h5", "h6", "li", "span"]
     )
@@ -264,7 +280,7 @@ def generate_paragraph_diff(old_body, new_body, url: Optional[str]) -> str:
         p.get_text(strip=True) for p in new_paragraphs if p.get_text(strip=True)
     ]
 
-    matcher = difflib.SequenceMatcher(None, old_texts, new_texts)
+    opcodes = get_opcodes(old_texts, new_texts, algorithm)
 
     html_parts = [
         "<!DOCTYPE html>",
@@ -313,7 +329,7 @@ def generate_paragraph_diff(old_body, new_body, url: Optional[str]) -> str:
             )
         html_parts.append("</div></div>")
 
-    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+    for tag, i1, i2, j1, j2 in opcodes:
         if tag == "equal":
             for text in old_texts[i1:i2][:3]:
                 html_parts.append(
@@ -343,7 +359,9 @@ def generate_paragraph_diff(old_body, new_body, url: Optional[str]) -> str:
     return "".join(html_parts)
 
 
-def generate_code_diff(old_content: str, new_content: str) -> str:
+def generate_code_diff(
+    old_content: str, new_content: str, algorithm: Optional[str] = None
+) -> str:
     old_soup = BeautifulSoup(old_content, "html.parser")
     new_soup = BeautifulSoup(new_content, "html.parser")
 
@@ -356,14 +374,14 @@ def generate_code_diff(old_content: str, new_content: str) -> str:
     old_lines = old_html.splitlines()
     new_lines = new_html.splitlines()
 
-    matcher = difflib.SequenceMatcher(None, old_lines, new_lines)
+    opcodes = get_opcodes(old_lines, new_lines, algorithm)
 
     html_parts = [
         "<div style='background: #1e1e1e; color: #d4d4d4; font-family: Consolas, Monaco, monospace; font-size: 14px; line-height: 1.5; padding: 16px; margin: 0;'>",
     ]
 
     line_num = 1
-    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+    for tag, i1, i2, j1, j2 in opcodes:
         if tag == "equal":
             for idx, line in enumerate(old_lines[i1:i2]):
                 html_parts.append(
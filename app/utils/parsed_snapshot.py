@@ -0,0 +1,193 @@
+import re
+import html
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from functools import cached_property
+from typing import Optional, Dict, List, Iterator
+
+logger = logging.getLogger(__name__)
+
+
+PARAGRAPH_TAGS = ("p", "div", "h1", "h2", "h3", "h4", "h5", "h6", "li", "span")
+
+RAW_TEXT_TAGS = {"script", "style"}
+
+VOID_TAGS = {
+    "area",
+    "base",
+    "br",
+    "col",
+    "embed",
+    "hr",
+    "img",
+    "input",
+    "link",
+    "meta",
+    "source",
+    "track",
+    "wbr",
+}
+
+PRICE_PATTERNS = [
+    r"\$\s?[\d,]+\.?\d*",
+    r"USD\s?[\d,]+\.?\d*",
+    r"€\s?[\d,]+\.?\d*",
+    r"£\s?[\d,]+\.?\d*",
+    r"₹\s?[\d,]+\.?\d*",
+    r"[\d,]+\.?\d*\s?(?:USD|EUR|GBP|INR|CAD|AUD)",
+    r'data-price="(\d+)"',
+]
+
+PRICE_SCAN_CHARS = 10000
+
+
+def _walk(element):
+    from lxml import etree
+
+    return etree.iterwalk(element, events=("start", "end", "comment"))
+
+
+def _strings(element) -> Iterator[str]:
+    for event, node in _walk(element):
+        if event == "start":
+            if node.tag not in RAW_TEXT_TAGS and node.text:
+                yield node.text
+        elif node is not element and node.tail:
+            yield node.tail
+
+
+def _stripped(element) -> List[str]:
+    return [text.strip() for text in _strings(element) if text.strip()]
+
+
+def _start_tag(node) -> str:
+    attrs = "".join(
+        f' {name}="{html.escape(value)}"' for name, value in sorted(node.attrib.items())
+    )
+    closing = "/>" if node.tag in VOID_TAGS else ">"
+    return f"<{node.tag}{attrs}{closing}"
+
+
+def _pretty_lines(element) -> List[str]:
+    lines = []
+    depth = 0
+    for event, node in _walk(element):
+        indent = " " * depth
+        if event == "comment":
+            lines.append(f"{indent}<!--{node.text or ''}-->")
+        elif event == "start":
+            lines.append(indent + _start_tag(node))
+            if node.tag in VOID_TAGS:
+                continue
+            depth += 1
+            if node.text and node.text.strip():
+                text = node.text.strip()
+                if node.tag not in RAW_TEXT_TAGS:
+                    text = html.escape(text, quote=False)
+                lines.append(" " * depth + text)
+            continue
+        elif node.tag not in VOID_TAGS:
+            depth -= 1
+            lines.append(f"{' ' * depth}</{node.tag}>")
+
+        if node is not element and node.tail and node.tail.strip():
+            lines.append(" " * depth + html.escape(node.tail.strip(), quote=False))
+    return lines
+
+
+class ParsedSnapshot:
+    def __init__(self, content: Optional[str]):
+        self.content = content or ""
+
+    @cached_property
+    def root(self):
+        from lxml import etree, html as lxml_html
+
+        if not self.content.strip():
+            return None
+        try:
+            return lxml_html.document_fromstring(self.content)
+        except ValueError:
+            parser = lxml_html.HTMLParser(encoding="utf-8")
+            return lxml_html.document_fromstring(
+                self.content.encode("utf-8", "replace"), parser=parser
+            )
+        except etree.ParserError as e:
+            logger.debug(f"[snapshot] Could not parse document: {e}")
+            return None
+
+    @cached_property
+    def body(self):
+        return self.root.find("body") if self.root is not None else None
+
+    @cached_property
+    def document_text(self) -> str:
+        return " ".join(_stripped(self.root)) if self.root is not None else ""
+
+    @cached_property
+    def body_text(self) -> str:
+        return "".join(_stripped(self.body)) if self.body is not None else ""
+
+    @cached_property
+    def text_lines(self) -> List[str]:
+        if self.body is None:
+            return []
+        text = "\n".join(_stripped(self.body))
+        return [line for line in text.splitlines() if line.strip()]
+
+    @cached_property
+    def paragraphs(self) -> List[str]:
+        if self.body is None:
+            return []
+        texts = ("".join(_stripped(node)) for node in self.body.iter(*PARAGRAPH_TAGS))
+        return [text for text in texts if text]
+
+    @cached_property
+    def images(self) -> List[Dict[str, str]]:
+        if self.root is None:
+            return []
+        images = []
+        for img in self.root.iter("img"):
+            src = img.get("src") or img.get("data-src")
+            if src:
+                images.append({"src": src, "alt": img.get("alt", "")})
+        return images
+
+    @cached_property
+    def pretty_lines(self) -> List[str]:
+        return _pretty_lines(self.body) if self.body is not None else []
+
+    @cached_property
+    def price_candidates(self) -> List[str]:
+        head = self.content[:PRICE_SCAN_CHARS]
+        return [
+            match for pattern in PRICE_PATTERNS for match in re.findall(pattern, head)
+        ]
+
+
+_snapshots: "OrderedDict[str, ParsedSnapshot]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def get_snapshot(content: Optional[str]) -> ParsedSnapshot:
+    from app.config import Config
+
+    content = content or ""
+    key = hashlib.sha256(content.encode("utf-8", "surrogatepass")).hexdigest()
+    with _lock:
+        snapshot = _snapshots.get(key)
+        if snapshot is not None:
+            _snapshots.move_to_end(key)
+            return snapshot
+        snapshot = ParsedSnapshot(content)
+        _snapshots[key] = snapshot
+        while len(_snapshots) > max(0, Config.SNAPSHOT_CACHE_SIZE):
+            _snapshots.popitem(last=False)
+        return snapshot
+
+
+def reset_snapshot_cache() -> None:
+    with _lock:
+        _snapshots.clear()
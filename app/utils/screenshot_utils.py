@@ -0,0 +1,373 @@
+import io
+import os
+import json
+import zlib
+import base64
+import hashlib
+import logging
+import threading
+from typing import Optional, Dict, Any, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+SCREENSHOT_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+    "static",
+    "screenshots",
+)
+
+WEBP_MAX_DIMENSION = 16383
+
+MAX_HEIGHT_JS = """
+() => Math.max(
+    document.documentElement.scrollHeight,
+    document.body ? document.body.scrollHeight : 0
+)
+"""
+
+
+def max_capture_height() -> int:
+    from app.config import Config
+
+    return max(1, min(Config.SCREENSHOT_MAX_HEIGHT, WEBP_MAX_DIMENSION))
+
+
+def thumbnail_name(filename: str) -> str:
+    stem, _ = os.path.splitext(filename)
+    return f"{stem}.thumb.webp"
+
+
+def stitched_name(filename: str) -> str:
+    stem, _ = os.path.splitext(filename)
+    return f"{stem}.full.webp"
+
+
+def _avif_supported() -> bool:
+    from PIL import features
+
+    try:
+        return bool(features.check("avif"))
+    except ValueError:
+        return False
+
+
+def _output_format() -> str:
+    from app.config import Config
+
+    fmt = Config.SCREENSHOT_FORMAT.lower()
+    if fmt == "avif" and not _avif_supported():
+        logger.warning("[screenshot] AVIF support missing from Pillow, using WebP")
+        return "webp"
+    return fmt if fmt in ("webp", "avif", "png") else "webp"
+
+
+def _save_kwargs(fmt: str) -> dict:
+    from app.config import Config
+
+    if fmt == "png":
+        return {"optimize": True}
+    if Config.SCREENSHOT_LOSSLESS:
+        return {"lossless": True, "method": 4}
+    return {"quality": Config.SCREENSHOT_QUALITY, "method": 4}
+
+
+def _write_thumbnail(image, path: str) -> None:
+    from app.config import Config
+    from PIL import Image
+
+    width, height = Config.SCREENSHOT_THUMB_WIDTH, Config.SCREENSHOT_THUMB_HEIGHT
+    crop_height = min(image.height, round(image.width * height / width))
+    thumb = image.crop((0, 0, image.width, crop_height))
+    thumb.thumbnail((width, height), Image.Resampling.LANCZOS)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    thumb.save(path, "WEBP", quality=70, method=4)
+
+
+def blob_name(digest: str, fmt: str) -> str:
+    return f"{digest[:2]}/{digest}.{fmt}"
+
+
+def _image_digest(image) -> str:
+    digest = hashlib.sha256(f"{image.mode}:{image.width}x{image.height}:".encode())
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+def _existing(output_dir: str, filename: str) -> bool:
+    path = os.path.join(output_dir, filename)
+    if not os.path.exists(path):
+        return False
+    os.utime(path)
+    return True
+
+
+def _staging(path: str) -> str:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.part"
+
+
+def _keep_png(capture: bytes, output_dir: str) -> str:
+    return store_blob(capture, "png", output_dir)
+
+
+def _write_named(
+    output_dir: str, filename: str, data: bytes, replace: bool = False
+) -> bool:
+    if not replace and _existing(output_dir, filename):
+        return False
+    path = os.path.join(output_dir, filename)
+    staging = _staging(path)
+    with open(staging, "wb") as f:
+        f.write(data)
+    os.replace(staging, path)
+    return True
+
+
+def store_blob(data: bytes, ext: str, output_dir: str = SCREENSHOT_DIR) -> str:
+    filename = blob_name(hashlib.sha256(data).hexdigest(), ext)
+    _write_named(output_dir, filename, data)
+    return filename
+
+
+def _encode(image, fmt: str) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, fmt.upper(), **_save_kwargs(fmt))
+    return buffer.getvalue()
+
+
+def _write_tiles(image, output_dir: str, fmt: str) -> Tuple[List[str], int]:
+    from app.config import Config
+
+    tile_height = max(1, Config.SCREENSHOT_TILE_HEIGHT)
+    tiles = []
+    written = 0
+    for top in range(0, image.height, tile_height):
+        tile = image.crop((0, top, image.width, min(top + tile_height, image.height)))
+        name = blob_name(_image_digest(tile), fmt)
+        if not _existing(output_dir, name):
+            data = _encode(tile, fmt)
+            if _write_named(output_dir, name, data):
+                written += len(data)
+        tiles.append(name)
+    return tiles, written
+
+
+def is_manifest(filename: Optional[str]) -> bool:
+    return bool(filename and filename.endswith(".json"))
+
+
+def read_manifest(
+    filename: str, output_dir: str = SCREENSHOT_DIR
+) -> Optional[Dict[str, Any]]:
+    try:
+        with open(os.path.join(output_dir, filename), "rb") as f:
+            return json.loads(f.read())
+    except (OSError, ValueError) as e:
+        logger.warning(f"[screenshot] Could not read manifest {filename}: {e}")
+        return None
+
+
+def load_screenshot(filename: str, output_dir: str = SCREENSHOT_DIR):
+    from PIL import Image
+
+    if not is_manifest(filename):
+        with Image.open(os.path.join(output_dir, filename)) as image:
+            return image.convert("RGB")
+
+    manifest = read_manifest(filename, output_dir)
+    if not manifest:
+        raise FileNotFoundError(filename)
+    canvas = Image.new("RGB", (manifest["width"], manifest["height"]))
+    for index, tile in enumerate(manifest["tiles"]):
+        with Image.open(os.path.join(output_dir, tile)) as part:
+            canvas.paste(part.convert("RGB"), (0, index * manifest["tile_height"]))
+    return canvas
+
+
+class ScreenshotStrips:
+    """Row-strip reader over a stored screenshot that decodes one tile at a time.
+
+    Only ``crop`` is supported; a manifest's tiles are opened as strips are
+    requested, so comparing tall pages never holds the whole image.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        output_dir: str = SCREENSHOT_DIR,
+        width: Optional[int] = None,
+    ):
+        from PIL import Image
+
+        if is_manifest(filename):
+            manifest = read_manifest(filename, output_dir)
+            if not manifest:
+                raise FileNotFoundError(filename)
+            self._paths = [os.path.join(output_dir, t) for t in manifest["tiles"]]
+            tile_height = manifest["tile_height"]
+            source_width, source_height = manifest["width"], manifest["height"]
+        else:
+            self._paths = [os.path.join(output_dir, filename)]
+            with Image.open(self._paths[0]) as image:
+                source_width, source_height = image.size
+            tile_height = source_height
+
+        scale = width / source_width if width else 1.0
+        self.width = width or source_width
+        self.height = max(1, round(source_height * scale))
+        self._bounds = [
+            (
+                round(top * scale),
+                round(min(top + tile_height, source_height) * scale),
+            )
+            for top in range(0, source_height, tile_height)
+        ]
+        self._cached: Optional[Tuple[int, Any]] = None
+
+    def _tile(self, index: int):
+        from PIL import Image
+
+        if self._cached and self._cached[0] == index:
+            return self._cached[1]
+        top, bottom = self._bounds[index]
+        with Image.open(self._paths[index]) as part:
+            tile = part.convert("RGB")
+        if tile.size != (self.width, bottom - top):
+            tile = tile.resize(
+                (self.width, max(1, bottom - top)), Image.Resampling.BILINEAR
+            )
+        self._cached = (index, tile)
+        return tile
+
+    def crop(self, box: Tuple[int, int, int, int]):
+        from PIL import Image
+
+        left, top, right, bottom = box
+        strip = Image.new("RGB", (right - left, bottom - top))
+        for index, (tile_top, tile_bottom) in enumerate(self._bounds):
+            lo, hi = max(top, tile_top), min(bottom, tile_bottom)
+            if lo >= hi:
+                continue
+            part = self._tile(index).crop((left, lo - tile_top, right, hi - tile_top))
+            strip.paste(part, (0, lo - top))
+        return strip
+
+
+def stitch_screenshot(filename: str, output_dir: str = SCREENSHOT_DIR) -> str:
+    from app.config import Config
+
+    name = stitched_name(filename)
+    if not _existing(output_dir, name):
+        image = load_screenshot(filename, output_dir)
+        buffer = io.BytesIO()
+        image.save(buffer, "WEBP", quality=Config.SCREENSHOT_QUALITY, method=4)
+        _write_named(output_dir, name, buffer.getvalue())
+    return name
+
+
+def _refresh_tiles(filename: str, output_dir: str) -> bool:
+    manifest = read_manifest(filename, output_dir)
+    if not manifest:
+        return False
+    present = [_existing(output_dir, tile) for tile in manifest["tiles"]]
+    _existing(output_dir, thumbnail_name(filename))
+    return all(present)
+
+
+def _preview(image):
+    from app.config import Config
+
+    factor = image.width // max(1, Config.SCREENSHOT_THUMB_WIDTH)
+    return image.reduce(factor) if factor > 1 else image
+
+
+def perceptual_hash(image) -> str:
+    from PIL import Image
+    from app.config import Config
+
+    columns = max(2, Config.SCREENSHOT_HASH_SIZE)
+    rows = max(columns, min(columns * 4, round(columns * image.height / image.width)))
+    small = image.convert("L").resize((columns, rows), Image.Resampling.BOX)
+    cells = base64.b64encode(zlib.compress(small.tobytes())).decode("ascii")
+    return f"{rows}x{columns}:{cells}"
+
+
+def _hash_cells(phash: str) -> Tuple[str, Optional[bytes]]:
+    shape, _, cells = phash.partition(":")
+    try:
+        return shape, zlib.decompress(base64.b64decode(cells, validate=True))
+    except (ValueError, zlib.error):
+        return shape, None
+
+
+def hash_distance(first: Optional[str], second: Optional[str]) -> Optional[int]:
+    """Largest change in mean luminance of any grid cell between two hashes."""
+    if not first or not second:
+        return None
+    shape, before = _hash_cells(first)
+    other_shape, after = _hash_cells(second)
+    if shape != other_shape or before is None or after is None:
+        return None
+    if len(before) != len(after):
+        return None
+    return max((abs(a - b) for a, b in zip(before, after)), default=0)
+
+
+def _is_similar(phash: str, previous_hash: Optional[str]) -> bool:
+    from app.config import Config
+
+    distance = hash_distance(phash, previous_hash)
+    return distance is not None and distance <= Config.SCREENSHOT_HASH_DISTANCE
+
+
+def store_screenshot(
+    capture: bytes,
+    output_dir: str = SCREENSHOT_DIR,
+    previous_hash: Optional[str] = None,
+) -> Dict[str, Any]:
+    try:
+        from PIL import Image
+    except ImportError:
+        logger.warning("[screenshot] Pillow not installed, storing PNG as captured")
+        return {"filename": _keep_png(capture, output_dir), "hash": None}
+
+    from app.config import Config
+
+    fmt = _output_format()
+
+    try:
+        with Image.open(io.BytesIO(capture)) as captured:
+            image = captured.convert("RGB")
+        max_height = max_capture_height()
+        if image.height > max_height:
+            image = image.crop((0, 0, image.width, max_height))
+
+        preview = _preview(image)
+        phash = perceptual_hash(preview)
+        if _is_similar(phash, previous_hash):
+            logger.info("[screenshot] Capture matches the previous one, not stored")
+            return {"filename": None, "hash": previous_hash, "similar": True}
+
+        filename = blob_name(_image_digest(image), "json")
+        if _existing(output_dir, filename) and _refresh_tiles(filename, output_dir):
+            logger.info(f"[screenshot] Reusing identical screenshot {filename}")
+            return {"filename": filename, "hash": phash}
+
+        tiles, written = _write_tiles(image, output_dir, fmt)
+        _write_thumbnail(preview, os.path.join(output_dir, thumbnail_name(filename)))
+        manifest = {
+            "width": image.width,
+            "height": image.height,
+            "tile_height": max(1, Config.SCREENSHOT_TILE_HEIGHT),
+            "tiles": tiles,
+        }
+        _write_named(output_dir, filename, json.dumps(manifest).encode(), replace=True)
+    except Exception as e:
+        logger.error(f"[screenshot] Encoding capture failed: {e}")
+        return {"filename": _keep_png(capture, output_dir), "hash": None}
+
+    logger.info(
+        f"[screenshot] Stored {filename}: {len(tiles)} tile(s), {len(capture)} -> {written} new bytes ({image.width}x{image.height})"
+    )
+    return {"filename": filename, "hash": phash}
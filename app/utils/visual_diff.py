@@ -0,0 +1,220 @@
+import os
+import logging
+from collections import deque
+from typing import Optional, Dict, Any, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+HEATMAP_COLOR = (239, 68, 68)
+MIN_HEATMAP_ALPHA = 96
+
+
+def _open_rgb(filename: str, output_dir: str, width: Optional[int] = None):
+    from app.utils.screenshot_utils import ScreenshotStrips
+
+    return ScreenshotStrips(filename, output_dir, width)
+
+
+def _row_signatures(image, strip: int) -> List[int]:
+    import numpy as np
+
+    signatures: List[int] = []
+    for top in range(0, image.height, strip):
+        rows = np.asarray(
+            image.crop((0, top, image.width, min(top + strip, image.height)))
+        )
+        signatures.extend(hash(row.tobytes()) for row in rows)
+    return signatures
+
+
+def _common_edges(before: List[int], after: List[int]) -> Tuple[int, int]:
+    limit = min(len(before), len(after))
+    top = 0
+    while top < limit and before[top] == after[top]:
+        top += 1
+    bottom = 0
+    while bottom < limit - top and before[-1 - bottom] == after[-1 - bottom]:
+        bottom += 1
+    return top, bottom
+
+
+def _strip_mask(before, after, top: int, bottom: int, threshold: int):
+    import numpy as np
+
+    old = np.asarray(before.crop((0, top, before.width, bottom)), dtype=np.int16)
+    new = np.asarray(after.crop((0, top, after.width, bottom)), dtype=np.int16)
+    return np.abs(new - old).max(axis=2) > threshold
+
+
+def _tile_fractions(mask, tile: int):
+    import numpy as np
+
+    rows, cols = mask.shape
+    padded = np.zeros(
+        (-(-rows // tile) * tile, -(-cols // tile) * tile), dtype=np.float32
+    )
+    padded[:rows, :cols] = mask
+    grid = padded.reshape(padded.shape[0] // tile, tile, padded.shape[1] // tile, tile)
+    return grid.mean(axis=(1, 3))
+
+
+def _cluster(grid, tile: int, width: int, height: int) -> List[Dict[str, int]]:
+    changed = grid > 0
+    rows, cols = changed.shape
+    seen = set()
+    regions = []
+
+    for start in zip(*changed.nonzero()):
+        start = (int(start[0]), int(start[1]))
+        if start in seen:
+            continue
+        seen.add(start)
+        queue = deque([start])
+        top, left, bottom, right = start[0], start[1], start[0], start[1]
+        while queue:
+            row, col = queue.popleft()
+            top, bottom = min(top, row), max(bottom, row)
+            left, right = min(left, col), max(right, col)
+            for dr in (-1, 0, 1):
+                for dc in (-1, 0, 1):
+                    neighbour = (row + dr, col + dc)
+                    if (
+                        0 <= neighbour[0] < rows
+                        and 0 <= neighbour[1] < cols
+                        and neighbour not in seen
+                        and changed[neighbour]
+                    ):
+                        seen.add(neighbour)
+                        queue.append(neighbour)
+
+        x, y = left * tile, top * tile
+        regions.append(
+            {
+                "x": x,
+                "y": y,
+                "width": min((right + 1) * tile, width) - x,
+                "height": min((bottom + 1) * tile, height) - y,
+            }
+        )
+
+    regions.sort(key=lambda r: r["width"] * r["height"], reverse=True)
+    return regions
+
+
+def _heatmap_png(grid) -> bytes:
+    import io
+    import numpy as np
+    from PIL import Image
+
+    alpha = np.where(
+        grid > 0,
+        np.clip(MIN_HEATMAP_ALPHA + grid * (255 - MIN_HEATMAP_ALPHA), 0, 255),
+        0,
+    ).astype(np.uint8)
+    pixels = np.zeros(grid.shape + (4,), dtype=np.uint8)
+    pixels[..., :3] = HEATMAP_COLOR
+    pixels[..., 3] = alpha
+
+    buffer = io.BytesIO()
+    Image.fromarray(pixels, "RGBA").save(buffer, "PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def compare_screenshots(
+    before_name: str, after_name: str, output_dir: str
+) -> Dict[str, Any]:
+    import numpy as np
+    from app.config import Config
+
+    tile = max(1, Config.VISUAL_DIFF_TILE)
+    strip = max(tile, Config.VISUAL_DIFF_STRIP // tile * tile)
+    threshold = Config.VISUAL_DIFF_THRESHOLD
+
+    after = _open_rgb(after_name, output_dir)
+    before = _open_rgb(before_name, output_dir, after.width)
+    width, height = after.width, after.height
+
+    top, bottom = _common_edges(
+        _row_signatures(before, strip), _row_signatures(after, strip)
+    )
+    compared_end = min(before.height, height) - bottom
+    inserted_end = height - bottom
+    removed_rows = max(0, before.height - height)
+
+    grid = np.zeros((-(-height // tile), -(-width // tile)), dtype=np.float32)
+    changed_pixels = 0
+
+    for start in range(0, height, strip):
+        end = min(start + strip, height)
+        mask = np.zeros((end - start, width), dtype=bool)
+        lo, hi = max(start, top), min(end, compared_end)
+        if lo < hi:
+            mask[lo - start : hi - start] = _strip_mask(
+                before, after, lo, hi, threshold
+            )
+        lo, hi = max(start, compared_end), min(end, inserted_end)
+        if lo < hi:
+            mask[lo - start : hi - start] = True
+        changed_pixels += int(mask.sum())
+        grid[start // tile : start // tile + -(-(end - start) // tile)] = (
+            _tile_fractions(mask, tile)
+        )
+
+    if removed_rows and compared_end < height:
+        grid[compared_end // tile] = np.maximum(grid[compared_end // tile], 1.0)
+
+    total = width * max(height, before.height)
+    changed_percent = (
+        round(100.0 * (changed_pixels + removed_rows * width) / total, 2)
+        if total
+        else 0.0
+    )
+
+    regions = _cluster(grid, tile, width, height)
+    return {
+        "changed_percent": changed_percent,
+        "regions": regions[: Config.VISUAL_DIFF_MAX_REGIONS],
+        "region_count": len(regions),
+        "heatmap": _heatmap_png(grid) if changed_percent else None,
+        "width": width,
+        "height": height,
+    }
+
+
+def visual_diff(
+    before: Optional[str], after: Optional[str], output_dir: str
+) -> Optional[Dict[str, Any]]:
+    from app.config import Config
+    from app.utils.screenshot_utils import store_blob
+
+    if not Config.VISUAL_DIFF_ENABLED or not before or not after:
+        return None
+    if before == after:
+        return {"changed_percent": 0.0, "regions": [], "heatmap": None}
+
+    if not os.path.exists(os.path.join(output_dir, before)) or not os.path.exists(
+        os.path.join(output_dir, after)
+    ):
+        return None
+
+    try:
+        result = compare_screenshots(before, after, output_dir)
+    except ImportError:
+        logger.warning("[visual_diff] NumPy/Pillow not installed, skipping")
+        return None
+    except Exception as e:
+        logger.error(f"[visual_diff] Comparing {before} with {after} failed: {e}")
+        return None
+
+    heatmap = None
+    if result["heatmap"]:
+        heatmap = store_blob(result["heatmap"], "png", output_dir)
+    logger.info(
+        f"[visual_diff] {after}: {result['changed_percent']}% changed in {result['region_count']} region(s)"
+    )
+    return {
+        "changed_percent": result["changed_percent"],
+        "regions": result["regions"],
+        "heatmap": heatmap,
+    }
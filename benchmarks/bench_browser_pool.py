@@ -0,0 +1,68 @@
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Measure the fetch paths, not per-host throttling (Config reads this at import).
+os.environ["RATE_LIMIT_ENABLED"] = "0"
+
+from app.tasks import worker_loop
+from app.tasks.browser_pool import BrowserPool
+from app.tasks import browser_pool
+from app.tasks.screenshot_tasks import fetch_url_async, fetch_url_sync
+
+
+def _run_launch_per_call(urls, checks):
+    ok = 0
+    start = time.perf_counter()
+    for i in range(checks):
+        result = asyncio.run(fetch_url_async(urls[i % len(urls)]))
+        ok += 1 if result.get("success") else 0
+    return ok, time.perf_counter() - start
+
+
+def _run_pooled(urls, checks, size, max_pages):
+    pool = BrowserPool(size=size, max_pages=max_pages)
+    worker_loop.run(pool.start(), timeout=60)
+    browser_pool._pool = pool
+    try:
+        ok = 0
+        start = time.perf_counter()
+        for i in range(checks):
+            result = fetch_url_sync(urls[i % len(urls)])
+            ok += 1 if result.get("success") else 0
+        elapsed = time.perf_counter() - start
+    finally:
+        browser_pool.stop_pool()
+    return ok, elapsed, pool.stats
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare checks per minute: launch-per-call vs warm browser pool"
+    )
+    parser.add_argument("urls", nargs="+")
+    parser.add_argument("--checks", type=int, default=20)
+    parser.add_argument("--pool-size", type=int, default=1)
+    parser.add_argument("--max-pages", type=int, default=100)
+    args = parser.parse_args()
+
+    ok, elapsed = _run_launch_per_call(args.urls, args.checks)
+    print(
+        f"launch-per-call: {ok}/{args.checks} ok in {elapsed:.1f}s "
+        f"-> {args.checks / elapsed * 60:.1f} checks/min"
+    )
+
+    ok, elapsed, stats = _run_pooled(
+        args.urls, args.checks, args.pool_size, args.max_pages
+    )
+    print(
+        f"warm pool (size={args.pool_size}): {ok}/{args.checks} ok in {elapsed:.1f}s "
+        f"-> {args.checks / elapsed * 60:.1f} checks/min {stats}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import os
+import sys
+import time
+import random
+import difflib
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.diff_engine import ALGORITHMS, unified_diff
+
+
+def _page(size: int, rng: random.Random):
+    lines = ["<html>\n", "<body>\n"]
+    total = 0
+    row = 0
+    while total < size:
+        row += 1
+        block = [
+            '<div class="card">\n',
+            f'  <a href="/item/{rng.randrange(row + 1)}">Item</a>\n',
+            '  <span class="price">$9.99</span>\n',
+            "</div>\n",
+        ]
+        lines.extend(block)
+        total += sum(len(line) for line in block)
+    lines.extend(["</body>\n", "</html>\n"])
+    return lines
+
+
+def _mutate(lines, changes: int, rng: random.Random):
+    lines = list(lines)
+    for _ in range(changes):
+        index = rng.randrange(2, len(lines) - 2)
+        action = rng.random()
+        if action < 0.4:
+            lines[index] = f'  <span class="price">${rng.randrange(100)}.00</span>\n'
+        elif action < 0.7:
+            lines.insert(index, '<div class="banner">Sale</div>\n')
+        else:
+            del lines[index]
+    return lines
+
+
+def _strings_diff(old, new):
+    return difflib.unified_diff(old, new, "previous", "current", lineterm="")
+
+
+def _engine_diff(algorithm):
+    return lambda old, new: unified_diff(
+        old, new, "previous", "current", lineterm="", algorithm=algorithm
+    )
+
+
+def _measure(diff, old, new, memory: bool):
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    lines = list(diff(old, new))
+    elapsed = time.perf_counter() - start
+    peak = 0
+    if memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return lines, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare unified diff runtime and memory of the diff engines on large pages"
+    )
+    parser.add_argument("--sizes-kb", default="100,500,1000,5000")
+    parser.add_argument("--changes", type=int, default=50)
+    parser.add_argument("--algorithms", default=",".join(ALGORITHMS))
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--memory", action="store_true", help="also report peak traced memory"
+    )
+    args = parser.parse_args()
+
+    for size_kb in [int(s) for s in args.sizes_kb.split(",")]:
+        rng = random.Random(args.seed)
+        old = _page(size_kb * 1024, rng)
+        new = _mutate(old, args.changes, rng)
+        runs = [("difflib-str", _strings_diff)] + [
+            (algorithm, _engine_diff(algorithm))
+            for algorithm in args.algorithms.split(",")
+        ]
+        for name, diff in runs:
+            lines, elapsed, peak = _measure(diff, old, new, args.memory)
+            changed = sum(1 for line in lines if line[:1] in "+-") - 2
+            memory = f"  peak {peak / 1024 / 1024:>7.1f} MB" if args.memory else ""
+            print(
+                f"{size_kb:>5} KB {len(old):>7} lines  {name:<11} "
+                f"{elapsed * 1000:>9.1f} ms{memory}  {changed} changed line(s)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
-from models import Base
+from app.models import Base
 
 db = SQLAlchemy(model_class=Base)
 migrate = Migrate()
@@ -0,0 +1,52 @@
+import sqlalchemy as sa
+from alembic import context, op
+
+
+def _inspector():
+    if context.is_offline_mode():
+        return None
+    return sa.inspect(op.get_bind())
+
+
+def has_table(name: str) -> bool:
+    inspector = _inspector()
+    return inspector is not None and inspector.has_table(name)
+
+
+def _columns(table: str) -> set:
+    inspector = _inspector()
+    if inspector is None:
+        return set()
+    return {column["name"] for column in inspector.get_columns(table)}
+
+
+def add_columns(table: str, *columns: sa.Column) -> None:
+    if not context.is_offline_mode() and not has_table(table):
+        return
+    existing = _columns(table)
+    for column in columns:
+        if column.name not in existing:
+            op.add_column(table, column)
+
+
+def drop_columns(table: str, *names: str) -> None:
+    if not context.is_offline_mode() and not has_table(table):
+        return
+    existing = _columns(table) if not context.is_offline_mode() else set(names)
+    with op.batch_alter_table(table) as batch:
+        for name in names:
+            if name in existing:
+                batch.drop_column(name)
+
+
+def create_table(name: str, *columns, indexes=()) -> None:
+    if has_table(name):
+        return
+    op.create_table(name, *columns)
+    for column in indexes:
+        op.create_index(op.f(f"ix_{name}_{column}"), name, [column])
+
+
+def drop_table(name: str) -> None:
+    if context.is_offline_mode() or has_table(name):
+        op.drop_table(name)
@@ -0,0 +1,27 @@
+"""Link wait for selector
+
+Revision ID: 14e99fb85308
+Revises: d69d5eb5a27c
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from migrations.schema import add_columns, drop_columns
+
+# revision identifiers, used by Alembic.
+revision = "14e99fb85308"
+down_revision = "d69d5eb5a27c"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    add_columns(
+        "links", sa.Column("wait_for_selector", sa.String(length=500), nullable=True)
+    )
+
+
+def downgrade():
+    drop_columns("links", "wait_for_selector")
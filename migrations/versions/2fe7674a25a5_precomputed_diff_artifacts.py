@@ -0,0 +1,35 @@
+"""Precomputed diff artifacts
+
+Revision ID: 2fe7674a25a5
+Revises: c799c5fb903f
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from migrations.schema import create_table, drop_table
+
+# revision identifiers, used by Alembic.
+revision = "2fe7674a25a5"
+down_revision = "c799c5fb903f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    create_table(
+        "diff_artifacts",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("diff_id", sa.Integer(), nullable=False),
+        sa.Column("mode", sa.String(length=20), nullable=False),
+        sa.Column("content", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["diff_id"], ["diffs.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        indexes=["diff_id"],
+    )
+
+
+def downgrade():
+    drop_table("diff_artifacts")
@@ -0,0 +1,31 @@
+"""Host rate limit buckets
+
+Revision ID: 331dc9cf3516
+Revises: 3ec9a754460f
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from migrations.schema import create_table, drop_table
+
+# revision identifiers, used by Alembic.
+revision = "331dc9cf3516"
+down_revision = "3ec9a754460f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    create_table(
+        "host_buckets",
+        sa.Column("host", sa.String(length=255), nullable=False),
+        sa.Column("tokens", sa.Float(), nullable=False),
+        sa.Column("updated_at", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("host"),
+    )
+
+
+def downgrade():
+    drop_table("host_buckets")
@@ -0,0 +1,29 @@
+"""Project request blocking
+
+Revision ID: 3ec9a754460f
+Revises: 14e99fb85308
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from migrations.schema import add_columns, drop_columns
+
+# revision identifiers, used by Alembic.
+revision = "3ec9a754460f"
+down_revision = "14e99fb85308"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    add_columns(
+        "projects",
+        sa.Column("blocked_resource_types", sa.String(length=255), nullable=True),
+        sa.Column("blocked_domains", sa.Text(), nullable=True),
+    )
+
+
+def downgrade():
+    drop_columns("projects", "blocked_resource_types", "blocked_domains")
@@ -0,0 +1,41 @@
+"""Conditional get validators and check events
+
+Revision ID: 4cc218d6e0ed
+Revises:
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from migrations.schema import add_columns, create_table, drop_columns, drop_table
+
+# revision identifiers, used by Alembic.
+revision = "4cc218d6e0ed"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    add_columns(
+        "links",
+        sa.Column("etag", sa.String(length=255), nullable=True),
+        sa.Column("last_modified", sa.String(length=100), nullable=True),
+    )
+    create_table(
+        "check_events",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("link_id", sa.Integer(), nullable=False),
+        sa.Column("checked_at", sa.DateTime(), nullable=True),
+        sa.Column("outcome", sa.String(length=50), nullable=False),
+        sa.Column("content_hash", sa.String(length=64), nullable=True),
+        sa.Column("detail", sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(["link_id"], ["links.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade():
+    drop_table("check_events")
+    drop_columns("links", "etag", "last_modified")
@@ -0,0 +1,27 @@
+"""Diff artifact cache key
+
+Revision ID: 5b7e0c2d9a41
+Revises: 2fe7674a25a5
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from migrations.schema import add_columns, drop_columns
+
+# revision identifiers, used by Alembic.
+revision = "5b7e0c2d9a41"
+down_revision = "2fe7674a25a5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    add_columns(
+        "diff_artifacts", sa.Column("cache_key", sa.String(length=64), nullable=True)
+    )
+
+
+def downgrade():
+    drop_columns("diff_artifacts", "cache_key")
@@ -0,0 +1,38 @@
+"""Sitemap lastmod hints
+
+Revision ID: 685b708d2dbd
+Revises: b2b99180856e
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from migrations.schema import add_columns, create_table, drop_columns, drop_table
+
+# revision identifiers, used by Alembic.
+revision = "685b708d2dbd"
+down_revision = "b2b99180856e"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    add_columns("links", sa.Column("lastmod_hint", sa.DateTime(), nullable=True))
+    create_table(
+        "sitemap_sources",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("domain", sa.String(length=255), nullable=False),
+        sa.Column("sitemap_urls", sa.Text(), nullable=True),
+        sa.Column("fetched_at", sa.DateTime(), nullable=True),
+        sa.Column("files", sa.Integer(), nullable=True),
+        sa.Column("entries", sa.Integer(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("domain"),
+    )
+
+
+def downgrade():
+    drop_table("sitemap_sources")
+    drop_columns("links", "lastmod_hint")
@@ -0,0 +1,30 @@
+"""Visual diff results
+
+Revision ID: 6c4c0993ac52
+Revises: 685b708d2dbd
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from migrations.schema import add_columns, drop_columns
+
+# revision identifiers, used by Alembic.
+revision = "6c4c0993ac52"
+down_revision = "685b708d2dbd"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    add_columns(
+        "diffs",
+        sa.Column("visual_change", sa.Float(), nullable=True),
+        sa.Column("visual_regions", sa.Text(), nullable=True),
+        sa.Column("heatmap", sa.Text(), nullable=True),
+    )
+
+
+def downgrade():
+    drop_columns("diffs", "visual_change", "visual_regions", "heatmap")
@@ -0,0 +1,30 @@
+"""Diff baselines
+
+Revision ID: 6e1c4b8f2d93
+Revises: a3d5f19c7e20
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from migrations.schema import add_columns, drop_columns
+
+# revision identifiers, used by Alembic.
+revision = "6e1c4b8f2d93"
+down_revision = "a3d5f19c7e20"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    add_columns(
+        "diffs",
+        sa.Column(
+            "is_baseline", sa.Boolean(), nullable=False, server_default=sa.false()
+        ),
+    )
+
+
+def downgrade():
+    drop_columns("diffs", "is_baseline")
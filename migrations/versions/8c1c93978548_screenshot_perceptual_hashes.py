@@ -0,0 +1,27 @@
+"""Screenshot perceptual hashes
+
+Revision ID: 8c1c93978548
+Revises: 6c4c0993ac52
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from migrations.schema import add_columns, drop_columns
+
+# revision identifiers, used by Alembic.
+revision = "8c1c93978548"
+down_revision = "6c4c0993ac52"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    add_columns("initial_pages", sa.Column("screenshot_hash", sa.Text(), nullable=True))
+    add_columns("diffs", sa.Column("screenshot_hash", sa.Text(), nullable=True))
+
+
+def downgrade():
+    drop_columns("diffs", "screenshot_hash")
+    drop_columns("initial_pages", "screenshot_hash")
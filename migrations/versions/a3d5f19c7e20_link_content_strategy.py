@@ -0,0 +1,27 @@
+"""Link content strategy
+
+Revision ID: a3d5f19c7e20
+Revises: 5b7e0c2d9a41
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from migrations.schema import add_columns, drop_columns
+
+# revision identifiers, used by Alembic.
+revision = "a3d5f19c7e20"
+down_revision = "5b7e0c2d9a41"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    add_columns(
+        "links", sa.Column("content_strategy", sa.String(length=20), nullable=True)
+    )
+
+
+def downgrade():
+    drop_columns("links", "content_strategy")
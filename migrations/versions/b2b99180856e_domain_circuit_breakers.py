@@ -0,0 +1,42 @@
+"""Domain circuit breakers
+
+Revision ID: b2b99180856e
+Revises: 331dc9cf3516
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from migrations.schema import add_columns, create_table, drop_columns, drop_table
+
+# revision identifiers, used by Alembic.
+revision = "b2b99180856e"
+down_revision = "331dc9cf3516"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    add_columns(
+        "links", sa.Column("last_error_class", sa.String(length=20), nullable=True)
+    )
+    create_table(
+        "domain_circuits",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("domain", sa.String(length=255), nullable=False),
+        sa.Column("state", sa.String(length=20), nullable=False),
+        sa.Column("failures", sa.Integer(), nullable=True),
+        sa.Column("trips", sa.Integer(), nullable=True),
+        sa.Column("last_error_class", sa.String(length=20), nullable=True),
+        sa.Column("last_failure_at", sa.DateTime(), nullable=True),
+        sa.Column("open_until", sa.DateTime(), nullable=True),
+        sa.Column("probe_started_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("domain"),
+    )
+
+
+def downgrade():
+    drop_table("domain_circuits")
+    drop_columns("links", "last_error_class")
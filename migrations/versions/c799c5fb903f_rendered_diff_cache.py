@@ -0,0 +1,37 @@
+"""Rendered diff cache
+
+Revision ID: c799c5fb903f
+Revises: ee50d010764b
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from migrations.schema import create_table, drop_table
+
+# revision identifiers, used by Alembic.
+revision = "c799c5fb903f"
+down_revision = "ee50d010764b"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    create_table(
+        "rendered_diffs",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("cache_key", sa.String(length=64), nullable=False),
+        sa.Column("mode", sa.String(length=20), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("last_used_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("cache_key"),
+        indexes=["last_used_at"],
+    )
+
+
+def downgrade():
+    drop_table("rendered_diffs")
@@ -0,0 +1,37 @@
+"""Fetch strategies
+
+Revision ID: d69d5eb5a27c
+Revises: 4cc218d6e0ed
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from migrations.schema import create_table, drop_table
+
+# revision identifiers, used by Alembic.
+revision = "d69d5eb5a27c"
+down_revision = "4cc218d6e0ed"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    create_table(
+        "fetch_strategies",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("domain", sa.String(length=255), nullable=False),
+        sa.Column("strategy", sa.String(length=20), nullable=False),
+        sa.Column("samples", sa.Integer(), nullable=True),
+        sa.Column("matches", sa.Integer(), nullable=True),
+        sa.Column("last_similarity", sa.Float(), nullable=True),
+        sa.Column("checks_since_validation", sa.Integer(), nullable=True),
+        sa.Column("validated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("domain"),
+    )
+
+
+def downgrade():
+    drop_table("fetch_strategies")
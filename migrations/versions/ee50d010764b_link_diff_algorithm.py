@@ -0,0 +1,27 @@
+"""Link diff algorithm
+
+Revision ID: ee50d010764b
+Revises: 8c1c93978548
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from migrations.schema import add_columns, drop_columns
+
+# revision identifiers, used by Alembic.
+revision = "ee50d010764b"
+down_revision = "8c1c93978548"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    add_columns(
+        "links", sa.Column("diff_algorithm", sa.String(length=20), nullable=True)
+    )
+
+
+def downgrade():
+    drop_columns("links", "diff_algorithm")
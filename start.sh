@@ -1,5 +1,6 @@
 #!/bin/sh
 
 make init
+make migrate
 make celery &
 make start
@@ -22,6 +22,45 @@ def app():
     yield app
 
 
+@pytest.fixture(autouse=True)
+def no_rate_limit():
+    """Keep the shared per-host rate limiter out of unrelated tests."""
+    from app.services.rate_limiter import reset_rate_limiter
+
+    reset_rate_limiter()
+    with patch("app.config.Config.RATE_LIMIT_ENABLED", False):
+        yield
+    reset_rate_limiter()
+
+
+@pytest.fixture(autouse=True)
+def no_circuit_breaker():
+    """Keep per-domain circuit state out of unrelated tests."""
+    with patch("app.config.Config.CIRCUIT_BREAKER_ENABLED", False):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def no_sitemap_hints():
+    """Keep sitemap discovery from reaching the network in unrelated tests."""
+    with patch("app.config.Config.SITEMAP_HINTS_ENABLED", False):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def no_diff_cache():
+    """Render diffs fresh in every test instead of reusing cached output."""
+    with patch("app.config.Config.DIFF_CACHE_ENABLED", False):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def no_diff_precompute():
+    """Leave diff rendering to the tests that exercise it."""
+    with patch("app.config.Config.DIFF_PRECOMPUTE_ENABLED", False):
+        yield
+
+
 @pytest.fixture
 def client(app):
     """Create test client."""
@@ -19,6 +19,34 @@ class TestExtensions:
 
             assert extensions._engine is not None
 
+    def test_migrations_upgrade_existing_database(self, tmp_path):
+        pytest.importorskip("flask_migrate")
+        import os
+        from flask import Flask
+        from flask_migrate import upgrade
+        from sqlalchemy import create_engine, inspect, text
+        from migrations import init_migrations
+
+        db_url = f"sqlite:///{tmp_path / 'old.db'}"
+        engine = create_engine(db_url)
+        with engine.begin() as conn:
+            conn.execute(
+                text("CREATE TABLE links (id INTEGER PRIMARY KEY, url VARCHAR(2048))")
+            )
+
+        app = Flask(__name__)
+        app.config["SQLALCHEMY_DATABASE_URI"] = db_url
+        init_migrations(app)
+        directory = os.path.join(os.path.dirname(__file__), "..", "migrations")
+        with app.app_context():
+            upgrade(directory=directory)
+
+        inspector = inspect(engine)
+        columns = {c["name"] for c in inspector.get_columns("links")}
+        assert {"etag", "last_modified", "diff_algorithm"} <= columns
+        assert inspector.has_table("check_events")
+        assert inspector.has_table("diff_artifacts")
+
     def test_check_database_health_success(self):
         from app.extensions import check_database_health
 
@@ -0,0 +1,337 @@
+import queue
+import asyncio
+import pytest
+from unittest.mock import patch
+
+
+def _links(n, host="example.com"):
+    return [{"id": i, "url": f"https://{host}/page/{i}"} for i in range(n)]
+
+
+def _plan(strategy, sample=False):
+    return {
+        "strategy": strategy,
+        "sample": sample,
+        "render": strategy == "browser" or sample,
+    }
+
+
+class TestBatchFetcher:
+    def test_respects_per_host_and_global_caps(self):
+        from app.tasks import batch_tasks
+
+        active = {"total": 0, "hosts": {}}
+        peak = {"total": 0, "hosts": {}}
+
+        async def fake_conditional(url, etag=None, last_modified=None):
+            host = url.split("/")[2]
+            active["total"] += 1
+            active["hosts"][host] = active["hosts"].get(host, 0) + 1
+            peak["total"] = max(peak["total"], active["total"])
+            peak["hosts"][host] = max(peak["hosts"].get(host, 0), active["hosts"][host])
+            await asyncio.sleep(0.01)
+            active["total"] -= 1
+            active["hosts"][host] -= 1
+            return {"success": True, "not_modified": False, "content": "<html></html>"}
+
+        items = [
+            (link, _plan("http"))
+            for link in _links(10, "a.test") + _links(10, "b.test")
+        ]
+        results = queue.Queue()
+        fetcher = batch_tasks.BatchFetcher(concurrency=5, per_host=2)
+
+        with patch.object(batch_tasks, "conditional_fetch_async", fake_conditional):
+            asyncio.run(fetcher.run(items, results))
+
+        assert results.qsize() == 20
+        assert peak["total"] <= 5
+        assert peak["hosts"]["a.test"] <= 2
+        assert peak["hosts"]["b.test"] <= 2
+
+    def test_browser_strategy_renders(self):
+        from app.tasks import batch_tasks
+
+        async def fake_conditional(url, etag=None, last_modified=None):
+            return {"success": True, "not_modified": False, "content": "<html></html>"}
+
+        async def fake_render(
+            url, wait_for_selector=None, rules=None, screenshot=False
+        ):
+            return {"success": True, "content": "<html><body>rendered</body></html>"}
+
+        fetcher = batch_tasks.BatchFetcher()
+        results = queue.Queue()
+
+        with (
+            patch.object(batch_tasks, "conditional_fetch_async", fake_conditional),
+            patch.object(batch_tasks, "fetch_url_async", fake_render),
+        ):
+            asyncio.run(fetcher.run([(_links(1)[0], _plan("browser"))], results))
+
+        _, outcome = results.get_nowait()
+        assert "rendered" in outcome["rendered"]["content"]
+        assert outcome["http_result"]["content"] == "<html></html>"
+
+    def test_static_domain_skips_render_until_due(self):
+        from app.tasks import batch_tasks
+
+        renders = []
+
+        async def fake_conditional(url, etag=None, last_modified=None):
+            return {"success": True, "not_modified": False, "content": "<p>x</p>"}
+
+        async def fake_render(
+            url, wait_for_selector=None, rules=None, screenshot=False
+        ):
+            renders.append(url)
+            return {"success": True, "content": "<p>x</p>"}
+
+        fetcher = batch_tasks.BatchFetcher()
+        results = queue.Queue()
+        items = [
+            (_links(1, "a.test")[0], _plan("http")),
+            (_links(1, "b.test")[0], _plan("http", sample=True)),
+        ]
+
+        with (
+            patch.object(batch_tasks, "conditional_fetch_async", fake_conditional),
+            patch.object(batch_tasks, "fetch_url_async", fake_render),
+        ):
+            asyncio.run(fetcher.run(items, results))
+
+        outcomes = {}
+        while not results.empty():
+            link, outcome = results.get_nowait()
+            outcomes[link["url"]] = outcome
+        assert renders == ["https://b.test/page/0"]
+        assert outcomes["https://a.test/page/0"]["rendered"] is None
+        assert outcomes["https://b.test/page/0"]["http_result"]["content"] == "<p>x</p>"
+
+    def test_render_passes_screenshot_flag(self):
+        from app.tasks import batch_tasks
+
+        flags = []
+
+        async def fake_conditional(url, etag=None, last_modified=None):
+            return {"success": True, "not_modified": False, "content": "<p>x</p>"}
+
+        async def fake_render(
+            url, wait_for_selector=None, rules=None, screenshot=False
+        ):
+            flags.append(screenshot)
+            return {"success": True, "content": "<p>x</p>", "screenshot": b"png"}
+
+        fetcher = batch_tasks.BatchFetcher()
+        results = queue.Queue()
+        plan = {"strategy": "http", "sample": False, "render": True}
+
+        with (
+            patch("app.config.Config.CHECK_SCREENSHOTS", True),
+            patch.object(batch_tasks, "conditional_fetch_async", fake_conditional),
+            patch.object(batch_tasks, "fetch_url_async", fake_render),
+        ):
+            asyncio.run(fetcher.run([(_links(1)[0], plan)], results))
+
+        _, outcome = results.get_nowait()
+        assert flags == [True]
+        assert outcome["rendered"]["screenshot"] == b"png"
+
+    def test_render_wait_does_not_hold_fetch_slots(self):
+        import time
+        from app.tasks import batch_tasks
+
+        started = time.monotonic()
+        seen = {}
+
+        async def fake_conditional(url, etag=None, last_modified=None):
+            seen[url] = time.monotonic() - started
+            await asyncio.sleep(0)
+            return {"success": True, "not_modified": False, "content": "<p>x</p>"}
+
+        async def fake_render(
+            url, wait_for_selector=None, rules=None, screenshot=False
+        ):
+            await asyncio.sleep(0.2)
+            return {"success": True, "content": "<p>x</p>"}
+
+        fetcher = batch_tasks.BatchFetcher(concurrency=2, render_concurrency=1)
+        results = queue.Queue()
+        items = [
+            (_links(1, "a.test")[0], _plan("browser")),
+            (_links(1, "b.test")[0], _plan("browser")),
+            (_links(1, "c.test")[0], _plan("http")),
+        ]
+
+        with (
+            patch("app.config.Config.CONDITIONAL_GET_ENABLED", True),
+            patch.object(batch_tasks, "conditional_fetch_async", fake_conditional),
+            patch.object(batch_tasks, "fetch_url_async", fake_render),
+        ):
+            asyncio.run(fetcher.run(items, results))
+
+        assert results.qsize() == 3
+        assert seen["https://c.test/page/0"] < 0.1
+
+    def test_fetch_exception_becomes_failure(self):
+        from app.tasks import batch_tasks
+
+        async def boom(url, etag=None, last_modified=None):
+            raise RuntimeError("boom")
+
+        fetcher = batch_tasks.BatchFetcher()
+        results = queue.Queue()
+
+        with patch.object(batch_tasks, "conditional_fetch_async", boom):
+            asyncio.run(fetcher.run([(_links(1)[0], _plan("http"))], results))
+
+        _, outcome = results.get_nowait()
+        assert outcome["fetch_result"] == {"success": False, "error": "boom"}
+
+
+class TestPersistOutcome:
+    def test_settles_fetches_before_processing(self):
+        from app.tasks import batch_tasks
+
+        link = {"id": 1, "url": "https://example.com/", "content_strategy": "http"}
+        outcome = {
+            "conditional": {"success": True},
+            "plan": _plan("http", sample=True),
+            "http_result": {"success": True, "content": "a"},
+            "rendered": {"success": True, "content": "b"},
+        }
+        settled = {"success": True, "content": "a", "strategy": "http"}
+
+        with (
+            patch.object(
+                batch_tasks.FetchRouter, "settle", return_value=settled
+            ) as mock_settle,
+            patch.object(batch_tasks.CircuitBreaker, "record"),
+            patch.object(
+                batch_tasks.CheckServiceCelery, "_process_fetch_result"
+            ) as mock_process,
+        ):
+            batch_tasks._persist_outcome(link, outcome)
+
+        mock_settle.assert_called_once_with(
+            link["url"],
+            outcome["plan"],
+            outcome["http_result"],
+            outcome["rendered"],
+        )
+        mock_process.assert_called_once_with(
+            1, settled, {"success": True}, None, "http"
+        )
+
+
+class TestCheckMany:
+    def test_feeds_results_into_persist_logic(self):
+        from app.tasks import batch_tasks
+
+        links = {link["id"]: link for link in _links(3)}
+
+        async def fake_run(self, items, results):
+            for link, _ in items:
+                outcome = {
+                    "conditional": {"not_modified": link["id"] == 0},
+                    "fetch_result": {"success": link["id"] != 2, "error": "x"},
+                }
+                results.put((link, outcome))
+
+        def fake_process(
+            link_id, fetch_result, conditional, algorithm=None, content_strategy=None
+        ):
+            if not fetch_result["success"]:
+                return {"success": False, "error": "x"}
+            return {"success": True, "has_changes": True, "diff_id": 10}
+
+        with (
+            patch(
+                "app.repositories.LinkRepository.get_by_id",
+                side_effect=lambda i: links.get(i),
+            ),
+            patch.object(batch_tasks.FetchRouter, "plan", return_value=_plan("http")),
+            patch.object(batch_tasks.BatchFetcher, "run", fake_run),
+            patch.object(
+                batch_tasks.CheckServiceCelery,
+                "_record_not_modified",
+                return_value={"success": True, "has_changes": False},
+            ),
+            patch.object(
+                batch_tasks.CheckServiceCelery,
+                "_process_fetch_result",
+                side_effect=fake_process,
+            ),
+        ):
+            summary = batch_tasks.check_many([0, 1, 2, 99])
+
+        assert summary["total"] == 3
+        assert summary["unchanged"] == 1
+        assert summary["changed"] == 1
+        assert summary["failed"] == 1
+        assert summary["links"][1]["diff_id"] == 10
+
+    def test_reschedules_rate_limited_links(self):
+        from app.tasks import batch_tasks
+
+        links = {link["id"]: link for link in _links(2)}
+
+        async def fake_run(self, items, results):
+            for link, _ in items:
+                fetch_result = (
+                    {"success": False, "rate_limited": True, "retry_after": 7.0}
+                    if link["id"] == 1
+                    else {"success": True, "content": "x"}
+                )
+                results.put((link, {"conditional": {}, "fetch_result": fetch_result}))
+
+        with (
+            patch(
+                "app.repositories.LinkRepository.get_by_id",
+                side_effect=lambda i: links.get(i),
+            ),
+            patch.object(batch_tasks.FetchRouter, "plan", return_value=_plan("http")),
+            patch.object(batch_tasks.BatchFetcher, "run", fake_run),
+            patch.object(
+                batch_tasks.CheckServiceCelery,
+                "_process_fetch_result",
+                return_value={"success": True, "has_changes": False},
+            ) as mock_process,
+            patch.object(batch_tasks.check_many_task, "apply_async") as mock_apply,
+        ):
+            summary = batch_tasks.check_many([0, 1])
+
+        assert summary["deferred"] == 1
+        assert summary["unchanged"] == 1
+        assert mock_process.call_count == 1
+        mock_apply.assert_called_once_with(([1],), countdown=7.0)
+
+    def test_time_limit_cancels_running_fetches(self):
+        import threading
+        from celery.exceptions import SoftTimeLimitExceeded
+        from app.tasks import batch_tasks
+
+        links = {link["id"]: link for link in _links(1)}
+        cancelled = threading.Event()
+
+        async def fake_run(self, items, results):
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with (
+            patch(
+                "app.repositories.LinkRepository.get_by_id",
+                side_effect=lambda i: links.get(i),
+            ),
+            patch.object(batch_tasks.FetchRouter, "plan", return_value=_plan("http")),
+            patch.object(batch_tasks.BatchFetcher, "run", fake_run),
+            patch.object(batch_tasks.queue, "Queue") as mock_queue,
+            pytest.raises(SoftTimeLimitExceeded),
+        ):
+            mock_queue.return_value.get.side_effect = SoftTimeLimitExceeded()
+            batch_tasks.check_many([0])
+
+        assert cancelled.wait(timeout=5)
@@ -0,0 +1,137 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock, AsyncMock
+
+
+def _fake_browser(alive=True):
+    browser = MagicMock()
+    browser.process.poll.return_value = None if alive else 1
+    browser.process.pid = None
+    browser.version = AsyncMock(return_value="HeadlessChrome")
+    browser.close = AsyncMock()
+    context = MagicMock()
+    context.close = AsyncMock()
+    context.newPage = AsyncMock(return_value=MagicMock())
+    browser.createIncognitoBrowserContext = AsyncMock(return_value=context)
+    return browser
+
+
+def _pool(**kwargs):
+    from app.tasks.browser_pool import BrowserPool
+
+    browsers = []
+
+    async def launcher(args):
+        browser = _fake_browser()
+        browsers.append(browser)
+        return browser
+
+    return BrowserPool(launcher=launcher, **kwargs), browsers
+
+
+class TestBrowserPool:
+    def test_start_launches_warm_browsers(self):
+        pool, browsers = _pool(size=2)
+
+        asyncio.run(pool.start())
+
+        assert len(browsers) == 2
+        assert pool.stats["launched"] == 2
+
+    def test_lease_uses_incognito_context(self):
+        pool, browsers = _pool(size=1)
+
+        async def run():
+            await pool.start()
+            async with pool.lease() as context:
+                assert context is browsers[0].createIncognitoBrowserContext.return_value
+            context.close.assert_awaited_once()
+
+        asyncio.run(run())
+
+        assert pool.stats["leases"] == 1
+        assert len(browsers) == 1
+
+    def test_recycles_after_max_pages(self):
+        pool, browsers = _pool(size=1, max_pages=2, max_rss_mb=0)
+
+        async def run():
+            await pool.start()
+            for _ in range(3):
+                async with pool.page():
+                    pass
+
+        asyncio.run(run())
+
+        assert pool.stats["recycled"] == 1
+        browsers[0].close.assert_awaited_once()
+        assert len(browsers) == 2
+
+    def test_recycles_over_rss_threshold(self):
+        from app.tasks.browser_pool import PooledBrowser
+
+        pool, _ = _pool(size=1, max_pages=0, max_rss_mb=100)
+        pooled = PooledBrowser(_fake_browser())
+        pooled.rss_mb = MagicMock(return_value=512.0)
+
+        assert pool.needs_recycle(pooled) is True
+
+    def test_unhealthy_browser_replaced_on_acquire(self):
+        pool, browsers = _pool(size=1, max_rss_mb=0)
+
+        async def run():
+            await pool.start()
+            browsers[0].process.poll.return_value = 1
+            async with pool.lease():
+                pass
+
+        asyncio.run(run())
+
+        assert pool.stats["recycled"] == 1
+        assert len(browsers) == 2
+
+    def test_lease_before_start_raises(self):
+        pool, _ = _pool(size=1)
+
+        async def run():
+            async with pool.lease():
+                pass
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(run())
+
+    def test_get_pool_outside_worker_loop(self):
+        from app.tasks import browser_pool
+
+        assert browser_pool.get_pool() is None
+
+
+class TestProcessTreeRss:
+    def test_no_pid(self):
+        from app.tasks.browser_pool import _process_tree_rss_mb
+
+        assert _process_tree_rss_mb(None) == 0.0
+
+    def test_current_process(self):
+        import os
+        from app.tasks.browser_pool import _process_tree_rss_mb
+
+        if not os.path.isdir("/proc"):
+            pytest.skip("requires /proc")
+
+        assert _process_tree_rss_mb(os.getpid()) > 0
+
+
+class TestWorkerLoop:
+    def test_run_executes_on_persistent_loop(self):
+        from app.tasks import worker_loop
+
+        async def current_loop():
+            assert worker_loop.is_current()
+            return asyncio.get_running_loop()
+
+        first = worker_loop.run(current_loop(), timeout=5)
+        second = worker_loop.run(current_loop(), timeout=5)
+
+        assert first is second
+        worker_loop.stop()
@@ -2,6 +2,26 @@ import pytest
 from unittest.mock import MagicMock, patch, AsyncMock
 
 
+@pytest.fixture
+def offline_fetch():
+    from app.services.check_service import CheckService
+    from app.services.fetch_router import FetchRouter
+
+    with (
+        patch.object(FetchRouter, "_stats", return_value=None),
+        patch.object(
+            CheckService,
+            "_fetch_url_plain",
+            return_value={"success": False, "error": "disabled in tests"},
+        ),
+        patch(
+            "app.tasks.screenshot_tasks.fetch_url_sync",
+            return_value={"success": False, "error": "disabled in tests"},
+        ),
+    ):
+        yield
+
+
 class TestCheckService:
     def test_compute_diff(self):
         from app.services.check_service import CheckService
@@ -98,15 +118,12 @@ class TestCheckService:
 
     def test_generate_body_diff(self):
         from app.services.check_service import CheckService
-        from bs4 import BeautifulSoup
-
-        old_soup = BeautifulSoup("<body><p>Old content</p></body>", "html.parser")
-        new_soup = BeautifulSoup("<body><p>New content</p></body>", "html.parser")
+        from app.utils.parsed_snapshot import ParsedSnapshot
 
-        old_body = old_soup.find("body")
-        new_body = new_soup.find("body")
+        old = ParsedSnapshot("<body><p>Old content</p></body>")
+        new = ParsedSnapshot("<body><p>New content</p></body>")
 
-        result = CheckService._generate_body_diff(old_body, new_body, "")
+        result = CheckService._generate_body_diff(old, new, "")
 
         assert result is not None
         assert "diff-added" in result or "diff-removed" in result
@@ -160,27 +177,26 @@ class TestCheckService:
 
     def test_extract_images(self):
         from app.services.check_service import CheckService
-        from bs4 import BeautifulSoup
+        from app.utils.parsed_snapshot import ParsedSnapshot
 
-        soup = BeautifulSoup(
-            '<html><body><img src="/image.png" alt="test"></body></html>',
-            "html.parser",
+        snapshot = ParsedSnapshot(
+            '<html><body><img src="/image.png" alt="test"></body></html>'
         )
 
-        result = CheckService._extract_images(soup, "https://example.com")
+        result = CheckService._extract_images(snapshot, "https://example.com")
 
         assert len(result) == 1
         assert result[0]["src"] == "https://example.com/image.png"
 
     def test_extract_images_data_src(self):
         from app.services.check_service import CheckService
-        from bs4 import BeautifulSoup
+        from app.utils.parsed_snapshot import ParsedSnapshot
 
-        soup = BeautifulSoup(
-            '<html><body><img data-src="/lazy.png"></body></html>', "html.parser"
+        snapshot = ParsedSnapshot(
+            '<html><body><img data-src="/lazy.png"></body></html>'
         )
 
-        result = CheckService._extract_images(soup, "https://example.com")
+        result = CheckService._extract_images(snapshot, "https://example.com")
 
         assert len(result) == 1
 
@@ -210,15 +226,12 @@ class TestCheckService:
 
     def test_generate_paragraph_diff(self):
         from app.services.check_service import CheckService
-        from bs4 import BeautifulSoup
+        from app.utils.parsed_snapshot import ParsedSnapshot
 
-        old_soup = BeautifulSoup("<body><p>Old</p></body>", "html.parser")
-        new_soup = BeautifulSoup("<body><p>New</p></body>", "html.parser")
+        old = ParsedSnapshot("<body><p>Old</p></body>")
+        new = ParsedSnapshot("<body><p>New</p></body>")
 
-        old_body = old_soup.find("body")
-        new_body = new_soup.find("body")
-
-        result = CheckService._generate_paragraph_diff(old_body, new_body, None)
+        result = CheckService._generate_paragraph_diff(old, new, None)
 
         assert result is not None
         assert "<!DOCTYPE html>" in result
@@ -281,6 +294,7 @@ class TestCheckServiceLink:
             assert "error" in result
 
 
+@pytest.mark.usefixtures("offline_fetch")
 class TestCheckServiceFetchUrl:
     def test_fetch_url_with_pyppeteer_success(self):
         from app.services.check_service import CheckService
@@ -305,7 +319,9 @@ class TestCheckServiceFetchUrl:
         ):
             mock_pyppeteer.return_value = {"success": False, "error": "fail"}
             mock_response = MagicMock()
-            mock_response.text = "<html>Test</html>"
+            mock_response.headers = {"Content-Type": "text/html"}
+            mock_response.iter_content.return_value = [b"<html>Test</html>"]
+            mock_response.__enter__.return_value = mock_response
             mock_response.raise_for_status = MagicMock()
             mock_get.return_value = mock_response
 
@@ -328,6 +344,7 @@ class TestCheckServiceFetchUrl:
             assert result["success"] is False
 
 
+@pytest.mark.usefixtures("offline_fetch")
 class TestCheckServiceFetch:
     def test_fetch_url_requests(self):
         from app.services.check_service import CheckService
@@ -340,7 +357,9 @@ class TestCheckServiceFetch:
         ):
             mock_pyppeteer.return_value = {"success": False, "error": "fail"}
             mock_response = MagicMock()
-            mock_response.text = "<html>Test</html>"
+            mock_response.headers = {"Content-Type": "text/html"}
+            mock_response.iter_content.return_value = [b"<html>Test</html>"]
+            mock_response.__enter__.return_value = mock_response
             mock_response.raise_for_status = MagicMock()
             mock_get.return_value = mock_response
 
@@ -364,3 +383,49 @@ class TestCheckServiceFetch:
             result = CheckService._fetch_url("https://example.com")
 
             assert result["success"] is False
+
+
+class TestCheckServiceNonBlocking:
+    def test_rendered_fetch_runs_in_process(self):
+        from app.services.check_service import CheckService
+
+        with (
+            patch(
+                "app.tasks.screenshot_tasks.fetch_url_sync",
+                return_value={"success": True, "content": "<html>Rendered</html>"},
+            ) as mock_render,
+            patch("app.tasks.fetch_url.delay") as mock_delay,
+        ):
+            result = CheckService._fetch_url_rendered("https://example.com")
+
+            assert result["content"] == "<html>Rendered</html>"
+            mock_render.assert_called_once_with(
+                "https://example.com", None, None, False
+            )
+            mock_delay.assert_not_called()
+
+    def test_screenshot_runs_in_process(self):
+        from app.services.check_service import CheckService
+
+        with patch(
+            "app.tasks.screenshot_tasks.take_screenshot_sync",
+            return_value="/tmp/shot.png",
+        ) as mock_shot:
+            result = CheckService._take_screenshot(
+                "https://example.com", "/tmp/shot.png"
+            )
+
+            assert result == "/tmp/shot.png"
+            mock_shot.assert_called_once_with("https://example.com", "/tmp/shot.png")
+
+    def test_screenshot_failure_returns_none(self):
+        from app.services.check_service import CheckService
+
+        with patch(
+            "app.tasks.screenshot_tasks.take_screenshot_sync",
+            side_effect=RuntimeError("no browser"),
+        ):
+            assert (
+                CheckService._take_screenshot("https://example.com", "/tmp/x.png")
+                is None
+            )
@@ -0,0 +1,552 @@
+from unittest.mock import ANY, patch
+
+
+class TestConditionalCheck:
+    def test_not_modified_skips_render(self):
+        from app.tasks import check_tasks
+
+        link = {"id": 1, "url": "https://example.com", "etag": '"v1"'}
+
+        with (
+            patch("app.repositories.LinkRepository.get_by_id", return_value=link),
+            patch("app.repositories.LinkRepository.update") as mock_update,
+            patch("app.repositories.CheckEventRepository.create") as mock_event,
+            patch(
+                "app.tasks.http_fetch.conditional_fetch_sync",
+                return_value={"success": True, "not_modified": True},
+            ),
+            patch.object(check_tasks, "fetch_url_sync") as mock_fetch,
+            patch("app.repositories.DiffRepository.create") as mock_diff,
+        ):
+            result = check_tasks.check_link_task.run(1)
+
+            assert result["success"] is True
+            assert result["not_modified"] is True
+            assert result["has_changes"] is False
+            mock_fetch.assert_not_called()
+            mock_diff.assert_not_called()
+            mock_event.assert_called_once_with(1, "not_modified", detail="HTTP 304")
+            assert mock_update.call_args.kwargs["last_error"] is None
+
+    def test_conditional_disabled(self):
+        from app.tasks.check_tasks import CheckServiceCelery
+
+        with (
+            patch("app.config.Config.CONDITIONAL_GET_ENABLED", False),
+            patch("app.tasks.http_fetch.conditional_fetch_sync") as mock_fetch,
+        ):
+            result = CheckServiceCelery._conditional_fetch(
+                {"url": "https://example.com"}
+            )
+
+            assert result["not_modified"] is False
+            mock_fetch.assert_not_called()
+
+    def test_browser_route_skips_http_without_sample(self):
+        from app.tasks.check_tasks import CheckServiceCelery
+
+        with (
+            patch(
+                "app.services.fetch_router.FetchRouter.is_static", return_value=False
+            ),
+            patch(
+                "app.services.fetch_router.FetchRouter.needs_sample", return_value=False
+            ),
+            patch("app.tasks.http_fetch.conditional_fetch_sync") as mock_fetch,
+        ):
+            result = CheckServiceCelery._conditional_fetch(
+                {"url": "https://example.com", "etag": '"v1"'}
+            )
+
+            assert result == {"success": False, "not_modified": False}
+            mock_fetch.assert_not_called()
+
+    def test_browser_route_samples_unconditionally(self):
+        from app.tasks.check_tasks import CheckServiceCelery
+
+        with (
+            patch(
+                "app.services.fetch_router.FetchRouter.is_static", return_value=False
+            ),
+            patch(
+                "app.services.fetch_router.FetchRouter.needs_sample", return_value=True
+            ),
+            patch(
+                "app.tasks.http_fetch.conditional_fetch_sync",
+                return_value={"success": True, "not_modified": False},
+            ) as mock_fetch,
+        ):
+            CheckServiceCelery._conditional_fetch(
+                {"url": "https://example.com", "etag": '"v1"'}
+            )
+
+            mock_fetch.assert_called_once_with("https://example.com")
+
+    def test_store_validators(self):
+        from app.tasks.check_tasks import CheckServiceCelery
+
+        with patch("app.repositories.LinkRepository.update") as mock_update:
+            CheckServiceCelery._store_validators(
+                1, {"success": True, "etag": '"v2"', "last_modified": None}
+            )
+
+            mock_update.assert_called_once_with(1, etag='"v2"', last_modified=None)
+
+    def test_store_validators_skipped_on_failure(self):
+        from app.tasks.check_tasks import CheckServiceCelery
+
+        with patch("app.repositories.LinkRepository.update") as mock_update:
+            CheckServiceCelery._store_validators(1, {"success": False})
+
+            mock_update.assert_not_called()
+
+
+class TestUnchangedShortCircuit:
+    def test_matching_hash_skips_pipeline(self):
+        from app.tasks.check_tasks import CheckServiceCelery
+        from app.utils.diff_utils import normalized_hash
+
+        fetch_result = {"success": True, "content": "<p>same</p>\n"}
+
+        with (
+            patch(
+                "app.repositories.DiffRepository.get_latest_hash",
+                return_value=normalized_hash("<p>same</p>"),
+            ),
+            patch("app.repositories.LinkRepository.update") as mock_update,
+            patch("app.repositories.CheckEventRepository.create") as mock_event,
+            patch("app.repositories.DiffRepository.create") as mock_diff,
+            patch.object(CheckServiceCelery, "_extract_price") as mock_price,
+            patch(
+                "app.services.check_service.CheckService._generate_summary"
+            ) as mock_summary,
+        ):
+            result = CheckServiceCelery._process_fetch_result(
+                1, fetch_result, {"success": False}
+            )
+
+            assert result["success"] is True
+            assert result["unchanged"] is True
+            assert result["has_changes"] is False
+            mock_diff.assert_not_called()
+            mock_price.assert_not_called()
+            mock_summary.assert_not_called()
+            assert mock_event.call_args.args == (1, "unchanged")
+            assert mock_update.call_args.kwargs["last_error"] is None
+
+    def test_streamed_hash_reused(self):
+        from app.tasks.check_tasks import CheckServiceCelery
+
+        fetch_result = {"success": True, "content": "<p>same</p>", "content_hash": "h"}
+
+        with (
+            patch("app.repositories.DiffRepository.get_latest_hash", return_value="h"),
+            patch("app.tasks.check_tasks.normalized_hash") as mock_hash,
+            patch.object(CheckServiceCelery, "_record_unchanged") as mock_unchanged,
+        ):
+            CheckServiceCelery._process_fetch_result(
+                1, fetch_result, {"success": False}
+            )
+
+            mock_hash.assert_not_called()
+            assert mock_unchanged.call_args.args[1] == "h"
+
+    def test_different_hash_creates_diff(self):
+        from app.tasks.check_tasks import CheckServiceCelery
+
+        with (
+            patch(
+                "app.repositories.DiffRepository.get_latest_hash", return_value="old"
+            ),
+            patch.object(
+                CheckServiceCelery,
+                "_update_link_and_create_records",
+                return_value={"success": True, "has_changes": True},
+            ) as mock_records,
+            patch(
+                "app.repositories.InitialPageRepository.get_by_link", return_value=None
+            ),
+            patch("app.repositories.DiffRepository.get_latest", return_value=None),
+            patch("app.repositories.CheckEventRepository.create"),
+        ):
+            CheckServiceCelery._process_fetch_result(
+                1, {"success": True, "content": "<p>new</p>"}, {"success": False}
+            )
+
+            mock_records.assert_called_once()
+
+    def test_diff_computed_once(self):
+        from app.tasks.check_tasks import CheckServiceCelery
+
+        initial = {"id": 3, "full_content": "<p>old</p>"}
+        with (
+            patch(
+                "app.repositories.DiffRepository.get_latest_hash", return_value="old"
+            ),
+            patch(
+                "app.repositories.InitialPageRepository.get_by_link",
+                return_value=initial,
+            ),
+            patch("app.repositories.DiffRepository.get_latest", return_value=None),
+            patch.object(
+                CheckServiceCelery, "_compute_diff", return_value="-old\n+new"
+            ) as mock_diff,
+            patch(
+                "app.services.check_service.CheckService._generate_summary",
+                return_value="changed",
+            ),
+            patch(
+                "app.repositories.DiffRepository.create", return_value={"id": 9}
+            ) as mock_create,
+            patch.object(CheckServiceCelery, "_attach_screenshot"),
+            patch.object(CheckServiceCelery, "_attach_artifacts"),
+            patch("app.repositories.LinkRepository.update"),
+            patch("app.repositories.CheckEventRepository.create"),
+        ):
+            result = CheckServiceCelery._process_fetch_result(
+                1, {"success": True, "content": "<p>new</p>"}, {"success": False}
+            )
+
+            mock_diff.assert_called_once()
+            assert mock_create.call_args.args[4] == "-old\n+new"
+            assert result["has_changes"] is True
+
+
+class TestStrategyRebaseline:
+    def test_strategy_switch_rebaselines_without_diff(self):
+        from app.tasks.check_tasks import CheckServiceCelery
+
+        fetch_result = {"success": True, "content": "<p>x</p>", "strategy": "http"}
+
+        with (
+            patch(
+                "app.repositories.DiffRepository.get_latest_hash", return_value="old"
+            ),
+            patch(
+                "app.repositories.InitialPageRepository.get_by_link",
+                return_value={"id": 1, "full_content": "<p>old</p>"},
+            ),
+            patch("app.repositories.DiffRepository.get_latest", return_value={"id": 4}),
+            patch("app.repositories.LinkRepository.update") as mock_update,
+            patch("app.repositories.CheckEventRepository.create") as mock_event,
+            patch(
+                "app.repositories.DiffRepository.create", return_value={"id": 5}
+            ) as mock_diff,
+            patch(
+                "app.services.check_service.CheckService._generate_summary"
+            ) as mock_summary,
+        ):
+            result = CheckServiceCelery._process_fetch_result(
+                1, fetch_result, {"success": False}, None, "browser"
+            )
+
+            assert result["rebaselined"] is True
+            assert result["has_changes"] is False
+            assert result["diff_id"] == 5
+            args, kwargs = mock_diff.call_args
+            assert args[:3] == (1, 4, "<p>x</p>")
+            assert kwargs["is_baseline"] is True
+            assert "diff_content" not in kwargs
+            mock_summary.assert_not_called()
+            assert mock_event.call_args.args == (1, "rebaselined")
+            assert mock_update.call_args.kwargs["content_strategy"] == "http"
+
+    def test_diffs_against_latest_baseline(self):
+        from app.tasks.check_tasks import CheckServiceCelery
+
+        fetch_result = {"success": True, "content": "<p>new</p>", "strategy": "http"}
+
+        with (
+            patch(
+                "app.repositories.DiffRepository.get_latest_hash", return_value="old"
+            ),
+            patch(
+                "app.repositories.InitialPageRepository.get_by_link",
+                return_value={"id": 1, "full_content": "<div>rendered</div>"},
+            ),
+            patch("app.repositories.DiffRepository.get_latest", return_value={"id": 4}),
+            patch(
+                "app.repositories.DiffRepository.get_baseline",
+                return_value={"id": 3, "full_content": "<p>old</p>"},
+            ),
+            patch.object(
+                CheckServiceCelery, "_compute_diff", return_value="-old\n+new"
+            ) as mock_compute,
+            patch.object(
+                CheckServiceCelery,
+                "_update_link_and_create_records",
+                return_value={"success": True, "has_changes": True},
+            ),
+            patch(
+                "app.services.check_service.CheckService._generate_summary",
+                return_value="changed",
+            ),
+            patch("app.repositories.CheckEventRepository.create"),
+        ):
+            CheckServiceCelery._process_fetch_result(
+                1, fetch_result, {"success": False}, None, "http"
+            )
+
+            assert mock_compute.call_args.args[:2] == ("<p>old</p>", "<p>new</p>")
+
+    def test_same_strategy_diffs_normally(self):
+        from app.tasks.check_tasks import CheckServiceCelery
+
+        fetch_result = {"success": True, "content": "<p>x</p>", "strategy": "http"}
+
+        with (
+            patch(
+                "app.repositories.DiffRepository.get_latest_hash", return_value="old"
+            ),
+            patch.object(CheckServiceCelery, "_record_rebaseline") as mock_rebaseline,
+            patch.object(
+                CheckServiceCelery,
+                "_update_link_and_create_records",
+                return_value={"success": True, "has_changes": True},
+            ) as mock_records,
+            patch(
+                "app.repositories.InitialPageRepository.get_by_link", return_value=None
+            ),
+            patch("app.repositories.DiffRepository.get_latest", return_value=None),
+            patch("app.repositories.CheckEventRepository.create"),
+        ):
+            CheckServiceCelery._process_fetch_result(
+                1, fetch_result, {"success": False}, None, "http"
+            )
+
+            mock_rebaseline.assert_not_called()
+            assert mock_records.call_args.kwargs["strategy"] == "http"
+
+    def test_unknown_previous_strategy_is_not_a_switch(self):
+        from app.tasks.check_tasks import CheckServiceCelery
+
+        assert not CheckServiceCelery._is_rebaseline(None, {"strategy": "http"})
+        assert not CheckServiceCelery._is_rebaseline("http", {})
+
+
+class TestCheckEventTelemetry:
+    def test_records_readiness_timings(self):
+        import json
+        from app.tasks.check_tasks import CheckServiceCelery
+
+        timings = {"navigate_ms": 310, "ready_ms": 540, "ready_reason": "quiet"}
+
+        with patch("app.repositories.CheckEventRepository.create") as mock_event:
+            CheckServiceCelery._record_check_event(
+                1,
+                {"success": True, "has_changes": True, "is_initial": False},
+                "abc",
+                {"success": True, "content": "x", "timings": timings},
+            )
+
+            args, kwargs = mock_event.call_args
+            assert args == (1, "changed")
+            assert kwargs["content_hash"] == "abc"
+            assert json.loads(kwargs["detail"]) == timings
+
+    def test_initial_without_timings(self):
+        from app.tasks.check_tasks import CheckServiceCelery
+
+        with patch("app.repositories.CheckEventRepository.create") as mock_event:
+            CheckServiceCelery._record_check_event(
+                1, {"success": True, "is_initial": True}, "abc", {"success": True}
+            )
+
+            assert mock_event.call_args.args == (1, "initial")
+            assert mock_event.call_args.kwargs["detail"] is None
+
+
+class TestScreenshotAttachment:
+    def test_stores_capture_bytes_on_diff(self, tmp_path):
+        import io
+        from app.tasks import check_tasks
+
+        from PIL import Image
+
+        buffer = io.BytesIO()
+        Image.new("RGB", (1920, 1200), "white").save(buffer, "PNG")
+
+        with (
+            patch.object(check_tasks, "SCREENSHOT_DIR", str(tmp_path)),
+            patch("app.repositories.DiffRepository.update_screenshot") as mock_update,
+        ):
+            filename = check_tasks.CheckServiceCelery._attach_screenshot(
+                1, buffer.getvalue(), None, {"id": 7}
+            )
+
+        assert filename.endswith(".json")
+        assert (tmp_path / filename).exists()
+        assert (tmp_path / filename.replace(".json", ".thumb.webp")).exists()
+        assert not list(tmp_path.glob("temp_*"))
+        mock_update.assert_called_once_with(7, filename, ANY)
+
+    def test_visual_diff_against_previous_diff(self, tmp_path):
+        from app.tasks import check_tasks
+
+        result = {"changed_percent": 4.5, "regions": [], "heatmap": "ab/ab.png"}
+        with (
+            patch.object(check_tasks, "visual_diff", return_value=result) as mock_diff,
+            patch("app.repositories.DiffRepository.update_visual_diff") as mock_update,
+        ):
+            check_tasks.CheckServiceCelery._attach_visual_diff(
+                7, {"id": 6, "screenshot": "cd/cd.webp"}, "ef/ef.webp"
+            )
+
+        mock_diff.assert_called_once_with(
+            "cd/cd.webp", "ef/ef.webp", check_tasks.SCREENSHOT_DIR
+        )
+        mock_update.assert_called_once_with(7, 4.5, [], "ab/ab.png")
+
+    def test_similar_capture_reuses_previous_screenshot(self, tmp_path):
+        from app.tasks import check_tasks
+
+        previous = {"id": 6, "screenshot": "cd/cd.webp", "screenshot_hash": "1x2:0"}
+        stored = {"filename": None, "hash": "1x2:0", "similar": True}
+
+        with (
+            patch("app.repositories.DiffRepository.get_by_id", return_value=previous),
+            patch.object(
+                check_tasks, "store_screenshot", return_value=stored
+            ) as mock_store,
+            patch("app.repositories.DiffRepository.update_screenshot") as mock_update,
+            patch("app.repositories.DiffRepository.update_visual_diff") as mock_visual,
+            patch.object(check_tasks, "visual_diff") as mock_diff,
+        ):
+            filename = check_tasks.CheckServiceCelery._attach_screenshot(
+                1, b"png", None, {"id": 7, "previous_diff_id": 6}
+            )
+
+        assert filename == "cd/cd.webp"
+        mock_store.assert_called_once_with(b"png", check_tasks.SCREENSHOT_DIR, "1x2:0")
+        mock_update.assert_called_once_with(7, "cd/cd.webp", "1x2:0")
+        mock_visual.assert_called_once_with(7, 0.0, [], None)
+        mock_diff.assert_not_called()
+
+    def test_missing_capture_ignored(self):
+        from app.tasks import check_tasks
+
+        with patch.object(check_tasks, "store_screenshot") as mock_store:
+            filename = check_tasks.CheckServiceCelery._attach_screenshot(
+                1, None, {"id": 3}, None
+            )
+
+        assert filename is None
+        mock_store.assert_not_called()
+
+    def test_task_renders_once_when_screenshots_enabled(self):
+        from datetime import datetime
+        from app.tasks import check_tasks
+
+        link = {"id": 1, "url": "https://example.com"}
+        rendered = {
+            "success": True,
+            "content": "<html></html>",
+            "screenshot": b"png",
+        }
+
+        with (
+            patch("app.config.Config.CHECK_SCREENSHOTS", True),
+            patch("app.repositories.LinkRepository.get_by_id", return_value=link),
+            patch.object(
+                check_tasks.CheckServiceCelery,
+                "_conditional_fetch",
+                return_value={"success": False, "not_modified": False},
+            ),
+            patch.object(
+                check_tasks, "fetch_url_sync", return_value=rendered
+            ) as mock_render,
+            patch(
+                "app.services.fetch_router.FetchRouter._stats",
+                return_value={
+                    "strategy": "http",
+                    "validated_at": datetime.utcnow().isoformat(),
+                },
+            ),
+            patch(
+                "app.services.check_service.CheckService._fetch_url_plain",
+                return_value={"success": True, "content": "<p>static</p>"},
+            ),
+            patch("app.repositories.FetchStrategyRepository.increment_checks"),
+            patch.object(
+                check_tasks.CheckServiceCelery,
+                "_process_fetch_result",
+                return_value={"success": True},
+            ) as mock_process,
+        ):
+            check_tasks.check_link_task.run(1)
+
+        mock_render.assert_called_once()
+        assert mock_render.call_args.args[3] is True
+        fetch_result = mock_process.call_args.args[1]
+        assert fetch_result["content"] == "<p>static</p>"
+        assert fetch_result["screenshot"] == b"png"
+
+
+class TestDiffArtifacts:
+    def test_precomputes_views_for_new_diff(self):
+        from app.tasks import check_tasks
+        from app.services.check_service import CheckService
+        from app.services.diff_cache import DiffCache
+
+        previous = {"id": 6, "full_content": "<html><body><p>Old</p></body></html>"}
+        diff_record = {
+            "id": 7,
+            "previous_diff_id": 6,
+            "full_content": "<html><body><p>New</p></body></html>",
+            "diff_content": "-Old\n+New",
+        }
+        link = {"id": 1, "url": "https://example.com", "diff_algorithm": "myers"}
+
+        with (
+            patch("app.config.Config.DIFF_PRECOMPUTE_ENABLED", True),
+            patch("app.repositories.DiffRepository.get_by_id", return_value=previous),
+            patch("app.repositories.LinkRepository.get_by_id", return_value=link),
+            patch.object(
+                CheckService, "_compute_html_diff", return_value="<html>diff</html>"
+            ) as mock_html,
+            patch("app.repositories.DiffArtifactRepository.save") as mock_save,
+        ):
+            check_tasks.CheckServiceCelery._attach_artifacts(1, diff_record)
+
+        mock_html.assert_called_once_with(
+            previous["full_content"],
+            diff_record["full_content"],
+            "https://example.com",
+            "myers",
+        )
+        diff_id, artifacts, keys = mock_save.call_args[0]
+        assert diff_id == 7
+        assert set(artifacts) == {"price", "html", "paragraph", "code", "images"}
+        assert artifacts["html"] == "<html>diff</html>"
+        assert keys == DiffCache.keys(previous, diff_record, link, list(artifacts))
+
+    def test_skips_diff_without_changes(self):
+        from app.tasks import check_tasks
+
+        with (
+            patch("app.config.Config.DIFF_PRECOMPUTE_ENABLED", True),
+            patch("app.repositories.DiffArtifactRepository.save") as mock_save,
+        ):
+            check_tasks.CheckServiceCelery._attach_artifacts(
+                1, {"id": 7, "diff_content": None}
+            )
+            check_tasks.CheckServiceCelery._attach_artifacts(1, None)
+
+        mock_save.assert_not_called()
+
+    def test_render_failure_does_not_fail_check(self):
+        from app.tasks import check_tasks
+
+        with (
+            patch("app.config.Config.DIFF_PRECOMPUTE_ENABLED", True),
+            patch(
+                "app.repositories.InitialPageRepository.get_by_link",
+                side_effect=Exception("db locked"),
+            ),
+            patch("app.repositories.DiffArtifactRepository.save") as mock_save,
+        ):
+            check_tasks.CheckServiceCelery._attach_artifacts(
+                1, {"id": 7, "diff_content": "+New"}
+            )
+
+        mock_save.assert_not_called()
@@ -0,0 +1,242 @@
+import ssl
+import socket
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+
+class FakeCircuits:
+    def __init__(self):
+        self.rows = {}
+
+    def get_by_domain(self, domain):
+        row = self.rows.get(domain)
+        if not row:
+            return None
+        return {
+            **row,
+            "open_until": row["open_until"].isoformat() if row["open_until"] else None,
+        }
+
+    def save(self, domain, **kwargs):
+        row = self.rows.setdefault(
+            domain,
+            {
+                "state": "closed",
+                "failures": 0,
+                "trips": 0,
+                "last_error_class": None,
+                "open_until": None,
+                "probe_started_at": None,
+            },
+        )
+        row.update(kwargs)
+        return row
+
+    def claim_probe(self, domain, now, stale_before):
+        row = self.rows[domain]
+        probe = row["probe_started_at"]
+        if row["open_until"] <= now and (probe is None or probe < stale_before):
+            row.update(state="half_open", probe_started_at=now)
+            return True
+        return False
+
+
+@pytest.fixture
+def circuits():
+    from app.repositories import DomainCircuitRepository
+
+    fake = FakeCircuits()
+    with (
+        patch("app.config.Config.CIRCUIT_BREAKER_ENABLED", True),
+        patch("app.config.Config.CIRCUIT_FAILURE_THRESHOLD", 2),
+        patch("app.config.Config.CIRCUIT_BASE_BACKOFF", 60),
+        patch.object(DomainCircuitRepository, "get_by_domain", fake.get_by_domain),
+        patch.object(DomainCircuitRepository, "save", fake.save),
+        patch.object(DomainCircuitRepository, "claim_probe", fake.claim_probe),
+    ):
+        yield fake
+
+
+URL = "https://down.example.com/page"
+DOWN = {"success": False, "error": "net::ERR_NAME_NOT_RESOLVED at " + URL}
+
+
+class TestClassification:
+    @pytest.mark.parametrize(
+        "message,expected",
+        [
+            ("net::ERR_NAME_NOT_RESOLVED at https://x", "dns"),
+            (
+                "Cannot connect to host x:443 ssl:default [Name or service not known]",
+                "dns",
+            ),
+            ("net::ERR_CERT_AUTHORITY_INVALID at https://x", "tls"),
+            ("[SSL: CERTIFICATE_VERIFY_FAILED] certificate verify failed", "tls"),
+            ("Navigation Timeout Exceeded: 30000 ms exceeded.", "timeout"),
+            ("net::ERR_CONNECTION_REFUSED at https://x", "connection"),
+            ("404 Client Error: Not Found for url: https://x", "http_4xx"),
+            ("503, message='Service Unavailable', url='https://x'", "http_5xx"),
+            ("Binary content (image/png)", "other"),
+        ],
+    )
+    def test_messages(self, message, expected):
+        from app.services.circuit_breaker import classify_message
+
+        assert classify_message(message) == expected
+
+    def test_exception_chain(self):
+        from app.services.circuit_breaker import classify_exception
+
+        try:
+            try:
+                raise socket.gaierror(-2, "Name or service not known")
+            except OSError as e:
+                raise RuntimeError("wrapped") from e
+        except RuntimeError as e:
+            assert classify_exception(e) == "dns"
+
+        assert classify_exception(ssl.SSLError("bad handshake")) == "tls"
+        assert classify_exception(TimeoutError()) == "timeout"
+        assert classify_exception(ConnectionRefusedError()) == "connection"
+
+    def test_status_takes_priority(self):
+        from app.services.circuit_breaker import classify_result
+
+        assert classify_result({"success": False, "error": "x", "status": 502}) == (
+            "http_5xx"
+        )
+        assert classify_result({"success": True}) is None
+
+    def test_failure_result_names_silent_errors(self):
+        from app.services.circuit_breaker import failure_result
+
+        result = failure_result(TimeoutError())
+        assert result == {
+            "success": False,
+            "error": "TimeoutError",
+            "error_class": "timeout",
+        }
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold(self, circuits):
+        from app.services.circuit_breaker import CircuitBreaker
+
+        assert CircuitBreaker.record(URL, DOWN) == "dns"
+        assert CircuitBreaker.before_fetch(URL) is None
+
+        CircuitBreaker.record(URL, DOWN)
+        blocked = CircuitBreaker.before_fetch(URL)
+
+        assert blocked["circuit_open"] is True
+        assert blocked["error_class"] == "dns"
+        assert 30 <= blocked["retry_after"] <= 60
+
+    def test_client_errors_do_not_trip(self, circuits):
+        from app.services.circuit_breaker import CircuitBreaker
+
+        gone = {"success": False, "error": "404 Client Error: Not Found"}
+        for _ in range(5):
+            assert CircuitBreaker.record(URL, gone) == "http_4xx"
+
+        assert CircuitBreaker.before_fetch(URL) is None
+        assert "down.example.com" not in circuits.rows
+
+    def test_half_open_allows_single_probe(self, circuits):
+        from app.services.circuit_breaker import CircuitBreaker
+
+        CircuitBreaker.record(URL, DOWN)
+        CircuitBreaker.record(URL, DOWN)
+        circuits.rows["down.example.com"]["open_until"] = datetime.utcnow()
+
+        assert CircuitBreaker.before_fetch(URL) is None
+        assert circuits.rows["down.example.com"]["state"] == "half_open"
+        assert CircuitBreaker.before_fetch(URL)["circuit_open"] is True
+
+    def test_failed_probe_reopens_with_longer_backoff(self, circuits):
+        from app.services.circuit_breaker import CircuitBreaker
+
+        CircuitBreaker.record(URL, DOWN)
+        CircuitBreaker.record(URL, DOWN)
+        row = circuits.rows["down.example.com"]
+        row["open_until"] = datetime.utcnow()
+        CircuitBreaker.before_fetch(URL)
+
+        CircuitBreaker.record(URL, DOWN)
+
+        assert row["state"] == "open"
+        assert row["trips"] == 2
+        assert row["open_until"] - datetime.utcnow() >= timedelta(seconds=59)
+
+    def test_successful_probe_closes(self, circuits):
+        from app.services.circuit_breaker import CircuitBreaker
+
+        CircuitBreaker.record(URL, DOWN)
+        CircuitBreaker.record(URL, DOWN)
+        circuits.rows["down.example.com"]["open_until"] = datetime.utcnow()
+        CircuitBreaker.before_fetch(URL)
+
+        CircuitBreaker.record(URL, {"success": True, "content": "<html></html>"})
+
+        row = circuits.rows["down.example.com"]
+        assert row["state"] == "closed"
+        assert row["failures"] == 0
+        assert CircuitBreaker.before_fetch(URL) is None
+
+    def test_rate_limited_results_ignored(self, circuits):
+        from app.services.circuit_breaker import CircuitBreaker
+
+        for _ in range(3):
+            CircuitBreaker.record(
+                URL, {"success": False, "error": "busy", "rate_limited": True}
+            )
+
+        assert circuits.rows == {}
+
+
+class TestShortCircuitedChecks:
+    def test_task_skips_open_domain(self):
+        from app.tasks import check_tasks
+
+        blocked = {
+            "success": False,
+            "error": "Circuit open for down.example.com (dns), next probe in 60s",
+            "error_class": "dns",
+            "circuit_open": True,
+            "retry_after": 60,
+        }
+
+        with (
+            patch(
+                "app.repositories.LinkRepository.get_by_id",
+                return_value={"id": 1, "url": URL},
+            ),
+            patch.object(
+                check_tasks.CircuitBreaker, "before_fetch", return_value=blocked
+            ),
+            patch.object(check_tasks.CheckServiceCelery, "_conditional_fetch") as cond,
+            patch("app.repositories.LinkRepository.update") as mock_update,
+        ):
+            result = check_tasks.check_link_task.run(1)
+
+        assert result["circuit_open"] is True
+        assert result["error_class"] == "dns"
+        cond.assert_not_called()
+        mock_update.assert_called_once_with(
+            1, last_error=blocked["error"], last_error_class="dns"
+        )
+
+    def test_unreachable_render_skips_fallbacks(self):
+        from app.services.check_service import CheckService
+
+        with (
+            patch("app.tasks.screenshot_tasks.fetch_url_sync", return_value=DOWN),
+            patch.object(CheckService, "_fetch_url_with_pyppeteer") as fallback,
+            patch("app.tasks.http_fetch.fetch_sync") as plain,
+        ):
+            result = CheckService._fetch_url_rendered(URL)
+
+        assert result is DOWN
+        fallback.assert_not_called()
+        plain.assert_not_called()
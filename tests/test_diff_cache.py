@@ -0,0 +1,257 @@
+import pytest
+from unittest.mock import MagicMock, patch
+
+
+@pytest.fixture
+def diff_cache():
+    from app.services.diff_cache import reset_diff_cache
+
+    reset_diff_cache()
+    with patch("app.config.Config.DIFF_CACHE_ENABLED", True):
+        yield
+    reset_diff_cache()
+
+
+class TestMemoryLRU:
+    def test_evicts_least_recently_used(self):
+        from app.services.diff_cache import MemoryLRU
+
+        cache = MemoryLRU(10)
+        cache.put("a", "aaaa")
+        cache.put("b", "bbbb")
+        cache.get("a")
+        cache.put("c", "cccc")
+
+        assert cache.get("a") == "aaaa"
+        assert cache.get("b") is None
+        assert cache.get("c") == "cccc"
+        assert cache.size == 8
+
+    def test_oversized_value_not_kept(self):
+        from app.services.diff_cache import MemoryLRU
+
+        cache = MemoryLRU(4)
+        cache.put("a", "too long")
+
+        assert cache.get("a") is None
+        assert cache.size == 0
+
+
+class TestDiffCacheKey:
+    def test_key_covers_mode_algorithm_and_hashes(self):
+        from app.services.diff_cache import DiffCache
+
+        key = DiffCache.key("old", "new", "html", "myers", "https://example.com")
+
+        assert len(key) == 64
+        assert key == DiffCache.key(
+            "old", "new", "html", "myers", "https://example.com"
+        )
+        assert key != DiffCache.key(
+            "old", "new", "code", "myers", "https://example.com"
+        )
+        assert key != DiffCache.key(
+            "old", "new", "html", "patience", "https://example.com"
+        )
+        assert key != DiffCache.key(
+            "new", "old", "html", "myers", "https://example.com"
+        )
+
+    def test_renderer_version_changes_key(self):
+        from app.services.diff_cache import DiffCache
+
+        key = DiffCache.key("old", "new", "html")
+        with patch("app.services.diff_cache.RENDERER_VERSION", 99):
+            assert DiffCache.key("old", "new", "html") != key
+
+
+class TestGetOrRender:
+    def test_disabled_always_renders(self):
+        from app.services.diff_cache import DiffCache
+        from app.repositories import RenderedDiffRepository
+
+        render = MagicMock(return_value="<div>diff</div>")
+        with patch.object(RenderedDiffRepository, "get") as mock_get:
+            assert DiffCache.get_or_render("k", "html", render) == "<div>diff</div>"
+            assert DiffCache.get_or_render("k", "html", render) == "<div>diff</div>"
+
+        assert render.call_count == 2
+        mock_get.assert_not_called()
+
+    def test_memory_hit_skips_render(self, diff_cache):
+        from app.services.diff_cache import DiffCache
+        from app.repositories import RenderedDiffRepository
+
+        render = MagicMock(return_value="<div>diff</div>")
+        with (
+            patch.object(RenderedDiffRepository, "get", return_value=None) as mock_get,
+            patch.object(RenderedDiffRepository, "save") as mock_save,
+            patch.object(RenderedDiffRepository, "evict") as mock_evict,
+        ):
+            first = DiffCache.get_or_render("k", "html", render)
+            second = DiffCache.get_or_render("k", "html", render)
+
+        assert first == second == "<div>diff</div>"
+        render.assert_called_once()
+        mock_get.assert_called_once_with("k")
+        mock_save.assert_called_once_with("k", "html", "<div>diff</div>")
+        mock_evict.assert_called_once()
+
+    def test_database_hit_skips_render(self, diff_cache):
+        from app.services.diff_cache import DiffCache
+        from app.repositories import RenderedDiffRepository
+
+        render = MagicMock()
+        with (
+            patch.object(RenderedDiffRepository, "get", return_value="<p>stored</p>"),
+            patch.object(RenderedDiffRepository, "save") as mock_save,
+        ):
+            result = DiffCache.get_or_render("k", "code", render)
+
+        assert result == "<p>stored</p>"
+        render.assert_not_called()
+        mock_save.assert_not_called()
+
+    def test_empty_render_cached_as_none(self, diff_cache):
+        from app.services.diff_cache import DiffCache
+        from app.repositories import RenderedDiffRepository
+
+        render = MagicMock(return_value=None)
+        with (
+            patch.object(RenderedDiffRepository, "get", return_value=None),
+            patch.object(RenderedDiffRepository, "save"),
+            patch.object(RenderedDiffRepository, "evict"),
+        ):
+            assert DiffCache.get_or_render("k", "paragraph", render) is None
+            assert DiffCache.get_or_render("k", "paragraph", render) is None
+
+        render.assert_called_once()
+
+    def test_database_errors_fall_back_to_render(self, diff_cache):
+        from app.services.diff_cache import DiffCache
+        from app.repositories import RenderedDiffRepository
+
+        with (
+            patch.object(
+                RenderedDiffRepository, "get", side_effect=Exception("locked")
+            ),
+            patch.object(
+                RenderedDiffRepository, "save", side_effect=Exception("locked")
+            ),
+        ):
+            result = DiffCache.get_or_render("k", "html", lambda: "<div>diff</div>")
+
+        assert result == "<div>diff</div>"
+
+    def test_incomplete_render_not_cached(self, diff_cache):
+        from app.services.diff_cache import DiffCache, mark_incomplete
+        from app.repositories import RenderedDiffRepository
+
+        def render():
+            mark_incomplete()
+            return "<div>unstyled</div>"
+
+        with (
+            patch.object(RenderedDiffRepository, "get", return_value=None),
+            patch.object(RenderedDiffRepository, "save") as mock_save,
+        ):
+            first = DiffCache.get_or_render("k", "html", render)
+            second = DiffCache.get_or_render("k", "html", lambda: "<div>styled</div>")
+
+        assert first == "<div>unstyled</div>"
+        assert second == "<div>styled</div>"
+        mock_save.assert_called_once_with("k", "html", "<div>styled</div>")
+
+    def test_rate_limited_css_marks_render_incomplete(self, diff_cache):
+        from app.services.check_service import CheckService
+        from app.services.diff_cache import render_artifacts
+        from app.services.rate_limiter import RateLimited
+
+        previous = {"full_content": "<html><body><p>Old</p></body></html>"}
+        current = {"full_content": "<html><body><p>New</p></body></html>"}
+        link = {"url": "https://example.com"}
+        limiter = MagicMock()
+        limiter.acquire.side_effect = RateLimited("example.com", 1.0)
+
+        with (
+            patch("app.services.rate_limiter.get_rate_limiter", return_value=limiter),
+            patch.object(
+                CheckService, "_generate_body_diff", return_value="<div>diff</div>"
+            ),
+        ):
+            artifacts = render_artifacts(previous, current, link, ["html", "price"])
+
+        assert "html" not in artifacts
+        assert "price" in artifacts
+
+
+class TestRender:
+    def test_render_parses_once_and_decodes_json_modes(self):
+        from lxml import html
+        from app.services.diff_cache import DiffCache
+        from app.services.check_service import CheckService
+        from app.utils.parsed_snapshot import reset_snapshot_cache
+
+        previous = {"full_content": "<html><body><p>Old $5.00</p></body></html>"}
+        current = {"full_content": "<html><body><p>New $6.00</p></body></html>"}
+        link = {"url": "https://example.com", "diff_algorithm": "myers"}
+
+        reset_snapshot_cache()
+        with (
+            patch.object(
+                CheckService, "_generate_paragraph_diff", return_value="<p>para</p>"
+            ) as mock_para,
+            patch(
+                "lxml.html.document_fromstring", wraps=html.document_fromstring
+            ) as mock_parse,
+        ):
+            result = DiffCache.render(
+                previous, current, link, ["price", "paragraph", "code", "change"]
+            )
+            DiffCache.render(previous, current, link, ["images"])
+
+        assert result["price"] == {
+            "previous": CheckService._extract_price(previous["full_content"]),
+            "current": CheckService._extract_price(current["full_content"]),
+        }
+        assert result["paragraph"] == "<p>para</p>"
+        assert "Old" in result["code"] and "New" in result["code"]
+        assert result["change"] == 0
+        assert mock_parse.call_count == 2
+        old, new = mock_para.call_args[0][1], mock_para.call_args[0][0]
+        assert (old.paragraphs, new.paragraphs) == (["Old $5.00"], ["New $6.00"])
+        assert mock_para.call_args[0][2:] == ("https://example.com", "myers")
+
+
+class TestRenderedDiffRepository:
+    def test_evict_oldest_until_under_budget(self):
+        from app.repositories.rendered_diff_repository import RenderedDiffRepository
+
+        with patch(
+            "app.repositories.rendered_diff_repository.get_session"
+        ) as mock_session:
+            session = mock_session.return_value
+            total_query = MagicMock()
+            total_query.scalar.return_value = 300
+            rows_query = MagicMock()
+            rows_query.order_by.return_value = [(1, 100), (2, 100), (3, 100)]
+            delete_query = MagicMock()
+            session.query.side_effect = [total_query, rows_query, delete_query]
+
+            evicted = RenderedDiffRepository.evict(150)
+
+            assert evicted == 2
+            delete_query.filter.return_value.delete.assert_called_once()
+            session.commit.assert_called_once()
+            session.close.assert_called()
+
+    def test_evict_within_budget(self):
+        from app.repositories.rendered_diff_repository import RenderedDiffRepository
+
+        with patch(
+            "app.repositories.rendered_diff_repository.get_session"
+        ) as mock_session:
+            mock_session.return_value.query.return_value.scalar.return_value = 100
+
+            assert RenderedDiffRepository.evict(150) == 0
+            mock_session.return_value.commit.assert_not_called()
@@ -0,0 +1,175 @@
+import difflib
+import random
+
+import pytest
+from unittest.mock import patch
+
+from app.utils.diff_engine import ALGORITHMS, get_opcodes, unified_diff
+
+
+def _apply(a, b, opcodes):
+    result = []
+    position = (0, 0)
+    for tag, i1, i2, j1, j2 in opcodes:
+        assert (i1, j1) == position
+        if tag == "equal":
+            assert a[i1:i2] == b[j1:j2]
+            result.extend(a[i1:i2])
+        else:
+            result.extend(b[j1:j2])
+        position = (i2, j2)
+    assert position == (len(a), len(b))
+    return result
+
+
+def _edited(rng):
+    a = [rng.choice("abcde") for _ in range(rng.randint(0, 40))]
+    b = list(a)
+    for _ in range(rng.randint(0, 6)):
+        if b and rng.random() < 0.5:
+            del b[rng.randrange(len(b))]
+        else:
+            b.insert(rng.randint(0, len(b)), rng.choice("abcdef"))
+    return a, b
+
+
+class TestDiffEngine:
+    @pytest.mark.parametrize("algorithm", ALGORITHMS)
+    def test_opcodes_rebuild_new_sequence(self, algorithm):
+        rng = random.Random(7)
+
+        for _ in range(300):
+            a, b = _edited(rng)
+            assert _apply(a, b, get_opcodes(a, b, algorithm)) == b
+
+    def test_myers_edit_script_is_minimal(self):
+        rng = random.Random(11)
+
+        for _ in range(200):
+            a, b = _edited(rng)
+            matcher = difflib.SequenceMatcher(None, a, b, autojunk=False)
+            kept = sum(
+                i2 - i1
+                for tag, i1, i2, _, _ in get_opcodes(a, b, "myers")
+                if tag == "equal"
+            )
+            assert kept >= sum(block.size for block in matcher.get_matching_blocks())
+
+    @pytest.mark.parametrize("algorithm", ALGORITHMS)
+    def test_unified_format_matches_difflib(self, algorithm):
+        old = [f"<li>item {i}</li>\n" for i in range(200)]
+        new = list(old)
+        new[120] = "<li>item changed</li>\n"
+        new.insert(10, "<li>new</li>\n")
+        del new[180]
+
+        expected = list(
+            difflib.unified_diff(old, new, "previous", "current", lineterm="")
+        )
+
+        assert (
+            list(
+                unified_diff(
+                    old, new, "previous", "current", lineterm="", algorithm=algorithm
+                )
+            )
+            == expected
+        )
+
+    def test_line_table_shares_ids_between_versions(self):
+        from app.utils.diff_engine import LineTable
+
+        table = LineTable()
+        old = table.intern(["<p>", "a", "</p>"])
+        new = table.intern(["<p>", "b", "</p>"])
+
+        assert old.typecode == "I"
+        assert list(old) == [0, 1, 2]
+        assert list(new) == [0, 3, 2]
+
+    @pytest.mark.parametrize("algorithm", ALGORITHMS)
+    def test_long_equal_runs_around_edits(self, algorithm):
+        old = [f"row {i}" for i in range(5000)]
+        new = old[:1234] + ["inserted"] + old[1234:4000] + old[4001:]
+
+        opcodes = get_opcodes(old, new, algorithm)
+
+        assert [tag for tag, *_ in opcodes] == [
+            "equal",
+            "insert",
+            "equal",
+            "delete",
+            "equal",
+        ]
+        assert opcodes[1] == ("insert", 1234, 1234, 1234, 1235)
+        assert opcodes[3] == ("delete", 4000, 4001, 4001, 4001)
+
+    def test_identical_sequences_yield_nothing(self):
+        assert list(unified_diff(["a\n"], ["a\n"], algorithm="myers")) == []
+        assert get_opcodes([], [], "histogram") == []
+
+    def test_histogram_keeps_repeated_markup_aligned(self):
+        old = ["<div>", "a", "</div>"] * 50
+        new = ["<div>", "a", "</div>", "<div>", "new", "</div>"] + old
+
+        opcodes = get_opcodes(old, new, "histogram")
+
+        assert {tag for tag, *_ in opcodes} == {"equal", "insert"}
+        assert sum(j2 - j1 for tag, _, _, j1, j2 in opcodes if tag == "insert") == 6
+
+    def test_unknown_algorithm_uses_configured_default(self):
+        with (
+            patch("app.config.Config.DIFF_ALGORITHM", "patience"),
+            patch("app.utils.diff_engine._patience") as mock_patience,
+        ):
+            from app.utils import diff_engine
+
+            with patch.dict(diff_engine.ENGINES, {"patience": mock_patience}):
+                get_opcodes(["a", "b"], ["b", "a"], "bogus")
+
+            mock_patience.assert_called_once()
+
+    @pytest.mark.parametrize("algorithm", ALGORITHMS)
+    def test_large_disjoint_input_within_budget(self, algorithm):
+        import time
+
+        old = [f"<p>old {i}</p>" for i in range(4000)]
+        new = [f"<p>new {i}</p>" for i in range(4000)]
+
+        started = time.perf_counter()
+        opcodes = get_opcodes(old, new, algorithm)
+
+        assert time.perf_counter() - started < 1
+        assert opcodes == [("replace", 0, 4000, 0, 4000)]
+
+    @pytest.mark.parametrize("algorithm", ["myers", "histogram"])
+    def test_costly_region_stays_within_budget(self, algorithm):
+        import time
+
+        rng = random.Random(5)
+        old = [rng.choice(["</div>", "<li>", "</li>"]) for _ in range(8000)]
+        new = [rng.choice(["</div>", "<li>", "</li>"]) for _ in range(8000)]
+
+        started = time.perf_counter()
+        opcodes = get_opcodes(old, new, algorithm)
+
+        assert time.perf_counter() - started < 2
+        assert _apply(old, new, opcodes) == new
+
+    @pytest.mark.parametrize("algorithm", ["myers", "patience", "histogram"])
+    def test_scattered_edits_keep_most_lines_matched(self, algorithm):
+        from app.utils.diff_engine import matching_blocks
+
+        rng = random.Random(3)
+        old = [f"<li>item {rng.randrange(500)}</li>" for _ in range(6000)]
+        new = list(old)
+        for _ in range(500):
+            index = rng.randrange(len(new))
+            if rng.random() < 0.5:
+                new[index] = "<li>changed</li>"
+            else:
+                new.insert(index, "<li>added</li>")
+
+        blocks = matching_blocks(old, new, algorithm)
+
+        assert sum(size for _, _, size in blocks) > 0.9 * len(old)
@@ -152,6 +152,36 @@ class TestDiffRepository:
 
             assert result is None
 
+    def test_get_latest_hash_falls_back_to_initial_page(self):
+        from app.repositories.diff_repository import DiffRepository
+
+        with patch("app.repositories.diff_repository.get_session") as mock_session:
+            mock_query = MagicMock()
+            mock_query.filter_by.return_value.order_by.return_value.first.return_value = None
+            mock_query.filter_by.return_value.first.return_value = ("abc",)
+            mock_session.return_value.query.return_value = mock_query
+
+            result = DiffRepository.get_latest_hash(1)
+
+            assert result == "abc"
+            mock_session.return_value.close.assert_called()
+
+    def test_get_baseline(self):
+        from app.repositories.diff_repository import DiffRepository
+
+        with patch("app.repositories.diff_repository.get_session") as mock_session:
+            mock_diff = MagicMock()
+            mock_diff.to_dict.return_value = {"id": 3, "is_baseline": True}
+            mock_query = MagicMock()
+            mock_query.filter_by.return_value.order_by.return_value.first.return_value = mock_diff
+            mock_session.return_value.query.return_value = mock_query
+
+            result = DiffRepository.get_baseline(1)
+
+            assert result == {"id": 3, "is_baseline": True}
+            mock_query.filter_by.assert_called_once_with(link_id=1, is_baseline=True)
+            mock_session.return_value.close.assert_called()
+
     def test_get_previous(self):
         from app.repositories.diff_repository import DiffRepository
 
@@ -223,3 +253,25 @@ class TestDiffRepository:
             DiffRepository.delete_by_link(1)
 
             mock_session.return_value.commit.assert_called_once()
+
+
+class TestDiffArtifactRepository:
+    def test_get_by_diff_ignores_stale_keys(self):
+        from app.repositories.diff_repository import DiffArtifactRepository
+
+        with patch("app.repositories.diff_repository.get_session") as mock_session:
+            rows = [
+                MagicMock(mode="html", cache_key="k-html", content="<div>html</div>"),
+                MagicMock(mode="code", cache_key="old-key", content="<div>code</div>"),
+                MagicMock(mode="price", cache_key=None, content="{}"),
+            ]
+            mock_query = MagicMock()
+            mock_query.filter_by.return_value.all.return_value = rows
+            mock_session.return_value.query.return_value = mock_query
+
+            result = DiffArtifactRepository.get_by_diff(
+                1, {"html": "k-html", "code": "k-code", "price": "k-price"}
+            )
+
+            assert result == {"html": "<div>html</div>"}
+            mock_session.return_value.close.assert_called()
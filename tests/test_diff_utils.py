@@ -4,6 +4,7 @@ from app.utils.diff_utils import (
     compute_diff,
     extract_images,
     compute_image_diff,
+    normalized_hash,
 )
 from bs4 import BeautifulSoup
 
@@ -30,6 +31,21 @@ class TestDiffUtils:
         assert "---" in result
         assert "+++" in result
 
+    def test_normalized_hash_ignores_whitespace(self):
+        assert normalized_hash("<p>a  b</p>\n") == normalized_hash(" <p>a b</p>")
+        assert normalized_hash("<p>a b</p>") != normalized_hash("<p>ab</p>")
+
+    def test_incremental_normalized_hash_matches(self):
+        from app.utils.diff_utils import NormalizedHash
+
+        content = " <p>a  b</p>\n\n<p>c</p> "
+        for size in (1, 2, 3, 7):
+            digest = NormalizedHash()
+            for start in range(0, len(content), size):
+                digest.update(content[start : start + size])
+
+            assert digest.hexdigest() == normalized_hash(content)
+
     def test_extract_images_with_src(self):
         html = '<html><body><img src="/image.png" alt="test"></body></html>'
         soup = BeautifulSoup(html, "html.parser")
@@ -0,0 +1,317 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+STATIC_HTML = "<html><body><h1>Title</h1><p>Static body text here</p></body></html>"
+SHELL_HTML = "<html><body><div id='app'></div><script>render()</script></body></html>"
+
+
+def _stats(strategy="http", matches=3, checks=0, age_hours=1):
+    return {
+        "domain": "example.com",
+        "strategy": strategy,
+        "matches": matches,
+        "checks_since_validation": checks,
+        "validated_at": (datetime.utcnow() - timedelta(hours=age_hours)).isoformat(),
+    }
+
+
+class TestFetchRouterSimilarity:
+    def test_visible_text_ignores_scripts(self):
+        from app.services.fetch_router import FetchRouter
+
+        text = FetchRouter.visible_text(SHELL_HTML)
+
+        assert "render" not in text
+
+    def test_identical_pages(self):
+        from app.services.fetch_router import FetchRouter
+
+        assert FetchRouter.similarity(STATIC_HTML, STATIC_HTML) == 1.0
+
+    def test_js_shell_differs_from_rendered(self):
+        from app.services.fetch_router import FetchRouter
+
+        assert FetchRouter.similarity(SHELL_HTML, STATIC_HTML) < 0.5
+
+    def test_reordered_content_is_not_similar(self):
+        from app.services.fetch_router import FetchRouter
+
+        words = [f"item{i}" for i in range(200)]
+        http_html = f"<html><body><p>{' '.join(words)}</p></body></html>"
+        rendered_html = f"<html><body><p>{' '.join(reversed(words))}</p></body></html>"
+
+        assert FetchRouter.similarity(http_html, rendered_html) < 0.1
+
+    def test_compares_only_leading_words(self):
+        from app.services.fetch_router import FetchRouter
+
+        http_html = "<html><body><p>same words here</p></body></html>"
+        rendered_html = "<html><body><p>same words here and more</p></body></html>"
+
+        with patch("app.config.Config.ROUTER_SIMILARITY_MAX_WORDS", 3):
+            assert FetchRouter.similarity(http_html, rendered_html) == 1.0
+
+    def test_domain_for(self):
+        from app.services.fetch_router import FetchRouter
+
+        assert FetchRouter.domain_for("https://Example.COM:8443/a?b=1") == "example.com"
+
+
+class TestFetchRouterChoose:
+    def test_unknown_domain_uses_browser(self):
+        from app.services.fetch_router import FetchRouter
+
+        with patch.object(FetchRouter, "_stats", return_value=None):
+            assert FetchRouter.choose("https://example.com") == "browser"
+
+    def test_learned_static_domain_uses_http(self):
+        from app.services.fetch_router import FetchRouter
+
+        with patch.object(FetchRouter, "_stats", return_value=_stats()):
+            assert FetchRouter.choose("https://example.com") == "http"
+
+    def test_stays_on_http_while_revalidating(self):
+        from app.services.fetch_router import FetchRouter
+
+        with patch.object(FetchRouter, "_stats", return_value=_stats(checks=1000)):
+            assert FetchRouter.choose("https://example.com") == "http"
+
+    def test_plan_samples_after_check_count(self):
+        from app.services.fetch_router import FetchRouter
+
+        with patch.object(FetchRouter, "_stats", return_value=_stats(checks=1000)):
+            plan = FetchRouter.plan("https://example.com")
+
+        assert plan == {"strategy": "http", "sample": True, "render": True}
+
+    def test_plan_samples_after_age(self):
+        from app.services.fetch_router import FetchRouter
+
+        with patch.object(FetchRouter, "_stats", return_value=_stats(age_hours=1000)):
+            assert FetchRouter.plan("https://example.com")["sample"] is True
+
+    def test_plan_forces_render_for_screenshots(self):
+        from app.services.fetch_router import FetchRouter
+
+        with patch.object(FetchRouter, "_stats", return_value=_stats()):
+            plan = FetchRouter.plan("https://example.com", force_render=True)
+
+        assert plan == {"strategy": "http", "sample": False, "render": True}
+
+
+class TestFetchRouterRecord:
+    def test_promotes_after_min_matches(self):
+        from app.services.fetch_router import FetchRouter
+        from app.repositories import FetchStrategyRepository
+
+        with (
+            patch.object(
+                FetchStrategyRepository,
+                "get_by_domain",
+                return_value=_stats(strategy="browser", matches=2),
+            ),
+            patch.object(FetchStrategyRepository, "record_sample") as mock_record,
+            patch("app.config.Config.ROUTER_MIN_MATCHES", 3),
+        ):
+            strategy = FetchRouter.record_comparison(
+                "https://example.com", STATIC_HTML, STATIC_HTML
+            )
+
+            assert strategy == "http"
+            mock_record.assert_called_once_with("example.com", "http", 3, 1.0)
+
+    def test_mismatch_resets_to_browser(self):
+        from app.services.fetch_router import FetchRouter
+        from app.repositories import FetchStrategyRepository
+
+        with (
+            patch.object(
+                FetchStrategyRepository, "get_by_domain", return_value=_stats()
+            ),
+            patch.object(FetchStrategyRepository, "record_sample") as mock_record,
+        ):
+            strategy = FetchRouter.record_comparison(
+                "https://example.com", SHELL_HTML, STATIC_HTML
+            )
+
+            assert strategy == "browser"
+            assert mock_record.call_args.args[2] == 0
+
+
+class TestFetchRouterFetch:
+    def test_http_route_reuses_plain_body(self):
+        from app.services.fetch_router import FetchRouter
+        from app.repositories import FetchStrategyRepository
+
+        render = MagicMock()
+        plain = MagicMock()
+
+        with (
+            patch.object(FetchRouter, "_stats", return_value=_stats()),
+            patch.object(FetchStrategyRepository, "increment_checks") as mock_inc,
+        ):
+            result = FetchRouter.fetch(
+                "https://example.com",
+                render,
+                plain,
+                http_content=STATIC_HTML,
+                http_hash="abc",
+            )
+
+            assert result == {
+                "success": True,
+                "content": STATIC_HTML,
+                "content_hash": "abc",
+                "strategy": "http",
+            }
+            render.assert_not_called()
+            plain.assert_not_called()
+            mock_inc.assert_called_once_with("example.com")
+
+    def test_browser_route_records_comparison(self):
+        from app.services.fetch_router import FetchRouter
+
+        render = MagicMock(return_value={"success": True, "content": STATIC_HTML})
+        plain = MagicMock()
+
+        with (
+            patch.object(FetchRouter, "_stats", return_value=None),
+            patch.object(
+                FetchRouter, "record_comparison", return_value="browser"
+            ) as mock_record,
+        ):
+            result = FetchRouter.fetch(
+                "https://example.com", render, plain, http_content=SHELL_HTML
+            )
+
+            assert result["strategy"] == "browser"
+            plain.assert_not_called()
+            mock_record.assert_called_once_with(
+                "https://example.com", SHELL_HTML, STATIC_HTML
+            )
+
+    def test_known_dynamic_domain_skips_sampling(self):
+        from app.services.fetch_router import FetchRouter
+
+        render = MagicMock(return_value={"success": True, "content": STATIC_HTML})
+        plain = MagicMock()
+
+        with (
+            patch.object(
+                FetchRouter,
+                "_stats",
+                return_value=_stats(strategy="browser", matches=0),
+            ),
+            patch.object(FetchRouter, "record_comparison") as mock_record,
+        ):
+            FetchRouter.fetch("https://example.com", render, plain)
+
+            plain.assert_not_called()
+            mock_record.assert_not_called()
+
+    def test_http_failure_falls_back_to_render(self):
+        from app.services.fetch_router import FetchRouter
+
+        render = MagicMock(return_value={"success": True, "content": STATIC_HTML})
+        plain = MagicMock(return_value={"success": False, "error": "boom"})
+
+        with (
+            patch.object(FetchRouter, "_stats", return_value=_stats()),
+            patch.object(
+                FetchRouter, "record_fallback", return_value="browser"
+            ) as mock_fallback,
+        ):
+            result = FetchRouter.fetch("https://example.com", render, plain)
+
+            assert result["strategy"] == "browser"
+            render.assert_called_once()
+            mock_fallback.assert_called_once_with("https://example.com")
+
+    def test_revalidation_render_is_only_a_sample(self):
+        from app.services.fetch_router import FetchRouter
+
+        render = MagicMock(
+            return_value={
+                "success": True,
+                "content": STATIC_HTML + "<!-- rendered -->",
+                "screenshot": b"png",
+            }
+        )
+        plain = MagicMock()
+
+        with (
+            patch.object(FetchRouter, "_stats", return_value=_stats(checks=1000)),
+            patch.object(
+                FetchRouter, "record_comparison", return_value="http"
+            ) as mock_record,
+        ):
+            result = FetchRouter.fetch(
+                "https://example.com", render, plain, http_content=STATIC_HTML
+            )
+
+            assert result["content"] == STATIC_HTML
+            assert result["strategy"] == "http"
+            assert result["screenshot"] == b"png"
+            mock_record.assert_called_once()
+
+    def test_revalidation_mismatch_switches_to_render(self):
+        from app.services.fetch_router import FetchRouter
+
+        render = MagicMock(return_value={"success": True, "content": STATIC_HTML})
+        plain = MagicMock()
+
+        with (
+            patch.object(FetchRouter, "_stats", return_value=_stats(checks=1000)),
+            patch.object(FetchRouter, "record_comparison", return_value="browser"),
+        ):
+            result = FetchRouter.fetch(
+                "https://example.com", render, plain, http_content=SHELL_HTML
+            )
+
+            assert result["content"] == STATIC_HTML
+            assert result["strategy"] == "browser"
+
+    def test_forced_render_keeps_http_content(self):
+        from app.services.fetch_router import FetchRouter
+        from app.repositories import FetchStrategyRepository
+
+        render = MagicMock(
+            return_value={"success": True, "content": "rendered", "screenshot": b"png"}
+        )
+        plain = MagicMock()
+
+        with (
+            patch.object(FetchRouter, "_stats", return_value=_stats()),
+            patch.object(FetchRouter, "record_comparison") as mock_record,
+            patch.object(FetchStrategyRepository, "increment_checks") as mock_inc,
+        ):
+            result = FetchRouter.fetch(
+                "https://example.com",
+                render,
+                plain,
+                http_content=STATIC_HTML,
+                force_render=True,
+            )
+
+            assert result["content"] == STATIC_HTML
+            assert result["screenshot"] == b"png"
+            mock_record.assert_not_called()
+            mock_inc.assert_called_once_with("example.com")
+
+    def test_failed_sample_render_keeps_http_content(self):
+        from app.services.fetch_router import FetchRouter
+        from app.repositories import FetchStrategyRepository
+
+        render = MagicMock(return_value={"success": False, "error": "timeout"})
+        plain = MagicMock()
+
+        with (
+            patch.object(FetchRouter, "_stats", return_value=_stats(checks=1000)),
+            patch.object(FetchStrategyRepository, "increment_checks"),
+        ):
+            result = FetchRouter.fetch(
+                "https://example.com", render, plain, http_content=STATIC_HTML
+            )
+
+            assert result["success"] is True
+            assert result["content"] == STATIC_HTML
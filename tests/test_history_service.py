@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import MagicMock, patch, AsyncMock
+from unittest.mock import patch, AsyncMock
 
 
 class TestHistoryService:
@@ -84,7 +84,6 @@ class TestHistoryService:
             patch.object(
                 check_service.CheckService, "_compute_image_diff"
             ) as mock_image,
-            patch("bs4.BeautifulSoup") as mock_soup,
         ):
             mock_get_id.return_value = {
                 "id": 2,
@@ -100,18 +99,9 @@ class TestHistoryService:
             mock_code.return_value = "<div>code</div>"
             mock_image.return_value = {"added": [], "removed": []}
 
-            mock_body_old = MagicMock()
-            mock_body_new = MagicMock()
-            mock_body_old.get_text.return_value = "old text"
-            mock_body_new.get_text.return_value = "new text"
-
-            mock_soup_instance_old = MagicMock()
-            mock_soup_instance_new = MagicMock()
-            mock_soup_instance_old.find.return_value = mock_body_old
-            mock_soup_instance_new.find.return_value = mock_body_new
-            mock_soup.side_effect = [mock_soup_instance_old, mock_soup_instance_new]
-
             result = HistoryService.get_history(2)
 
             assert result is not None
             assert result["is_initial"] is False
+            assert result["paragraph_diff"] == "<html>paragraph</html>"
+            assert result["entry"]["change_percent"] == 0
@@ -173,6 +173,34 @@ class TestHtmlDiffUtils:
 
             assert result == ""
 
+    def test_download_css_skips_rate_limited_stylesheet(self):
+        from app.utils.html_diff_utils import _download_css
+        from app.services.rate_limiter import RateLimited
+
+        page = MagicMock(ok=True)
+        page.text = (
+            '<link rel="stylesheet" href="https://cdn.example.com/a.css">'
+            '<link rel="stylesheet" href="/b.css">'
+        )
+        stylesheet = MagicMock(ok=True, text="b { }")
+        limiter = MagicMock()
+
+        def acquire(url, max_wait=None):
+            if "cdn." in url:
+                raise RateLimited("cdn.example.com", 5)
+
+        limiter.acquire.side_effect = acquire
+        with (
+            patch("app.services.rate_limiter.get_rate_limiter", return_value=limiter),
+            patch("requests.get", side_effect=[page, stylesheet]),
+            patch("time.sleep") as mock_sleep,
+        ):
+            result = _download_css("https://example.com")
+
+        assert result == "b { }"
+        assert all(c.kwargs["max_wait"] == 0 for c in limiter.acquire.call_args_list)
+        mock_sleep.assert_not_called()
+
 
 class TestDiffUtils:
     def test_escape_html(self):
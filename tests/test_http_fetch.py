@@ -0,0 +1,163 @@
+import asyncio
+from unittest.mock import MagicMock, patch
+
+from aiohttp import web
+
+
+def _make_app():
+    async def page(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304, headers={"ETag": '"v1"'})
+        return web.Response(
+            text="<html><body>Hello</body></html>",
+            content_type="text/html",
+            headers={"ETag": '"v1"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"},
+        )
+
+    async def large(request):
+        return web.Response(body=b"a" * 300_000, content_type="text/plain")
+
+    async def image(request):
+        return web.Response(body=b"\x89PNG\r\n", content_type="image/png")
+
+    async def latin1(request):
+        return web.Response(
+            body="café".encode("latin-1"),
+            headers={"Content-Type": "text/html; charset=ISO-8859-1"},
+        )
+
+    app = web.Application()
+    app.router.add_get("/page", page)
+    app.router.add_get("/large", large)
+    app.router.add_get("/image", image)
+    app.router.add_get("/latin1", latin1)
+    return app
+
+
+async def _with_server(coro_factory, path="/page"):
+    from app.tasks.http_fetch import close_http_session
+
+    runner = web.AppRunner(_make_app())
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        return await coro_factory(f"http://127.0.0.1:{port}{path}")
+    finally:
+        await close_http_session()
+        await runner.cleanup()
+
+
+class TestConditionalFetch:
+    def test_first_fetch_returns_validators(self):
+        from app.tasks.http_fetch import conditional_fetch_async
+
+        result = asyncio.run(_with_server(lambda url: conditional_fetch_async(url)))
+
+        assert result["success"] is True
+        assert result["not_modified"] is False
+        assert result["etag"] == '"v1"'
+        assert result["last_modified"] == "Wed, 01 Jan 2025 00:00:00 GMT"
+        assert "Hello" in result["content"]
+
+    def test_matching_etag_returns_not_modified(self):
+        from app.tasks.http_fetch import conditional_fetch_async
+
+        result = asyncio.run(
+            _with_server(
+                lambda url: conditional_fetch_async(
+                    url, etag='"v1"', last_modified="Wed, 01 Jan 2025 00:00:00 GMT"
+                )
+            )
+        )
+
+        assert result["not_modified"] is True
+        assert result["status"] == 304
+        assert result["last_modified"] == "Wed, 01 Jan 2025 00:00:00 GMT"
+        assert "content" not in result
+
+    def test_connection_error(self):
+        from app.tasks.http_fetch import conditional_fetch_async, close_http_session
+
+        async def run():
+            try:
+                return await conditional_fetch_async("http://127.0.0.1:1/page")
+            finally:
+                await close_http_session()
+
+        result = asyncio.run(run())
+
+        assert result["success"] is False
+        assert result["not_modified"] is False
+
+
+class TestStreamingFetch:
+    def test_stops_at_byte_cap(self):
+        from app.tasks.http_fetch import fetch_async
+        from app.utils.diff_utils import normalized_hash
+
+        with patch("app.config.Config.FETCH_MAX_BYTES", 100_000):
+            result = asyncio.run(_with_server(fetch_async, "/large"))
+
+        assert result["success"] is True
+        assert result["truncated"] is True
+        assert result["bytes"] == 100_000
+        assert len(result["content"]) == 100_000
+        assert result["content_hash"] == normalized_hash("a" * 100_000)
+
+    def test_small_body_not_truncated(self):
+        from app.tasks.http_fetch import fetch_async
+        from app.utils.diff_utils import normalized_hash
+
+        result = asyncio.run(_with_server(fetch_async))
+
+        assert result["truncated"] is False
+        assert result["content_hash"] == normalized_hash(result["content"])
+
+    def test_binary_content_rejected(self):
+        from app.tasks.http_fetch import fetch_async
+
+        result = asyncio.run(_with_server(fetch_async, "/image"))
+
+        assert result["success"] is False
+        assert "image/png" in result["error"]
+
+    def test_decodes_declared_charset(self):
+        from app.tasks.http_fetch import fetch_async
+
+        result = asyncio.run(_with_server(fetch_async, "/latin1"))
+
+        assert result["content"] == "café"
+
+
+class TestStreamingBody:
+    def test_nul_bytes_mark_binary(self):
+        from app.tasks.http_fetch import StreamingBody
+
+        body = StreamingBody(None, max_bytes=1000)
+
+        assert body.feed(b"GIF89a\x00\x00") is False
+        assert body.finish()["success"] is False
+
+    def test_multibyte_split_across_chunks(self):
+        from app.tasks.http_fetch import StreamingBody
+
+        encoded = "naïve".encode("utf-8")
+        body = StreamingBody("text/html; charset=utf-8", max_bytes=1000)
+        body.feed(encoded[:3])
+        body.feed(encoded[3:])
+
+        assert body.finish()["content"] == "naïve"
+
+    def test_requests_reader(self):
+        from app.tasks.http_fetch import read_body
+
+        response = MagicMock()
+        response.headers = {"Content-Type": "text/html"}
+        response.iter_content.return_value = [b"<p>", b"", b"hi</p>"]
+
+        result = read_body(response, max_bytes=5)
+
+        assert result["content"] == "<p>hi"
+        assert result["truncated"] is True
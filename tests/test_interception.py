@@ -0,0 +1,132 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+
+class TestInterceptionRules:
+    def test_blocks_resource_types(self):
+        from app.tasks.interception import InterceptionRules
+
+        rules = InterceptionRules(blocked_types=["image", "font"], block_trackers=False)
+
+        assert rules.block_reason("https://example.com/a.png", "image") == "image"
+        assert rules.block_reason("https://example.com/a.woff2", "font") == "font"
+        assert rules.block_reason("https://example.com/app.js", "script") is None
+
+    def test_blocks_tracker_subdomains(self):
+        from app.tasks.interception import InterceptionRules
+
+        rules = InterceptionRules(blocked_types=[])
+
+        assert (
+            rules.block_reason("https://www.google-analytics.com/g/collect", "xhr")
+            == "domain"
+        )
+        assert (
+            rules.block_reason("https://analytics.example.com/x.js", "script") is None
+        )
+
+    def test_first_party_assets_of_tracker_vendors_allowed(self):
+        from app.tasks.interception import InterceptionRules
+
+        rules = InterceptionRules(blocked_types=[])
+
+        assert rules.block_reason("https://yandex.ru/static/app.js", "script") is None
+        assert rules.block_reason("https://www.tiktok.com/api/feed", "xhr") is None
+        assert (
+            rules.block_reason("https://mc.yandex.ru/metrika/tag.js", "script")
+            == "domain"
+        )
+        assert (
+            rules.block_reason("https://o1.ingest.sentry.io/api/1/envelope/", "fetch")
+            == "domain"
+        )
+
+    def test_never_blocks_documents(self):
+        from app.tasks.interception import InterceptionRules
+
+        rules = InterceptionRules(blocked_types=["document"])
+
+        assert rules.block_reason("https://doubleclick.net/", "document") is None
+
+    def test_project_overrides(self):
+        from app.tasks.interception import InterceptionRules
+
+        with patch("app.config.Config.BLOCK_TRACKERS", False):
+            rules = InterceptionRules.from_project(
+                {"blocked_resource_types": "media", "blocked_domains": "cdn.ads.test"}
+            )
+
+        assert rules.blocked_types == frozenset({"media"})
+        assert rules.block_reason("https://x.cdn.ads.test/a.js", "script") == "domain"
+        assert rules.block_reason("https://example.com/a.png", "image") is None
+
+    def test_config_defaults(self):
+        from app.tasks.interception import InterceptionRules
+
+        with patch("app.config.Config.BLOCK_RESOURCE_TYPES", "image,font"):
+            rules = InterceptionRules.from_project(None)
+
+        assert rules.blocked_types == frozenset({"image", "font"})
+
+    def test_screenshots_keep_resources(self):
+        from app.tasks.interception import InterceptionRules
+
+        rules = InterceptionRules.from_project(
+            {"blocked_resource_types": "image"}, for_screenshot=True
+        )
+
+        assert rules.block_reason("https://example.com/a.png", "image") is None
+        assert (
+            rules.block_reason("https://static.hotjar.com/c.js", "script") == "domain"
+        )
+
+
+class TestInterceptionStats:
+    def test_counts_and_estimates(self):
+        from app.tasks.interception import InterceptionStats, ESTIMATED_BYTES
+
+        stats = InterceptionStats()
+        stats.record("image", "image")
+        stats.record("domain", "script")
+        stats.record(None, "document")
+
+        assert stats.to_dict() == {
+            "blocked": 2,
+            "allowed": 1,
+            "estimated_bytes_saved": ESTIMATED_BYTES["image"]
+            + ESTIMATED_BYTES["script"],
+            "by_reason": {"image": 1, "domain": 1},
+        }
+
+
+class TestInstallPyppeteer:
+    def test_aborts_blocked_requests(self):
+        from app.tasks.interception import InterceptionRules, install_pyppeteer
+
+        page = MagicMock()
+        page.setRequestInterception = AsyncMock()
+
+        def make_request(url, resource_type):
+            request = MagicMock(url=url, resourceType=resource_type)
+            request.abort = AsyncMock()
+            request.continue_ = AsyncMock()
+            return request
+
+        image = make_request("https://example.com/a.png", "image")
+        doc = make_request("https://example.com/", "document")
+
+        async def run():
+            stats = await install_pyppeteer(page, InterceptionRules())
+            handler = page.on.call_args.args[1]
+            handler(image)
+            handler(doc)
+            await asyncio.sleep(0)
+            return stats
+
+        stats = asyncio.run(run())
+
+        page.setRequestInterception.assert_awaited_once_with(True)
+        image.abort.assert_awaited_once()
+        doc.continue_.assert_awaited_once()
+        assert stats.blocked == 1
+        assert stats.allowed == 1
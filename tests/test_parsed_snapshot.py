@@ -0,0 +1,111 @@
+from unittest.mock import patch
+
+PAGE = """<html><head><style>p { color: red; }</style></head><body>
+<div class="card" id="main"><h1>Title</h1>
+<p>Price: $9.99 <b>today</b></p><!-- note -->after
+<script>var a = 1 < 2;</script>
+<img src="/a.png" alt="A"><img data-src="/lazy.png"><br>
+</div></body></html>"""
+
+
+class TestParsedSnapshot:
+    def test_text_lines_skip_scripts_and_comments(self):
+        from app.utils.parsed_snapshot import ParsedSnapshot
+
+        snapshot = ParsedSnapshot(PAGE)
+
+        assert snapshot.text_lines == ["Title", "Price: $9.99", "today", "after"]
+        assert snapshot.body_text == "TitlePrice: $9.99todayafter"
+
+    def test_paragraphs_in_document_order(self):
+        from app.utils.parsed_snapshot import ParsedSnapshot
+
+        snapshot = ParsedSnapshot(PAGE)
+
+        assert snapshot.paragraphs == [
+            "TitlePrice: $9.99todayafter",
+            "Title",
+            "Price: $9.99today",
+        ]
+
+    def test_images(self):
+        from app.utils.parsed_snapshot import ParsedSnapshot
+
+        snapshot = ParsedSnapshot(PAGE)
+
+        assert snapshot.images == [
+            {"src": "/a.png", "alt": "A"},
+            {"src": "/lazy.png", "alt": ""},
+        ]
+
+    def test_pretty_lines(self):
+        from app.utils.parsed_snapshot import ParsedSnapshot
+
+        snapshot = ParsedSnapshot(
+            '<body><p class="x" data-a="1&2">Hi <b>you</b></p><br></body>'
+        )
+
+        assert snapshot.pretty_lines == [
+            "<body>",
+            ' <p class="x" data-a="1&amp;2">',
+            "  Hi",
+            "  <b>",
+            "   you",
+            "  </b>",
+            " </p>",
+            " <br/>",
+            "</body>",
+        ]
+
+    def test_price_candidates_without_parsing(self):
+        from app.utils.parsed_snapshot import ParsedSnapshot
+
+        snapshot = ParsedSnapshot(PAGE)
+
+        with patch("lxml.html.document_fromstring") as mock_parse:
+            assert snapshot.price_candidates == ["$9.99"]
+
+        mock_parse.assert_not_called()
+
+    def test_documents_without_body(self):
+        from app.utils.parsed_snapshot import ParsedSnapshot
+
+        empty = ParsedSnapshot("")
+        head_only = ParsedSnapshot("<html><head><title>T</title></head></html>")
+
+        assert empty.body is None and empty.text_lines == []
+        assert head_only.body is None
+        assert head_only.document_text == "T"
+        assert head_only.pretty_lines == []
+
+    def test_encoding_declaration(self):
+        from app.utils.parsed_snapshot import ParsedSnapshot
+
+        snapshot = ParsedSnapshot(
+            '<?xml version="1.0" encoding="utf-8"?><html><body><p>Café</p></body></html>'
+        )
+
+        assert snapshot.text_lines == ["Café"]
+
+
+class TestSnapshotCache:
+    def test_same_content_shares_snapshot(self):
+        from app.utils.parsed_snapshot import get_snapshot, reset_snapshot_cache
+
+        reset_snapshot_cache()
+
+        assert get_snapshot(PAGE) is get_snapshot(PAGE)
+        assert get_snapshot(PAGE) is not get_snapshot(PAGE + " ")
+
+    def test_least_recently_used_evicted(self):
+        from app.utils.parsed_snapshot import get_snapshot, reset_snapshot_cache
+
+        reset_snapshot_cache()
+        with patch("app.config.Config.SNAPSHOT_CACHE_SIZE", 2):
+            first = get_snapshot("<p>1</p>")
+            second = get_snapshot("<p>2</p>")
+            get_snapshot("<p>1</p>")
+            get_snapshot("<p>3</p>")
+
+            assert get_snapshot("<p>1</p>") is first
+            assert get_snapshot("<p>2</p>") is not second
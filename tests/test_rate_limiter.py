@@ -0,0 +1,153 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock, patch
+
+
+class TestMemoryBucketBackend:
+    def test_burst_then_wait(self):
+        from app.services.rate_limiter import MemoryBucketBackend
+
+        backend = MemoryBucketBackend()
+
+        waits = [backend.take("example.com", 1.0, 2, 100.0) for _ in range(3)]
+
+        assert waits[:2] == [0.0, 0.0]
+        assert waits[2] == pytest.approx(1.0)
+
+    def test_refills_over_time(self):
+        from app.services.rate_limiter import MemoryBucketBackend
+
+        backend = MemoryBucketBackend()
+        backend.take("example.com", 2.0, 1, 100.0)
+
+        assert backend.take("example.com", 2.0, 1, 100.1) == pytest.approx(0.4)
+        assert backend.take("example.com", 2.0, 1, 100.7) == 0.0
+
+    def test_hosts_are_independent(self):
+        from app.services.rate_limiter import MemoryBucketBackend
+
+        backend = MemoryBucketBackend()
+        backend.take("a.test", 1.0, 1, 100.0)
+
+        assert backend.take("b.test", 1.0, 1, 100.0) == 0.0
+
+
+class TestSQLiteBucketBackend:
+    def test_shared_between_backends(self, tmp_path):
+        import sqlite3
+        from app.services.rate_limiter import SQLiteBucketBackend
+
+        path = str(tmp_path / "buckets.db")
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE host_buckets (host TEXT PRIMARY KEY, tokens REAL, updated_at REAL)"
+        )
+        conn.close()
+
+        first = SQLiteBucketBackend(path)
+        second = SQLiteBucketBackend(path)
+
+        assert first.take("example.com", 1.0, 1, 100.0) == 0.0
+        assert second.take("example.com", 1.0, 1, 100.0) == pytest.approx(1.0)
+
+
+class TestRateLimiter:
+    def test_acquire_waits_for_token(self):
+        from app.services.rate_limiter import RateLimiter
+
+        backend = MagicMock()
+        backend.take.side_effect = [0.5, 0.0]
+        limiter = RateLimiter(backend, rate=1.0, burst=1, max_wait=5)
+
+        with patch("app.services.rate_limiter.time.sleep") as mock_sleep:
+            limiter.acquire("https://example.com/a")
+
+        mock_sleep.assert_called_once_with(0.5)
+        assert backend.take.call_args.args[0] == "example.com"
+
+    def test_acquire_raises_past_max_wait(self):
+        from app.services.rate_limiter import RateLimiter, RateLimited
+
+        backend = MagicMock()
+        backend.take.return_value = 30.0
+        limiter = RateLimiter(backend, rate=1.0, burst=1, max_wait=5)
+
+        with pytest.raises(RateLimited) as exc:
+            limiter.acquire("https://example.com/a")
+
+        assert exc.value.host == "example.com"
+        assert exc.value.retry_after == 30.0
+
+    def test_async_acquire_raises_past_max_wait(self):
+        from app.services.rate_limiter import RateLimiter, RateLimited
+
+        backend = MagicMock()
+        backend.take.return_value = 30.0
+        limiter = RateLimiter(backend, rate=1.0, burst=1, max_wait=5)
+
+        with pytest.raises(RateLimited):
+            asyncio.run(limiter.acquire_async("https://example.com/a"))
+
+    def test_disabled_never_touches_backend(self):
+        from app.services.rate_limiter import RateLimiter
+
+        backend = MagicMock()
+        limiter = RateLimiter(backend, rate=0, burst=1, max_wait=5)
+
+        limiter.acquire("https://example.com/a")
+
+        backend.take.assert_not_called()
+
+    def test_backend_errors_fail_open(self):
+        from app.services.rate_limiter import RateLimiter
+
+        backend = MagicMock()
+        backend.take.side_effect = Exception("database is locked")
+        limiter = RateLimiter(backend, rate=1.0, burst=1, max_wait=5)
+
+        assert limiter.try_acquire("https://example.com") == 0.0
+
+
+class TestDeferral:
+    def test_fetch_returns_deferred_result(self):
+        from app.services.rate_limiter import RateLimited
+        from app.tasks.http_fetch import fetch_async
+
+        limiter = MagicMock()
+
+        async def busy(url):
+            raise RateLimited("example.com", 12.0)
+
+        limiter.acquire_async = busy
+
+        with patch("app.tasks.http_fetch.get_rate_limiter", return_value=limiter):
+            result = asyncio.run(fetch_async("https://example.com"))
+
+        assert result["success"] is False
+        assert result["rate_limited"] is True
+        assert result["retry_after"] == 12.0
+
+    def test_check_task_reschedules(self):
+        from celery.exceptions import Retry
+        from app.tasks import check_tasks
+
+        link = {"id": 1, "url": "https://example.com"}
+
+        with (
+            patch("app.repositories.LinkRepository.get_by_id", return_value=link),
+            patch.object(
+                check_tasks.CheckServiceCelery,
+                "_conditional_fetch",
+                return_value={
+                    "success": False,
+                    "not_modified": False,
+                    "rate_limited": True,
+                    "retry_after": 5.0,
+                },
+            ),
+            patch.object(check_tasks, "fetch_url_sync") as mock_fetch,
+        ):
+            with pytest.raises(Retry):
+                check_tasks.check_link_task.run(1)
+
+            mock_fetch.assert_not_called()
@@ -0,0 +1,121 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+
+class FakeResponse:
+    status = 200
+
+
+class FakePage:
+    def __init__(self, outcome=None, error=None, delay=0):
+        self.outcome = outcome or {"reason": "quiet", "waited_ms": 500}
+        self.error = error
+        self.delay = delay
+        self.goto_kwargs = None
+        self.evaluated = []
+
+    async def goto(self, url, **kwargs):
+        self.goto_kwargs = kwargs
+        return FakeResponse()
+
+    async def evaluate(self, script, opts):
+        self.evaluated.append(opts)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.outcome
+
+
+class TestWaitUntilReady:
+    def test_quiescence_passes_window_and_selector(self):
+        from app.tasks.readiness import wait_until_ready
+
+        page = FakePage(outcome={"reason": "selector", "waited_ms": 120})
+
+        with (
+            patch("app.config.Config.READINESS_QUIET_MS", 250),
+            patch("app.config.Config.READINESS_BUDGET_MS", 5000),
+        ):
+            reason = asyncio.run(wait_until_ready(page, "#price", "quiescence"))
+
+        assert reason == "selector"
+        assert page.evaluated == [
+            {"quiet_ms": 250, "budget_ms": 5000, "selector": "#price"}
+        ]
+
+    def test_budget_enforced_from_python(self):
+        from app.tasks.readiness import wait_until_ready
+
+        page = FakePage(delay=5)
+
+        with patch("app.config.Config.READINESS_BUDGET_MS", 10):
+            reason = asyncio.run(wait_until_ready(page, strategy="quiescence"))
+
+        assert reason == "budget"
+
+    def test_context_destroyed_counts_as_navigated(self):
+        from app.tasks.readiness import wait_until_ready
+
+        page = FakePage(error=RuntimeError("Execution context was destroyed"))
+
+        reason = asyncio.run(wait_until_ready(page, strategy="quiescence"))
+
+        assert reason == "navigated"
+
+    def test_networkidle_keeps_fixed_settle(self):
+        from app.tasks import readiness
+
+        page = FakePage()
+
+        with patch.object(readiness.asyncio, "sleep", AsyncMock()) as mock_sleep:
+            reason = asyncio.run(
+                readiness.wait_until_ready(page, strategy="networkidle")
+            )
+
+        assert reason == "fixed"
+        mock_sleep.assert_awaited_once_with(2)
+        assert page.evaluated == []
+
+
+class TestGotoAndWait:
+    def test_pyppeteer_navigation_and_timings(self):
+        from app.tasks.readiness import goto_and_wait
+
+        page = FakePage()
+
+        with patch("app.config.Config.READINESS_STRATEGY", "quiescence"):
+            _, timings = asyncio.run(goto_and_wait(page, "https://example.com"))
+
+        assert page.goto_kwargs["waitUntil"] == "domcontentloaded"
+        assert timings["status"] == 200
+        assert timings["ready_reason"] == "quiet"
+        assert timings["strategy"] == "quiescence"
+        assert timings["navigate_ms"] >= 0
+        assert timings["ready_ms"] >= 0
+
+    def test_playwright_uses_its_keyword(self):
+        from app.tasks.readiness import goto_and_wait
+
+        page = FakePage()
+
+        with (
+            patch("app.config.Config.READINESS_STRATEGY", "networkidle"),
+            patch(
+                "app.tasks.readiness.wait_until_ready",
+                AsyncMock(return_value="fixed"),
+            ),
+        ):
+            asyncio.run(goto_and_wait(page, "https://example.com", playwright=True))
+
+        assert page.goto_kwargs["wait_until"] == "networkidle"
+
+    def test_unknown_strategy_falls_back_to_quiescence(self):
+        from app.tasks.readiness import goto_and_wait
+
+        page = FakePage()
+
+        with patch("app.config.Config.READINESS_STRATEGY", "bogus"):
+            _, timings = asyncio.run(goto_and_wait(page, "https://example.com"))
+
+        assert timings["strategy"] == "quiescence"
@@ -186,6 +186,41 @@ class TestMainRoutes:
 
             assert response.status_code == 200
 
+    def test_view_diff_leaves_views_to_tabs(self, client):
+        with (
+            patch(
+                "app.repositories.diff_repository.DiffRepository.get_by_id"
+            ) as mock_diff,
+            patch("app.services.link_service.LinkService.get_link") as mock_link,
+            patch(
+                "app.repositories.diff_repository.DiffRepository.get_previous"
+            ) as mock_prev,
+            patch(
+                "app.repositories.diff_repository.InitialPageRepository.get_by_link"
+            ) as mock_initial,
+            patch(
+                "app.services.check_service.CheckService._compute_html_diff"
+            ) as mock_html,
+            patch(
+                "app.services.check_service.CheckService._generate_paragraph_diff"
+            ) as mock_para,
+        ):
+            mock_diff.return_value = {
+                "id": 1,
+                "link_id": 1,
+                "full_content": "<html><body>New</body></html>",
+            }
+            mock_link.return_value = {"id": 1, "url": "https://example.com"}
+            mock_prev.return_value = {"full_content": "<html><body>Old</body></html>"}
+            mock_initial.return_value = None
+
+            response = client.get("/diff/1")
+
+            assert response.status_code == 200
+            assert b'data-diff-id="1"' in response.data
+            mock_html.assert_not_called()
+            mock_para.assert_not_called()
+
     def test_view_initial_not_found(self, client):
         with patch(
             "app.repositories.diff_repository.InitialPageRepository.get_by_link"
@@ -258,6 +293,40 @@ class TestMainRoutes:
         assert response.status_code == 200
 
 
+class TestScreenshotRoute:
+    def test_manifest_stitched_on_demand(self, client, tmp_path):
+        from PIL import Image
+        from app.utils.screenshot_utils import store_screenshot
+
+        Image.new("RGB", (200, 1200), "white").save(tmp_path / "temp.png")
+        filename = store_screenshot(
+            (tmp_path / "temp.png").read_bytes(), str(tmp_path)
+        )["filename"]
+
+        with patch("app.utils.screenshot_utils.SCREENSHOT_DIR", str(tmp_path)):
+            response = client.get(f"/screenshots/{filename}")
+            with patch("app.utils.screenshot_utils.load_screenshot") as mock_load:
+                again = client.get(f"/screenshots/{filename}")
+
+        assert response.status_code == 200
+        assert response.mimetype == "image/webp"
+        assert (tmp_path / filename.replace(".json", ".full.webp")).exists()
+        assert again.status_code == 200
+        mock_load.assert_not_called()
+
+    def test_plain_file_redirects_to_static(self, client):
+        response = client.get("/screenshots/ab/abc.webp")
+
+        assert response.status_code == 302
+        assert response.location.endswith("/static/screenshots/ab/abc.webp")
+
+    def test_missing_manifest(self, client, tmp_path):
+        with patch("app.utils.screenshot_utils.SCREENSHOT_DIR", str(tmp_path)):
+            response = client.get("/screenshots/ab/abc.json")
+
+        assert response.status_code == 404
+
+
 class TestApiRoutes:
     def test_health_endpoint(self, client):
         with patch(
@@ -293,3 +362,224 @@ class TestApiRoutes:
             response = client.get("/api/check/1?screenshot=true")
 
             assert response.status_code == 200
+
+
+class TestBatchCheckRoute:
+    def test_batch_with_link_ids(self, client):
+        with patch(
+            "app.services.check_service.CheckService.check_many_async"
+        ) as mock_batch:
+            mock_batch.return_value = {"success": True, "task_id": "abc", "count": 2}
+
+            response = client.post("/api/check/batch", json={"link_ids": [1, 2]})
+
+            assert response.status_code == 200
+            mock_batch.assert_called_once_with(link_ids=[1, 2], project_id=None)
+
+    def test_batch_invalid_ids(self, client):
+        response = client.post("/api/check/batch", json={"link_ids": ["x"]})
+
+        assert response.status_code == 400
+
+    def test_batch_no_links(self, client):
+        with patch(
+            "app.services.check_service.CheckService.check_many_async"
+        ) as mock_batch:
+            mock_batch.return_value = {"success": False, "error": "No links to check"}
+
+            response = client.post("/api/check/batch", json={"project_id": 5})
+
+            assert response.status_code == 400
+
+
+class TestProjectInterceptionRoute:
+    def test_update_rules(self, client):
+        with patch(
+            "app.services.project_service.ProjectRepository.update"
+        ) as mock_update:
+            mock_update.return_value = {"id": 2, "blocked_domains": "ads.test"}
+
+            response = client.put(
+                "/api/project/2/interception",
+                json={
+                    "blocked_resource_types": ["image"],
+                    "blocked_domains": ["ads.test"],
+                },
+            )
+
+            assert response.status_code == 200
+            mock_update.assert_called_once_with(
+                2, blocked_resource_types="image", blocked_domains="ads.test"
+            )
+
+    def test_partial_update_keeps_other_rule(self, client):
+        with patch(
+            "app.services.project_service.ProjectRepository.update"
+        ) as mock_update:
+            mock_update.return_value = {"id": 2, "blocked_domains": "ads.test"}
+
+            response = client.put(
+                "/api/project/2/interception",
+                json={"blocked_resource_types": ["font"]},
+            )
+
+            assert response.status_code == 200
+            mock_update.assert_called_once_with(2, blocked_resource_types="font")
+
+    def test_rejects_non_list(self, client):
+        response = client.put(
+            "/api/project/2/interception", json={"blocked_domains": "ads.test"}
+        )
+
+        assert response.status_code == 400
+
+    def test_unknown_project(self, client):
+        with patch(
+            "app.services.project_service.ProjectRepository.update", return_value=None
+        ):
+            response = client.put("/api/project/99/interception", json={})
+
+            assert response.status_code == 404
+
+
+class TestLinkDiffAlgorithmRoute:
+    def test_update_algorithm(self, client):
+        with patch("app.services.link_service.LinkRepository.update") as mock_update:
+            mock_update.return_value = {"id": 3, "diff_algorithm": "patience"}
+
+            response = client.put(
+                "/api/link/3/diff-algorithm", json={"algorithm": "patience"}
+            )
+
+            assert response.status_code == 200
+            mock_update.assert_called_once_with(3, diff_algorithm="patience")
+
+    def test_rejects_unknown_algorithm(self, client):
+        response = client.put("/api/link/3/diff-algorithm", json={"algorithm": "lcs"})
+
+        assert response.status_code == 400
+
+    def test_unknown_link(self, client):
+        with patch(
+            "app.services.link_service.LinkRepository.update", return_value=None
+        ):
+            response = client.put("/api/link/99/diff-algorithm", json={})
+
+            assert response.status_code == 404
+
+
+class TestDiffViewRoute:
+    def _context(self, previous=True):
+        return {
+            "diff": {"id": 1, "link_id": 1, "content_hash": "new"},
+            "link": {"id": 1, "url": "https://example.com"},
+            "previous": {"id": 0, "content_hash": "old"} if previous else None,
+            "initial": None,
+        }
+
+    def test_fragment_with_etag(self, client):
+        from app.services import DiffViewService
+
+        with (
+            patch.object(DiffViewService, "get_context", return_value=self._context()),
+            patch(
+                "app.repositories.DiffArtifactRepository.get_by_diff",
+                return_value={"code": "<div>stored code</div>"},
+            ),
+        ):
+            response = client.get("/api/diff/1/code")
+
+        assert response.status_code == 200
+        assert response.mimetype == "text/html"
+        assert response.data == b"<div>stored code</div>"
+        assert response.headers["ETag"]
+        assert "max-age" in response.headers["Cache-Control"]
+
+    def test_stale_artifacts_rerendered_after_algorithm_change(self, client):
+        from app.services import DiffViewService
+        from app.services.diff_cache import DiffCache
+
+        context = self._context()
+        stored = DiffCache.keys(
+            context["previous"], context["diff"], context["link"], ["code"]
+        )
+        context["link"]["diff_algorithm"] = "patience"
+
+        def get_by_diff(diff_id, keys):
+            return {
+                mode: "<div>stale</div>"
+                for mode, key in keys.items()
+                if stored.get(mode) == key
+            }
+
+        with (
+            patch.object(DiffViewService, "get_context", return_value=context),
+            patch(
+                "app.repositories.DiffArtifactRepository.get_by_diff",
+                side_effect=get_by_diff,
+            ),
+            patch.object(
+                DiffCache, "render", return_value={"code": "<div>fresh</div>"}
+            ) as mock_render,
+        ):
+            response = client.get("/api/diff/1/code")
+
+        assert response.data == b"<div>fresh</div>"
+        assert response.headers["ETag"].strip('"') != stored["code"]
+        mock_render.assert_called_once()
+
+    def test_matching_etag_skips_render(self, client):
+        from app.services import DiffViewService
+
+        context = self._context()
+        etag = DiffViewService.etag(context, "html")
+        with (
+            patch.object(DiffViewService, "get_context", return_value=context),
+            patch.object(DiffViewService, "render") as mock_render,
+        ):
+            response = client.get(
+                "/api/diff/1/html", headers={"If-None-Match": f'"{etag}"'}
+            )
+
+        assert response.status_code == 304
+        mock_render.assert_not_called()
+
+    def test_price_as_json(self, client):
+        from app.services import DiffViewService
+
+        with (
+            patch.object(
+                DiffViewService, "get_context", return_value=self._context(False)
+            ),
+            patch(
+                "app.services.check_service.CheckService._extract_price",
+                return_value=None,
+            ),
+        ):
+            response = client.get("/api/diff/1/price")
+
+        assert response.status_code == 200
+        assert response.get_json() == {"previous": None, "current": None}
+
+    def test_missing_view_is_empty(self, client):
+        from app.services import DiffViewService
+
+        with patch.object(
+            DiffViewService, "get_context", return_value=self._context(False)
+        ):
+            response = client.get("/api/diff/1/paragraph")
+
+        assert response.status_code == 204
+
+    def test_unknown_mode(self, client):
+        response = client.get("/api/diff/1/screenshot")
+
+        assert response.status_code == 400
+
+    def test_unknown_diff(self, client):
+        from app.services import DiffViewService
+
+        with patch.object(DiffViewService, "get_context", return_value=None):
+            response = client.get("/api/diff/99/code")
+
+        assert response.status_code == 404
@@ -0,0 +1,99 @@
+import os
+import time
+import pytest
+from unittest.mock import patch
+
+
+def _touch(path, age=7200):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * 10)
+    stamp = time.time() - age
+    os.utime(path, (stamp, stamp))
+
+
+class TestCollectGarbage:
+    def test_removes_only_unreferenced(self, tmp_path):
+        from app.services.screenshot_store import ScreenshotStore
+
+        _touch(tmp_path / "ab" / "abc.webp")
+        _touch(tmp_path / "ab" / "abc.thumb.webp")
+        _touch(tmp_path / "cd" / "cde.webp")
+        _touch(tmp_path / "cd" / "cde.thumb.webp")
+        _touch(tmp_path / "diff_1.webp")
+
+        with patch(
+            "app.repositories.ScreenshotRepository.ref_counts",
+            return_value={"ab/abc.webp": 2, "diff_1.webp": 1},
+        ):
+            stats = ScreenshotStore.collect_garbage(str(tmp_path), grace_seconds=60)
+
+        assert stats == {"removed": 2, "kept": 3, "bytes_freed": 20}
+        assert (tmp_path / "ab" / "abc.thumb.webp").exists()
+        assert (tmp_path / "diff_1.webp").exists()
+        assert not (tmp_path / "cd").exists()
+
+    def test_manifest_tiles_kept(self, tmp_path):
+        from app.services.screenshot_store import ScreenshotStore
+
+        _touch(tmp_path / "ab" / "abc.json")
+        (tmp_path / "ab" / "abc.json").write_text('{"tiles": ["t1/t1.webp"]}')
+        _touch(tmp_path / "t1" / "t1.webp")
+        _touch(tmp_path / "t2" / "t2.webp")
+
+        with patch(
+            "app.repositories.ScreenshotRepository.ref_counts",
+            return_value={"ab/abc.json": 1},
+        ):
+            stats = ScreenshotStore.collect_garbage(str(tmp_path), grace_seconds=60)
+
+        assert stats["removed"] == 1
+        assert (tmp_path / "t1" / "t1.webp").exists()
+        assert not (tmp_path / "t2").exists()
+
+    def test_unreadable_manifest_aborts(self, tmp_path):
+        from app.services.screenshot_store import ScreenshotStore
+
+        _touch(tmp_path / "ab" / "abc.json")
+        _touch(tmp_path / "t1" / "t1.webp")
+
+        with (
+            patch(
+                "app.repositories.ScreenshotRepository.ref_counts",
+                return_value={"ab/abc.json": 1},
+            ),
+            pytest.raises(ValueError),
+        ):
+            ScreenshotStore.collect_garbage(str(tmp_path), grace_seconds=60)
+
+        assert (tmp_path / "t1" / "t1.webp").exists()
+
+    def test_recent_files_kept(self, tmp_path):
+        from app.services.screenshot_store import ScreenshotStore
+
+        _touch(tmp_path / "temp_abc.png", age=10)
+
+        with patch("app.repositories.ScreenshotRepository.ref_counts", return_value={}):
+            stats = ScreenshotStore.collect_garbage(str(tmp_path), grace_seconds=60)
+
+        assert stats["removed"] == 0
+        assert (tmp_path / "temp_abc.png").exists()
+
+    def test_missing_directory(self, tmp_path):
+        from app.services.screenshot_store import ScreenshotStore
+
+        stats = ScreenshotStore.collect_garbage(str(tmp_path / "missing"))
+
+        assert stats == {"removed": 0, "kept": 0, "bytes_freed": 0}
+
+
+class TestGcTask:
+    def test_task_reports_stats(self):
+        from app.tasks.maintenance_tasks import gc_screenshots_task
+
+        with patch(
+            "app.services.screenshot_store.ScreenshotStore.collect_garbage",
+            return_value={"removed": 1, "kept": 0, "bytes_freed": 5},
+        ):
+            result = gc_screenshots_task.run()
+
+        assert result == {"success": True, "removed": 1, "kept": 0, "bytes_freed": 5}
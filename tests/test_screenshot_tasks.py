@@ -0,0 +1,120 @@
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+
+def _fake_page(height=1200):
+    from app.utils.screenshot_utils import MAX_HEIGHT_JS
+
+    page = MagicMock()
+    page.url = "https://example.com/final"
+    for name in (
+        "setRequestInterception",
+        "setExtraHTTPHeaders",
+        "setCacheEnabled",
+        "setViewport",
+        "screenshot",
+    ):
+        setattr(page, name, AsyncMock())
+    page.screenshot.return_value = b"png"
+    page.evaluate = AsyncMock(
+        side_effect=lambda script: (
+            height if script == MAX_HEIGHT_JS else "<html><body>Hi</body></html>"
+        )
+    )
+    return page
+
+
+def _patched(page):
+    @asynccontextmanager
+    async def open_page(extra_args=None):
+        yield page
+
+    response = MagicMock(status=200, headers={"content-type": "text/html"})
+    timings = {"status": 200, "navigate_ms": 1, "ready_ms": 1}
+    return (
+        patch("app.tasks.screenshot_tasks._open_page", open_page),
+        patch(
+            "app.tasks.screenshot_tasks.goto_and_wait",
+            AsyncMock(return_value=(response, timings)),
+        ),
+    )
+
+
+class TestSingleRender:
+    def test_html_and_screenshot_from_one_page(self):
+        from app.tasks.screenshot_tasks import fetch_url_async
+
+        page = _fake_page()
+        open_patch, goto_patch = _patched(page)
+
+        with open_patch, goto_patch as mock_goto:
+            result = asyncio.run(
+                fetch_url_async("https://example.com", screenshot=True)
+            )
+
+        assert result["success"] is True
+        assert result["content"] == "<html><body>Hi</body></html>"
+        assert result["screenshot"] == b"png"
+        assert result["final_url"] == "https://example.com/final"
+        assert result["headers"] == {"content-type": "text/html"}
+        assert result["status"] == 200
+        mock_goto.assert_awaited_once()
+        page.screenshot.assert_awaited_once_with(fullPage=True)
+        page.setViewport.assert_awaited_once_with({"width": 1920, "height": 1080})
+
+    def test_html_only_skips_screenshot(self):
+        from app.tasks.screenshot_tasks import fetch_url_async
+
+        page = _fake_page()
+        open_patch, goto_patch = _patched(page)
+
+        with open_patch, goto_patch:
+            result = asyncio.run(fetch_url_async("https://example.com"))
+
+        assert result["screenshot"] is None
+        page.screenshot.assert_not_awaited()
+        page.setViewport.assert_awaited_once_with({"width": 800, "height": 600})
+
+    def test_screenshot_failure_keeps_html(self):
+        from app.tasks.screenshot_tasks import fetch_url_async
+
+        page = _fake_page()
+        page.screenshot.side_effect = RuntimeError("too tall")
+        open_patch, goto_patch = _patched(page)
+
+        with open_patch, goto_patch:
+            result = asyncio.run(
+                fetch_url_async("https://example.com", screenshot=True)
+            )
+
+        assert result["success"] is True
+        assert result["screenshot"] is None
+
+    def test_screenshot_rules_keep_images(self):
+        from app.tasks.interception import InterceptionRules
+
+        rules = InterceptionRules(blocked_types=["image"], blocked_domains=["ads.test"])
+        shot_rules = rules.for_screenshot()
+
+        assert shot_rules.block_reason("https://example.com/a.png", "image") is None
+        assert shot_rules.block_reason("https://ads.test/a.js", "script") == "domain"
+
+    def test_tall_page_capped(self):
+        from app.tasks.screenshot_tasks import fetch_url_async
+
+        page = _fake_page(height=50000)
+        open_patch, goto_patch = _patched(page)
+
+        with (
+            open_patch,
+            goto_patch,
+            patch("app.config.Config.SCREENSHOT_MAX_HEIGHT", 8000),
+        ):
+            result = asyncio.run(
+                fetch_url_async("https://example.com", screenshot=True)
+            )
+
+        assert result["screenshot"] == b"png"
+        page.screenshot.assert_awaited_once_with()
+        page.setViewport.assert_awaited_with({"width": 1920, "height": 8000})
@@ -0,0 +1,232 @@
+import io
+from unittest.mock import patch
+
+from PIL import Image, ImageDraw
+
+
+def _encoded(image):
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def _png(width=1920, height=3000, color=(240, 240, 240)):
+    return _encoded(Image.new("RGB", (width, height), color))
+
+
+def _page_image():
+    image = Image.new("RGB", (1920, 3000), "white")
+    for y in range(0, 3000, 100):
+        image.paste((y % 255, 80, 160), (0, y, 1920, y + 10))
+    return image
+
+
+class TestStoreScreenshot:
+    def test_tiled_manifest_with_thumbnail(self, tmp_path):
+        from app.utils.screenshot_utils import store_screenshot, read_manifest
+
+        filename = store_screenshot(_png(), str(tmp_path))["filename"]
+
+        prefix, name = filename.split("/")
+        assert name.endswith(".json") and name.startswith(prefix)
+        assert len(name) == 64 + len(".json")
+        manifest = read_manifest(filename, str(tmp_path))
+        assert (manifest["width"], manifest["height"]) == (1920, 3000)
+        assert len(manifest["tiles"]) == 6
+        assert len(set(manifest["tiles"])) == 2
+        with Image.open(tmp_path / manifest["tiles"][0]) as tile:
+            assert tile.format == "WEBP"
+            assert tile.size == (1920, 512)
+        with Image.open(tmp_path / filename.replace(".json", ".thumb.webp")) as thumb:
+            assert thumb.size == (320, 200)
+
+    def test_only_changed_tiles_written(self, tmp_path):
+        from app.utils.screenshot_utils import store_screenshot, read_manifest
+
+        first = store_screenshot(_encoded(_page_image()), str(tmp_path))["filename"]
+        changed = _page_image()
+        ImageDraw.Draw(changed).rectangle((10, 1100, 200, 1150), fill=(255, 0, 0))
+
+        second = store_screenshot(_encoded(changed), str(tmp_path))["filename"]
+
+        old = read_manifest(first, str(tmp_path))["tiles"]
+        new = read_manifest(second, str(tmp_path))["tiles"]
+        assert [a == b for a, b in zip(old, new)] == [
+            True,
+            True,
+            False,
+            True,
+            True,
+            True,
+        ]
+        tiles = [p for p in tmp_path.rglob("*.webp") if ".thumb" not in p.name]
+        assert len(tiles) == 7
+
+    def test_identical_pixels_deduplicated(self, tmp_path):
+        from app.utils.screenshot_utils import store_screenshot
+
+        first = store_screenshot(_png(), str(tmp_path))
+        second = store_screenshot(_png(), str(tmp_path))
+        other = store_screenshot(_png(color=(0, 0, 0)), str(tmp_path))
+
+        assert first["filename"] == second["filename"]
+        assert other["filename"] != first["filename"]
+        assert len(list(tmp_path.rglob("*.json"))) == 2
+
+    def test_reuse_refreshes_tiles(self, tmp_path):
+        import os
+        from app.utils.screenshot_utils import store_screenshot, read_manifest
+
+        filename = store_screenshot(_encoded(_page_image()), str(tmp_path))["filename"]
+        tiles = read_manifest(filename, str(tmp_path))["tiles"]
+        for path in tmp_path.rglob("*.*"):
+            os.utime(path, (0, 0))
+        os.remove(tmp_path / tiles[2])
+
+        again = store_screenshot(_encoded(_page_image()), str(tmp_path))
+
+        assert again["filename"] == filename
+        assert (tmp_path / tiles[2]).exists()
+        assert all((tmp_path / tile).stat().st_mtime > 0 for tile in tiles)
+
+    def test_load_reassembles_tiles(self, tmp_path):
+        from app.utils.screenshot_utils import store_screenshot, load_screenshot
+
+        original = _page_image()
+
+        with patch("app.config.Config.SCREENSHOT_FORMAT", "png"):
+            filename = store_screenshot(_encoded(original), str(tmp_path))["filename"]
+
+        image = load_screenshot(filename, str(tmp_path))
+        assert image.size == (1920, 3000)
+        assert image.tobytes() == original.tobytes()
+
+    def test_strips_read_tiles_lazily(self, tmp_path):
+        from app.utils.screenshot_utils import (
+            ScreenshotStrips,
+            store_screenshot,
+            stitch_screenshot,
+        )
+
+        original = _page_image()
+        with patch("app.config.Config.SCREENSHOT_FORMAT", "png"):
+            filename = store_screenshot(_encoded(original), str(tmp_path))["filename"]
+        stitch_screenshot(filename, str(tmp_path))
+
+        with patch("PIL.Image.open", wraps=Image.open) as mock_open:
+            strips = ScreenshotStrips(filename, str(tmp_path))
+            box = (0, 900, 1920, 1300)
+            strip = strips.crop(box)
+
+        opened = [str(call.args[0]) for call in mock_open.call_args_list]
+        assert (strips.width, strips.height) == (1920, 3000)
+        assert strip.tobytes() == original.crop(box).tobytes()
+        assert len(opened) == 2
+        assert not any(path.endswith(".full.webp") for path in opened)
+
+    def test_strips_scaled_to_width(self, tmp_path):
+        from app.utils.screenshot_utils import ScreenshotStrips, store_screenshot
+
+        filename = store_screenshot(_encoded(_page_image()), str(tmp_path))["filename"]
+
+        strips = ScreenshotStrips(filename, str(tmp_path), width=960)
+
+        assert (strips.width, strips.height) == (960, 1500)
+        assert strips.crop((0, 0, 960, 1500)).size == (960, 1500)
+
+    def test_height_capped(self, tmp_path):
+        from app.utils.screenshot_utils import store_screenshot, load_screenshot
+
+        with patch("app.config.Config.SCREENSHOT_MAX_HEIGHT", 1000):
+            filename = store_screenshot(_png(width=200, height=5000), str(tmp_path))[
+                "filename"
+            ]
+
+        assert load_screenshot(filename, str(tmp_path)).size == (200, 1000)
+
+    def test_unreadable_capture_stored_as_is(self, tmp_path):
+        from app.utils.screenshot_utils import store_screenshot
+
+        filename = store_screenshot(b"not an image", str(tmp_path))["filename"]
+
+        assert filename.endswith(".png")
+        assert (tmp_path / filename).read_bytes() == b"not an image"
+        assert not list(tmp_path.rglob("*.part"))
+
+
+class TestPerceptualHash:
+    def test_similar_capture_not_stored(self, tmp_path):
+        from app.utils.screenshot_utils import store_screenshot
+
+        first = store_screenshot(_png(), str(tmp_path))
+
+        second = store_screenshot(
+            _png(color=(241, 240, 240)), str(tmp_path), first["hash"]
+        )
+
+        assert second == {"filename": None, "hash": first["hash"], "similar": True}
+        assert len(list(tmp_path.rglob("*.json"))) == 1
+
+    def test_visible_change_stored(self, tmp_path):
+        from app.utils.screenshot_utils import store_screenshot, hash_distance
+
+        first = store_screenshot(_png(), str(tmp_path))
+        image = Image.new("RGB", (1920, 3000), (240, 240, 240))
+        ImageDraw.Draw(image).rectangle((0, 1000, 1919, 1400), fill=(0, 0, 0))
+
+        second = store_screenshot(_encoded(image), str(tmp_path), first["hash"])
+
+        assert second["filename"] and second["filename"] != first["filename"]
+        assert hash_distance(first["hash"], second["hash"]) > 2
+
+    def test_small_text_change_stored(self, tmp_path):
+        from app.utils.screenshot_utils import store_screenshot
+
+        def page(total):
+            image = Image.new("RGB", (1920, 3000), "white")
+            draw = ImageDraw.Draw(image)
+            for y in range(40, 3000, 24):
+                draw.text((40, y), "Lorem ipsum dolor sit amet " * 6, fill=(30, 30, 30))
+            draw.rectangle((40, 600, 1880, 640), fill="white")
+            draw.text((40, 610), f"Total: {total}", fill=(30, 30, 30))
+            return _encoded(image)
+
+        first = store_screenshot(page("$19.99"), str(tmp_path))
+        second = store_screenshot(page("$119.99"), str(tmp_path), first["hash"])
+
+        assert second["filename"] and second["filename"] != first["filename"]
+
+    def test_distance_of_different_shapes(self):
+        from app.utils.screenshot_utils import perceptual_hash, hash_distance
+
+        def grid(*cells):
+            image = Image.new("L", (2, 2))
+            image.putdata(cells)
+            return perceptual_hash(image)
+
+        with patch("app.config.Config.SCREENSHOT_HASH_SIZE", 2):
+            first = grid(240, 255, 255, 255)
+            second = grid(242, 254, 255, 255)
+
+        assert first.startswith("2x2:")
+        assert hash_distance(first, "4x2:" + first.partition(":")[2]) is None
+        assert hash_distance(None, first) is None
+        assert hash_distance(first, second) == 2
+
+    def test_hashes_from_older_versions_never_match(self):
+        from app.utils.screenshot_utils import hash_distance
+
+        assert hash_distance("1x2:f0ff", "1x2:f0ff") is None
+
+    def test_tall_capture_hash_stays_compact(self, tmp_path):
+        from app.utils.screenshot_utils import store_screenshot
+
+        image = Image.new("RGB", (1920, 10000), "white")
+        draw = ImageDraw.Draw(image)
+        for y in range(40, 10000, 24):
+            draw.text((40, y), "Lorem ipsum dolor sit amet " * 6, fill=(30, 30, 30))
+
+        stored = store_screenshot(_encoded(image), str(tmp_path))
+
+        assert stored["hash"].startswith("256x64:")
+        assert len(stored["hash"]) < 4096
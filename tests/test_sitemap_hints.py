@@ -0,0 +1,218 @@
+import gzip
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from aiohttp import web
+
+URLSET = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://docs.test/a/</loc><lastmod>2024-01-02T10:00:00+00:00</lastmod></url>
+  <url><loc>https://docs.test/b</loc><lastmod>2024-01-03</lastmod></url>
+  <url><loc>https://docs.test/c</loc></url>
+  <url><loc>https://docs.test/unwatched</loc><lastmod>2024-01-04</lastmod></url>
+</urlset>"""
+
+INDEX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>{origin}/old.xml</loc><lastmod>2020-01-01</lastmod></sitemap>
+  <sitemap><loc>{origin}/pages.xml.gz</loc><lastmod>2024-01-05</lastmod></sitemap>
+</sitemapindex>"""
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><link>https://news.test/</link>
+  <item><link>https://news.test/story</link><pubDate>Tue, 02 Jan 2024 10:00:00 GMT</pubDate></item>
+</channel></rss>"""
+
+ATOM = b"""<?xml version="1.0"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><link href="https://blog.test/"/>
+  <entry><link href="https://blog.test/post"/><updated>2024-01-02T10:00:00Z</updated></entry>
+</feed>"""
+
+
+def _local(value):
+    from app.services.sitemap_hints import parse_timestamp
+
+    return parse_timestamp(value)
+
+
+class TestLastmodParser:
+    def test_urlset_in_small_chunks(self):
+        from app.services.sitemap_hints import LastmodParser
+
+        parser = LastmodParser(
+            {"https://docs.test/a", "https://docs.test/b", "https://docs.test/c"}
+        )
+        for i in range(0, len(URLSET), 7):
+            parser.feed(URLSET[i : i + 7])
+        parser.close()
+
+        assert parser.entries == {
+            "https://docs.test/a": _local("2024-01-02T10:00:00+00:00"),
+            "https://docs.test/b": _local("2024-01-03"),
+        }
+
+    def test_sitemap_index_lists_children(self):
+        from app.services.sitemap_hints import LastmodParser
+
+        parser = LastmodParser()
+        parser.feed(INDEX.replace(b"{origin}", b"https://docs.test"))
+        parser.close()
+
+        assert [url for url, _ in parser.sitemaps] == [
+            "https://docs.test/old.xml",
+            "https://docs.test/pages.xml.gz",
+        ]
+        assert parser.entries == {}
+
+    @pytest.mark.parametrize(
+        "document,url",
+        [(RSS, "https://news.test/story"), (ATOM, "https://blog.test/post")],
+    )
+    def test_feeds(self, document, url):
+        from app.services.sitemap_hints import LastmodParser
+
+        parser = LastmodParser()
+        parser.feed(document)
+        parser.close()
+
+        assert parser.entries == {url: _local("2024-01-02T10:00:00+00:00")}
+
+    def test_date_only_counts_as_end_of_day(self):
+        assert _local("2024-01-03") == _local("2024-01-03T23:59:59+00:00")
+        assert _local("not a date") is None
+
+
+def _make_app(fetched):
+    async def robots(request):
+        return web.Response(
+            text=f"User-agent: *\nSitemap: {request.url.origin()}/index.xml\n"
+        )
+
+    async def index(request):
+        origin = str(request.url.origin()).encode()
+        return web.Response(body=INDEX.replace(b"{origin}", origin))
+
+    async def pages(request):
+        return web.Response(
+            body=gzip.compress(URLSET), content_type="application/x-gzip"
+        )
+
+    async def old(request):
+        fetched.append(request.path)
+        return web.Response(body=URLSET)
+
+    app = web.Application()
+    app.router.add_get("/robots.txt", robots)
+    app.router.add_get("/index.xml", index)
+    app.router.add_get("/pages.xml.gz", pages)
+    app.router.add_get("/old.xml", old)
+    return app
+
+
+class TestCollectLastmods:
+    def test_follows_robots_index_and_gzip(self):
+        from app.services.sitemap_hints import collect_lastmods
+        from app.tasks.http_fetch import close_http_session
+
+        fetched = []
+
+        async def scenario():
+            app = _make_app(fetched)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+            try:
+                result = await collect_lastmods(
+                    f"http://127.0.0.1:{port}",
+                    {"https://docs.test/a"},
+                    since=_local("2023-01-01"),
+                )
+                return result
+            finally:
+                await close_http_session()
+                await runner.cleanup()
+
+        result = asyncio.run(scenario())
+
+        assert result["files"] == 2
+        assert result["error"] is None
+        assert result["entries"] == {
+            "https://docs.test/a": _local("2024-01-02T10:00:00+00:00")
+        }
+        assert fetched == []
+
+
+class TestKnownUnchanged:
+    def _link(self, hint, checked, error=None):
+        return {
+            "lastmod_hint": hint.isoformat() if hint else None,
+            "last_checked": checked.isoformat() if checked else None,
+            "last_error": error,
+        }
+
+    def test_rules(self):
+        from app.services.sitemap_hints import SitemapHintService
+
+        now = datetime.now()
+        hour = timedelta(hours=1)
+        known = SitemapHintService.is_known_unchanged
+
+        assert known(self._link(now - 2 * hour, now - hour)) is True
+        assert known(self._link(now - hour / 2, now - hour)) is False
+        assert known(self._link(None, now - hour)) is False
+        assert known(self._link(now - 2 * hour, now - hour, error="x")) is False
+        assert known(self._link(now - 48 * hour, now - 30 * hour)) is False
+
+
+class TestCheckManyHints:
+    def test_skips_links_unchanged_per_sitemap(self):
+        from app.tasks import batch_tasks
+
+        checked = datetime.now() - timedelta(hours=1)
+        links = {
+            i: {
+                "id": i,
+                "url": f"https://docs.test/{i}",
+                "last_checked": checked.isoformat(),
+                "lastmod_hint": None,
+                "last_error": None,
+            }
+            for i in range(2)
+        }
+
+        async def fake_run(self, items, results):
+            for link, _ in items:
+                results.put(
+                    (link, {"conditional": {}, "fetch_result": {"success": True}})
+                )
+
+        with (
+            patch(
+                "app.repositories.LinkRepository.get_by_id",
+                side_effect=lambda i: links.get(i),
+            ),
+            patch.object(
+                batch_tasks.SitemapHintService,
+                "refresh",
+                return_value={0: (checked - timedelta(days=1)).isoformat()},
+            ),
+            patch.object(batch_tasks.FetchRouter, "plan"),
+            patch.object(batch_tasks.BatchFetcher, "run", fake_run),
+            patch.object(
+                batch_tasks.CheckServiceCelery,
+                "_process_fetch_result",
+                return_value={"success": True, "has_changes": True},
+            ) as mock_process,
+            patch("app.repositories.CheckEventRepository.create") as mock_event,
+        ):
+            summary = batch_tasks.check_many([0, 1])
+
+        assert summary["hinted"] == 1
+        assert summary["unchanged"] == 1
+        assert summary["changed"] == 1
+        assert mock_process.call_count == 1
+        mock_event.assert_called_once_with(0, "sitemap_unchanged")
@@ -0,0 +1,109 @@
+import io
+import pytest
+from unittest.mock import patch
+
+from PIL import Image, ImageDraw
+
+
+def _page(path, height=1000, boxes=(), width=400):
+    image = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(image)
+    for y in range(0, height, 40):
+        draw.line((0, y, width, y), fill=(200, 200, 200))
+    for box in boxes:
+        draw.rectangle(box, fill=(0, 0, 0))
+    image.save(path, "PNG")
+    return str(path)
+
+
+class TestCompareScreenshots:
+    def test_identical(self, tmp_path):
+        from app.utils.visual_diff import compare_screenshots
+
+        _page(tmp_path / "a.png")
+        _page(tmp_path / "b.png")
+
+        result = compare_screenshots("a.png", "b.png", str(tmp_path))
+
+        assert result["changed_percent"] == 0
+        assert result["regions"] == []
+        assert result["heatmap"] is None
+
+    def test_changed_regions_boxed(self, tmp_path):
+        from app.utils.visual_diff import compare_screenshots
+
+        _page(tmp_path / "a.png")
+        _page(tmp_path / "b.png", boxes=[(10, 100, 49, 139), (300, 700, 379, 759)])
+
+        with patch("app.config.Config.VISUAL_DIFF_STRIP", 64):
+            result = compare_screenshots("a.png", "b.png", str(tmp_path))
+
+        assert result["region_count"] == 2
+        assert result["regions"][0] == {"x": 288, "y": 688, "width": 96, "height": 80}
+        assert result["regions"][1] == {"x": 0, "y": 96, "width": 64, "height": 48}
+        assert result["changed_percent"] == pytest.approx(
+            100 * (40 * 40 + 80 * 60) / (400 * 1000), abs=0.01
+        )
+        with Image.open(io.BytesIO(result["heatmap"])) as heatmap:
+            assert heatmap.size == (25, 63)
+            assert heatmap.getpixel((20, 44))[3] > 0
+            assert heatmap.getpixel((20, 10))[3] == 0
+
+    def test_inserted_content_does_not_mark_shifted_footer(self, tmp_path):
+        from app.utils.visual_diff import compare_screenshots
+
+        before = Image.new("RGB", (200, 600), "white")
+        ImageDraw.Draw(before).rectangle((0, 500, 199, 599), fill=(0, 0, 255))
+        before.save(tmp_path / "a.png")
+        after = Image.new("RGB", (200, 700), "white")
+        ImageDraw.Draw(after).rectangle((0, 300, 199, 399), fill=(255, 0, 0))
+        ImageDraw.Draw(after).rectangle((0, 600, 199, 699), fill=(0, 0, 255))
+        after.save(tmp_path / "b.png")
+
+        result = compare_screenshots("a.png", "b.png", str(tmp_path))
+
+        assert all(r["y"] + r["height"] <= 608 for r in result["regions"])
+        assert result["changed_percent"] < 100 * 300 / 700
+
+
+class TestVisualDiff:
+    def test_same_blob_short_circuits(self, tmp_path):
+        from app.utils.visual_diff import visual_diff
+
+        assert visual_diff("ab/abc.webp", "ab/abc.webp", str(tmp_path)) == {
+            "changed_percent": 0.0,
+            "regions": [],
+            "heatmap": None,
+        }
+
+    def test_missing_previous(self, tmp_path):
+        from app.utils.visual_diff import visual_diff
+
+        assert visual_diff(None, "ab/abc.webp", str(tmp_path)) is None
+        assert visual_diff("cd/cde.webp", "ab/abc.webp", str(tmp_path)) is None
+
+    def test_heatmap_stored_as_blob(self, tmp_path):
+        from app.utils.visual_diff import visual_diff
+
+        _page(tmp_path / "a.png")
+        _page(tmp_path / "b.png", boxes=[(0, 0, 99, 99)])
+
+        result = visual_diff("a.png", "b.png", str(tmp_path))
+
+        assert result["heatmap"].endswith(".png")
+        assert (tmp_path / result["heatmap"]).exists()
+        assert len(result["regions"]) == 1
+
+    def test_compares_tiled_manifests(self, tmp_path):
+        from app.utils.screenshot_utils import store_screenshot
+        from app.utils.visual_diff import visual_diff
+
+        with patch("app.config.Config.SCREENSHOT_FORMAT", "png"):
+            _page(tmp_path / "a.png")
+            _page(tmp_path / "b.png", boxes=[(0, 600, 99, 699)])
+            before = store_screenshot((tmp_path / "a.png").read_bytes(), str(tmp_path))
+            after = store_screenshot((tmp_path / "b.png").read_bytes(), str(tmp_path))
+
+        result = visual_diff(before["filename"], after["filename"], str(tmp_path))
+
+        assert result["regions"] == [{"x": 0, "y": 592, "width": 112, "height": 112}]
@@ -1,6 +1,8 @@
 from app import create_app
+from migrations import init_migrations
 
 app = create_app()
+init_migrations(app)
 
 if __name__ == "__main__":
     port = app.config.get("PORT", 5000)